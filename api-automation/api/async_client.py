@@ -0,0 +1,309 @@
+"""Asyncio API client for high-concurrency drivers (virtual users, open-model load)
+
+A thread per in-flight request does not scale to thousands of simulated
+users, so this client speaks HTTP/1.1 directly over asyncio streams
+(standard library only, http and https). It mirrors APIClient where it
+matters: json= bodies go through the same BodyEncoder, requests pass the
+process-wide rate limiter, counters land in ClientMetrics, and
+with_token()/anonymous()/as_role() return views that share the
+connection pool but carry their own headers.
+
+    client = AsyncAPIClient(base_url)
+    admin = await client.as_role("admin")
+    response = await admin.get(Endpoints.PRODUCTS, params={"status": "pending_approval"})
+    await client.close()
+
+Connections are pooled per client (keep-alive, at most pool_size open);
+the pool binds to the event loop that first uses it.
+"""
+
+import asyncio
+import copy
+import json as jsonlib
+import logging
+import ssl
+import time
+from collections import deque
+from urllib.parse import urlencode, urlsplit
+from requests.structures import CaseInsensitiveDict
+from api.body_encoder import BodyEncoder
+from api.endpoints import Endpoints
+from api.metrics import ClientMetrics
+from api.rate_limiter import global_limiter
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncResponse:
+    """Minimal response object with the parts of requests.Response the suite uses"""
+
+    def __init__(self, method, url, status_code, reason, headers, content, elapsed):
+        self.method = method
+        self.url = url
+        self.status_code = status_code
+        self.reason = reason
+        self.headers = headers
+        self.content = content
+        self.elapsed = elapsed
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8", errors="replace")
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+    def json(self):
+        return jsonlib.loads(self.content)
+
+    def __repr__(self):
+        return f"<AsyncResponse [{self.status_code}]>"
+
+
+class _Connection:
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.last_used = time.monotonic()
+        self.reused = False
+
+    def close(self):
+        self.writer.close()
+
+
+class AsyncConnectionPool:
+    """Keep-alive connections to one host, at most `size` open at a time"""
+
+    def __init__(self, base_url, size=None, idle_timeout=None):
+        url = urlsplit(base_url)
+        self.scheme = url.scheme or "http"
+        self.host = url.hostname
+        self.port = url.port or (443 if self.scheme == "https" else 80)
+        self.host_header = url.netloc.rpartition("@")[2]
+        self.size = size or settings.HTTP_POOL_SIZE
+        self.idle_timeout = settings.HTTP_IDLE_TIMEOUT if idle_timeout is None else idle_timeout
+        self.connections_opened = 0
+        self._ssl = ssl.create_default_context() if self.scheme == "https" else None
+        self._idle = deque()
+        self._slots = None
+        self._loop = None
+
+    def _bind(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:  # New event loop: connections of the old one are unusable
+            self._loop = loop
+            self._slots = asyncio.Semaphore(self.size)
+            self._idle.clear()
+
+    async def acquire(self):
+        self._bind()
+        await self._slots.acquire()
+        now = time.monotonic()
+        while self._idle:
+            conn = self._idle.pop()
+            if conn.reader.at_eof() or now - conn.last_used > self.idle_timeout:
+                conn.close()
+                continue
+            conn.reused = True
+            return conn
+        try:
+            reader, writer = await asyncio.open_connection(self.host, self.port, ssl=self._ssl, limit=2 ** 20)
+        except BaseException:
+            self._slots.release()
+            raise
+        self.connections_opened += 1
+        return _Connection(reader, writer)
+
+    def release(self, conn, reusable):
+        if reusable:
+            conn.last_used = time.monotonic()
+            self._idle.append(conn)
+        else:
+            conn.close()
+        self._slots.release()
+
+    async def close(self):
+        while self._idle:
+            self._idle.pop().close()
+
+
+class AsyncAPIClient:
+    def __init__(self, base_url=None, pool_size=None, timeout=None):
+        self.base_url = (base_url or settings.BASE_URL).rstrip("/")
+        self.base_path = urlsplit(self.base_url).path
+        self.pool = AsyncConnectionPool(self.base_url, size=pool_size)
+        self.timeout = timeout or settings.REQUEST_TIMEOUT
+        self.headers = {
+            'Content-Type': 'application/json',
+            'Accept': 'application/json'
+        }
+        self.encoder = BodyEncoder()
+        self.metrics = ClientMetrics()
+        self.rate_limiter = global_limiter()
+
+        self.role = None
+        self._role_tokens = {}
+        self._role_credentials = {}
+        self._role_locks = {}
+
+    # ── Requests ─────────────────────────────────────────────────────────────
+
+    def _encode_body(self, payload):
+        start = time.perf_counter()
+        body, hits, misses = self.encoder.encode(payload)
+        self.metrics.record_encode(time.perf_counter() - start, len(body), hits, misses)
+        return body
+
+    async def request(self, method, endpoint, params=None, json=None, data=None, headers=None, timeout=None):
+        wait = self.rate_limiter.reserve(endpoint)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+        path = f"{self.base_path}/{endpoint.lstrip('/')}"
+        if params:
+            path += "?" + urlencode(params, doseq=True)
+        if json is not None:
+            body = self._encode_body(json)
+        elif isinstance(data, str):
+            body = data.encode("utf-8")
+        else:
+            body = data or b""
+
+        request_headers = {**self.headers, **(headers or {})}
+        head = [f"{method.upper()} {path} HTTP/1.1", f"Host: {self.pool.host_header}",
+                f"Content-Length: {len(body)}"]
+        head += [f"{name}: {value}" for name, value in request_headers.items()]
+        raw = ("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body
+
+        self.metrics.record_request()
+        start = time.perf_counter()
+        try:
+            response = await asyncio.wait_for(self._exchange(method.upper(), raw), timeout or self.timeout)
+        except Exception as e:
+            logger.error(f"Error: {method} {path}: {type(e).__name__}: {e}")
+            raise
+        response.url = f"{self.base_url}{path[len(self.base_path):]}"
+        response.elapsed = time.perf_counter() - start
+        return response
+
+    async def _exchange(self, method, raw):
+        for attempt in (1, 2):
+            conn = await self.pool.acquire()
+            reusable = False
+            try:
+                conn.writer.write(raw)
+                await conn.writer.drain()
+                response, reusable = await self._read_response(conn.reader, method)
+                return response
+            except (ConnectionError, asyncio.IncompleteReadError):
+                # A kept-alive connection the server already closed: retry once on a fresh one
+                if attempt == 2 or not conn.reused:
+                    raise
+            finally:
+                self.pool.release(conn, reusable)
+
+    async def _read_response(self, reader, method):
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError("Connection closed before response")
+        _version, status, *reason = status_line.decode("latin-1").rstrip("\r\n").split(" ", 2)
+        status = int(status)
+
+        headers = CaseInsensitiveDict()
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip()] = value.strip()
+
+        keep_alive = headers.get("Connection", "").lower() != "close"
+        if method == "HEAD" or status in (204, 304) or 100 <= status < 200:
+            content = b""
+        elif headers.get("Transfer-Encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b";")[0].strip(), 16)
+                if size == 0:
+                    while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass  # Trailers
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readline()
+            content = b"".join(chunks)
+        elif "Content-Length" in headers:
+            content = await reader.readexactly(int(headers["Content-Length"]))
+        else:
+            content = await reader.read()
+            keep_alive = False
+
+        response = AsyncResponse(method, None, status, reason[0] if reason else "", headers, content, 0.0)
+        return response, keep_alive
+
+    async def get(self, endpoint, **kwargs):
+        return await self.request('GET', endpoint, **kwargs)
+
+    async def post(self, endpoint, **kwargs):
+        return await self.request('POST', endpoint, **kwargs)
+
+    async def put(self, endpoint, **kwargs):
+        return await self.request('PUT', endpoint, **kwargs)
+
+    async def patch(self, endpoint, **kwargs):
+        return await self.request('PATCH', endpoint, **kwargs)
+
+    async def delete(self, endpoint, **kwargs):
+        return await self.request('DELETE', endpoint, **kwargs)
+
+    async def close(self):
+        await self.pool.close()
+
+    # ── Auth views (same semantics as APIClient) ─────────────────────────────
+
+    def with_token(self, token, role=None):
+        """View that sends `token`; shares the pool, encoder, limiter and metrics"""
+        view = copy.copy(self)
+        view.headers = {k: v for k, v in self.headers.items() if k != 'Authorization'}
+        if token:
+            view.headers['Authorization'] = f'Bearer {token}'
+        view.role = role
+        return view
+
+    def anonymous(self):
+        return self.with_token(None)
+
+    def register_role(self, role, token=None, identifier=None, password=None):
+        if token:
+            self._role_tokens[role] = token
+        if identifier:
+            self._role_credentials[role] = (identifier, password)
+
+    async def as_role(self, role):
+        """View authenticated as `role`; concurrent callers share a single login"""
+        lock = self._role_locks.setdefault(role, asyncio.Lock())
+        async with lock:
+            token = self._role_tokens.get(role)
+            if token is None:
+                token = self._role_tokens[role] = await self._login_role(role)
+        return self.with_token(token, role=role)
+
+    async def _login_role(self, role):
+        credentials = self._role_credentials.get(role)
+        if credentials is None and role == "admin":
+            credentials = (settings.ADMIN_EMAIL, settings.ADMIN_PASSWORD)
+        if credentials is None:
+            raise PermissionError(f"No token or credentials registered for role '{role}'")
+        token = await self.login(*credentials)
+        if not token:
+            raise PermissionError(f"Login as '{role}' failed")
+        return token
+
+    async def login(self, identifier, password):
+        """Log in and return the access token (None on failure)"""
+        response = await self.anonymous().post(Endpoints.LOGIN, json={"identifier": identifier, "password": password})
+        if response.status_code != 200:
+            return None
+        data = response.json().get("data") or {}
+        return data.get("access_token") or data.get("token")
@@ -0,0 +1,117 @@
+"""JSON request body encoder with a byte cache for frozen payload templates
+
+APIClient hands every json= payload to a BodyEncoder and sends the bytes
+itself, so requests never re-serializes them. orjson is used when it is
+installed (pip install orjson), the standard library json otherwise.
+
+Frozen values from utils.payload_template (FrozenDict / FrozenList) cannot
+change, so their bytes are cached by identity. A payload built from a
+template is a plain top-level dict whose large nested fields are still the
+template's frozen objects; the encoder splices cached bytes for those
+fields next to a single encode of the volatile ones (a unique name or
+email), so the bulk of the body is never re-encoded.
+"""
+
+import json
+import threading
+from utils.payload_template import FROZEN_TYPES, FrozenList
+
+try:
+    import orjson
+except ImportError:  # Optional speed-up
+    orjson = None
+
+
+def _orjson_default(value):
+    if isinstance(value, FrozenList):  # orjson only serializes exact tuples
+        return tuple(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def _orjson_dumps(value):
+    return orjson.dumps(value, default=_orjson_default)
+
+
+def _std_dumps(value):
+    # allow_nan=False as in requests' json=: NaN/Infinity raise instead of producing invalid JSON
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False, allow_nan=False).encode("utf-8")
+
+
+class BodyEncoder:
+    """Serializes payloads to compact UTF-8 JSON bytes, caching frozen subtrees"""
+
+    def __init__(self, use_orjson=None, cache_size=1024):
+        if use_orjson and orjson is None:
+            raise ImportError("orjson is not installed")
+        self.use_orjson = orjson is not None if use_orjson is None else use_orjson
+        self.dumps = _orjson_dumps if self.use_orjson else _std_dumps
+        self.cache_size = cache_size
+        self._cache = {}   # id(frozen value) -> (value, b'"key":value' or b'value')
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def name(self):
+        return "orjson" if self.use_orjson else "json"
+
+    def _cached(self, cache_key, value, encode):
+        """Cached bytes for an immutable value; the entry keeps it alive so its id stays unique
+
+        Lookups are lock-free (a single dict lookup is atomic); the hit and
+        miss counters, inserts and FIFO eviction take the lock.
+        """
+        entry = self._cache.get(cache_key)
+        if entry is not None and entry[0] is value:
+            with self._lock:
+                self.hits += 1
+            return entry[1], True
+        data = encode()
+        with self._lock:
+            self.misses += 1
+            self._cache[cache_key] = (value, data)
+            if len(self._cache) > self.cache_size:
+                del self._cache[next(iter(self._cache))]
+        return data, False
+
+    def encode(self, payload):
+        """Return (bytes, cache_hits, cache_misses) for one payload"""
+        if isinstance(payload, FROZEN_TYPES):
+            data, hit = self._cached(id(payload), payload, lambda: self.dumps(payload))
+            return data, int(hit), int(not hit)
+        if isinstance(payload, dict):
+            return self._splice(payload)
+        return self.dumps(payload), 0, 0
+
+    def _splice(self, payload):
+        """Join cached '"key":value' bytes of frozen fields with one encode of the rest
+
+        Field order in the output differs from the dict (volatile fields
+        first), which JSON object semantics allow.
+        """
+        dumps = self.dumps
+        volatile = {}
+        frozen = []
+        hits = misses = 0
+        for key, value in payload.items():
+            if isinstance(value, FROZEN_TYPES) and isinstance(key, str):
+                data, hit = self._cached((key, id(value)), value,
+                                         lambda: dumps(key) + b":" + dumps(value))
+                frozen.append(data)
+                if hit:
+                    hits += 1
+                else:
+                    misses += 1
+            else:
+                volatile[key] = value
+        if not frozen:
+            return dumps(payload), 0, 0
+
+        if volatile:
+            head = dumps(volatile)
+            return head[:-1] + b"," + b",".join(frozen) + b"}", hits, misses
+        return b"{" + b",".join(frozen) + b"}", hits, misses
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
@@ -0,0 +1,226 @@
+"""Circuit breakers that stop APIClient from hammering an unhealthy environment
+
+Breakers are keyed by (host, endpoint group), the group being the first
+path segment ("auth", "products", "rbac", ...). Connection errors and
+timeouts count against the host-wide breaker (the server is unreachable),
+5xx responses against the group's breaker (that part of the API is broken).
+A breaker opens after CIRCUIT_CONSECUTIVE_FAILURES failures in a row, or
+when at least CIRCUIT_MIN_REQUESTS of the last CIRCUIT_WINDOW requests
+were made and CIRCUIT_FAILURE_RATE of them failed.
+
+While open, requests fail immediately with CircuitOpenError (no client
+delay, no timeout). After CIRCUIT_RESET_TIMEOUT seconds one caller probes
+Endpoints.HEALTH: if it answers, the breaker goes half-open and the next
+real request decides whether it closes or re-opens; if not, it stays open
+for another (doubled, capped) timeout.
+
+With CIRCUIT_BREAKER=skip (default) or fail, the pytest session skips or
+fails the remaining UAT tests as soon as the host breaker is open; off
+disables the breakers entirely.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from urllib.parse import urlsplit
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+class CircuitOpenError(ConnectionError):
+    """Raised instead of sending a request while its circuit is open"""
+
+    def __init__(self, breaker):
+        self.breaker = breaker
+        super().__init__(breaker.reason())
+
+
+class CircuitBreaker:
+    """Failure-rate / consecutive-error breaker with a health-probed half-open state"""
+
+    def __init__(self, name, consecutive=None, failure_rate=None, window=None, min_requests=None,
+                 reset_timeout=None, max_reset_timeout=300.0):
+        self.name = name
+        self.consecutive = consecutive or settings.CIRCUIT_CONSECUTIVE_FAILURES
+        self.failure_rate = failure_rate or settings.CIRCUIT_FAILURE_RATE
+        self.min_requests = min_requests or settings.CIRCUIT_MIN_REQUESTS
+        self.reset_timeout = reset_timeout or settings.CIRCUIT_RESET_TIMEOUT
+        self.max_reset_timeout = max(max_reset_timeout, self.reset_timeout)
+
+        self.state = CLOSED
+        self.opened_at = None
+        self.last_error = None
+        self.times_opened = 0
+        self._outcomes = deque(maxlen=window or settings.CIRCUIT_WINDOW)
+        self._failures_in_row = 0
+        self._timeout = self.reset_timeout
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def reason(self):
+        retry_in = max(0.0, self.opened_at + self._timeout - time.monotonic()) if self.opened_at else 0.0
+        failed = self._outcomes.count(False)
+        return (f"Circuit '{self.name}' is open: {failed}/{len(self._outcomes)} recent requests failed, "
+                f"last error: {self.last_error}; next health probe in {retry_in:.0f}s")
+
+    def _open(self, error):
+        if self.state == HALF_OPEN or self.state == OPEN:
+            self._timeout = min(self._timeout * 2, self.max_reset_timeout)
+        self.state = OPEN
+        self.opened_at = time.monotonic()
+        self.times_opened += 1
+        logger.warning(f"Circuit '{self.name}' opened: {error}")
+
+    def allow(self, probe=None):
+        """Raise CircuitOpenError unless a request may be sent now
+
+        probe() is called (by one caller at a time) once the reset timeout
+        has passed; it returns True if the environment looks healthy again.
+        """
+        with self._lock:
+            if self.state != OPEN:
+                return
+            due = time.monotonic() - self.opened_at >= self._timeout
+            if not due or self._probing or probe is None:
+                raise CircuitOpenError(self)
+            self._probing = True
+        try:
+            healthy = probe()
+        except Exception as e:
+            healthy, self.last_error = False, f"health probe: {type(e).__name__}: {e}"
+        with self._lock:
+            self._probing = False
+            if not healthy:
+                self._open(self.last_error)
+                raise CircuitOpenError(self)
+            self.state = HALF_OPEN
+            logger.info(f"Circuit '{self.name}' half-open: health probe passed")
+
+    def trip(self, error):
+        """Open the breaker from outside (e.g. a failed preflight check)"""
+        with self._lock:
+            self.last_error = error
+            if self.state != OPEN:
+                self._open(error)
+
+    def record(self, success, error=None):
+        with self._lock:
+            self._outcomes.append(success)
+            if success:
+                self._failures_in_row = 0
+                if self.state == HALF_OPEN:
+                    self.state = CLOSED
+                    self._timeout = self.reset_timeout
+                    self._outcomes.clear()
+                    logger.info(f"Circuit '{self.name}' closed")
+                return
+            self._failures_in_row += 1
+            self.last_error = error
+            failures = self._outcomes.count(False)
+            if (self.state == HALF_OPEN or self._failures_in_row >= self.consecutive
+                    or (len(self._outcomes) >= self.min_requests
+                        and failures / len(self._outcomes) >= self.failure_rate)):
+                if self.state != OPEN:
+                    self._open(error)
+
+    def snapshot(self):
+        with self._lock:
+            failures = self._outcomes.count(False)
+            return {"name": self.name, "state": self.state, "times_opened": self.times_opened,
+                    "consecutive_failures": self._failures_in_row,
+                    "failure_rate": failures / len(self._outcomes) if self._outcomes else 0.0,
+                    "last_error": self.last_error}
+
+
+class CircuitBreakers:
+    """Breakers of one process, created on first use per host and per (host, group)"""
+
+    def __init__(self, enabled=None, **options):
+        self.enabled = (settings.CIRCUIT_BREAKER != "off") if enabled is None else enabled
+        self.options = options
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def host(base_url):
+        return urlsplit(base_url).netloc
+
+    @staticmethod
+    def group(endpoint):
+        return endpoint.strip("/").split("/", 1)[0].split("?", 1)[0] or "root"
+
+    def get(self, host, group=None):
+        key = (host, group)
+        with self._lock:
+            if key not in self._breakers:
+                name = f"{host}/{group}" if group else host
+                self._breakers[key] = CircuitBreaker(name, **self.options)
+            return self._breakers[key]
+
+    def before(self, base_url, endpoint, probe=None):
+        """Raise CircuitOpenError if the host or the endpoint's group is open"""
+        if not self.enabled:
+            return
+        host = self.host(base_url)
+        self.get(host).allow(probe)
+        self.get(host, self.group(endpoint)).allow(probe)
+
+    def record(self, base_url, endpoint, response=None, error=None):
+        """Count one outcome: exceptions against the host, 5xx against the group"""
+        if not self.enabled:
+            return
+        host = self.host(base_url)
+        if error is not None:
+            self.get(host).record(False, f"{type(error).__name__}: {error}")
+            return
+        self.get(host).record(True)
+        self.get(host, self.group(endpoint)).record(
+            response.status_code < 500, f"HTTP {response.status_code} on {endpoint}")
+
+    def check(self, base_url, probe=None):
+        """Reason string if the host-wide breaker for base_url is (still) open, else None
+
+        Probes Endpoints.HEALTH when the reset timeout has passed, so a
+        recovered environment is picked up again.
+        """
+        if not self.enabled:
+            return None
+        try:
+            self.get(self.host(base_url)).allow(probe or health_probe(base_url))
+        except CircuitOpenError as e:
+            return str(e)
+        return None
+
+    def snapshot(self):
+        with self._lock:
+            return [b.snapshot() for b in self._breakers.values()]
+
+
+def health_probe(base_url, transport=None, headers=None):
+    """probe() for CircuitBreaker.allow: True if Endpoints.HEALTH answers below 500"""
+    from api.endpoints import Endpoints
+    from api.transport import get_transport
+
+    def probe():
+        response = (transport or get_transport(base_url)).request(
+            "GET", f"{base_url.rstrip('/')}{Endpoints.HEALTH}", headers=headers,
+            timeout=settings.CIRCUIT_PROBE_TIMEOUT)
+        return response.status_code < 500
+    return probe
+
+
+_circuit_breakers = None
+_circuit_lock = threading.Lock()
+
+
+def circuit_breakers():
+    """Process-wide breakers shared by every APIClient (CIRCUIT_* settings)"""
+    global _circuit_breakers
+    with _circuit_lock:
+        if _circuit_breakers is None:
+            _circuit_breakers = CircuitBreakers()
+        return _circuit_breakers
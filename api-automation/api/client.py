@@ -1,49 +1,227 @@
-import requests
+import asyncio
+import copy
+import threading
 import time
 import logging
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from api.body_encoder import BodyEncoder
+from api.circuit_breaker import circuit_breakers, health_probe
+from api.endpoints import Endpoints
+from api.http_cache import http_cache
+from api.metrics import ClientMetrics
+from api.rate_limiter import global_limiter
+from api.single_flight import coalesce_key, single_flight
+from api.transport import get_transport
+from config.settings import settings
+from utils.json_stream import JSONItemStream
 
 logger = logging.getLogger(__name__)
 
+class _RequestPacing:
+    """Delay state shared by a client and all of its auth views"""
+    
+    def __init__(self, delay):
+        self.delay = delay
+        self.last_request_time = 0
+        self.lock = threading.Lock()
+
 class APIClient:
-    def __init__(self, base_url=None):
+    def __init__(self, base_url=None, transport=None):
         self.base_url = base_url or "https://api.uat.teresaapp.com/api/v1"
-        self.session = requests.Session()
-        self.session.headers.update({
+        # Connections come from the shared pool; headers (incl. auth) stay per client
+        self.transport = transport or get_transport(self.base_url)
+        self.headers = {
             'Content-Type': 'application/json',
             'Accept': 'application/json'
-        })
+        }
         
         # LARGE DELAY FOR UAT
-        self.last_request_time = 0
-        self.request_delay = 3.0  # 3 seconds
+        self._pacing = _RequestPacing(3.0)  # 3 seconds
+        self.rate_limiter = global_limiter()  # RATE_LIMIT_RPS / RATE_LIMIT_PROFILE, off by default
+        self.circuit = circuit_breakers()     # Fails fast while the environment is down
+        self.single_flight = single_flight()  # Identical concurrent GETs share one request (SINGLE_FLIGHT)
+        self.http_cache = http_cache()        # Reference collections served from memory (HTTP_CACHE)
+        
+        # json= bodies are encoded here (cached for frozen templates), not by requests
+        self.encoder = BodyEncoder()
+        self.metrics = ClientMetrics()
+        
+        # Auth views: role -> token, shared with every view of this client
+        self.role = None
+        self._role_tokens = {}
+        self._role_credentials = {}
+        self._role_lock = threading.Lock()
+        self._role_locks = {}
         
         logger.info(f"APIClient initialized for {self.base_url}")
     
+    @property
+    def request_delay(self):
+        return self._pacing.delay
+    
+    @request_delay.setter
+    def request_delay(self, value):
+        self._pacing.delay = value
+    
     def _add_delay(self):
-        """3 seconds delay between every request"""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
+        """3 seconds delay between every request
         
-        if time_since_last < self.request_delay:
-            sleep_time = self.request_delay - time_since_last
-            time.sleep(sleep_time)
+        Thread-safe: each caller reserves the next free slot under the lock
+        and sleeps outside it, so concurrent callers (e.g. Paginator
+        prefetch threads) are spaced out instead of firing together.
+        """
+        pacing = self._pacing
+        with pacing.lock:
+            current_time = time.time()
+            send_at = max(current_time, pacing.last_request_time + pacing.delay)
+            pacing.last_request_time = send_at
         
-        self.last_request_time = time.time()
+        if send_at > current_time:
+            time.sleep(send_at - current_time)
     
     def request(self, method, endpoint, **kwargs):
-        """Simple request with large delay"""
+        """Simple request with large delay
+        
+        GETs of reference collections (techniques, units, files) are
+        answered from the HTTP cache while fresh, see api/http_cache.py.
+        """
+        if self.http_cache is not None:
+            return self.http_cache.request(self, method, endpoint, kwargs)
+        return self._fetch(method, endpoint, **kwargs)
+    
+    def _fetch(self, method, endpoint, **kwargs):
+        """Identical concurrent GETs (same endpoint, params and auth) are
+        coalesced: followers wait for the in-flight request and receive the
+        same Response object, without paying the delay themselves.
+        """
+        key = self.single_flight and coalesce_key(self.base_url, method, endpoint, self.headers, kwargs)
+        if not key:
+            return self._send(method, endpoint, **kwargs)
+        
+        def send():
+            response = self._send(method, endpoint, **kwargs)
+            response.content  # Read the body once before it is shared between threads
+            return response
+        
+        response, shared = self.single_flight.do(key, send)
+        if shared:
+            self.metrics.record_coalesced()
+        return response
+    
+    def _send(self, method, endpoint, **kwargs):
+        # An open circuit raises CircuitOpenError before any delay or timeout is paid
+        self.circuit.before(self.base_url, endpoint, health_probe(self.base_url, self.transport))
         self._add_delay()
+        self.rate_limiter.acquire(endpoint)
         
         url = f"{self.base_url.rstrip('/')}/{endpoint.lstrip('/')}"
         logger.info(f"Request: {method} {url}")
         
+        if kwargs.get('json') is not None:
+            kwargs['data'] = self._encode_body(kwargs.pop('json'))
+        kwargs['headers'] = {**self.headers, **(kwargs.get('headers') or {})}
+        self.metrics.record_request()
+        
         try:
-            response = self.session.request(method, url, **kwargs)
+            response = self.transport.request(method, url, **kwargs)
             logger.info(f"Response: {response.status_code}")
-            return response
         except Exception as e:
             logger.error(f"Error: {e}")
+            if isinstance(e, (requests.ConnectionError, requests.Timeout)):
+                self.circuit.record(self.base_url, endpoint, error=e)
             raise
+        self.circuit.record(self.base_url, endpoint, response)
+        return response
+    
+    def _encode_body(self, payload):
+        """Serialize a json= payload to bytes and record the encode time"""
+        start = time.perf_counter()
+        body, hits, misses = self.encoder.encode(payload)
+        self.metrics.record_encode(time.perf_counter() - start, len(body), hits, misses)
+        return body
+    
+    def stream_items(self, endpoint, key="data", chunk_size=64 * 1024, **kwargs):
+        """Yield items of the response's `key` array while it is still downloading
+
+        The body is never fully buffered, so callers can stop at the first
+        match. Breaking out of the loop closes the response and releases the
+        connection. Non-200 responses yield nothing.
+        """
+        response = self.request('GET', endpoint, stream=True, **kwargs)
+        try:
+            if response.status_code != 200:
+                logger.warning(f"Streaming skipped: {endpoint} returned {response.status_code}")
+                return
+            stream = JSONItemStream(key=key)
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                for item in stream.feed(chunk):
+                    yield item
+                if stream.finished:
+                    return
+        finally:
+            response.close()
+    
+    # Batches - many independent requests at once, results in spec order
+    @staticmethod
+    def _spec(spec):
+        """Normalize a request spec: dict {"method", "endpoint", **kwargs} or (method, endpoint[, kwargs])"""
+        if isinstance(spec, dict):
+            kwargs = dict(spec)
+            return kwargs.pop("method", "GET").upper(), kwargs.pop("endpoint"), kwargs
+        method, endpoint, *rest = spec
+        return method.upper(), endpoint, dict(rest[0]) if rest else {}
+    
+    def _run_spec(self, index, spec):
+        method, endpoint, kwargs = self._spec(spec)
+        start = time.perf_counter()
+        response, error = None, None
+        try:
+            response = self.request(method, endpoint, **kwargs)
+        except Exception as e:
+            error = e
+        return {
+            "index": index,
+            "method": method,
+            "endpoint": endpoint,
+            "response": response,
+            "status_code": response.status_code if response is not None else None,
+            "elapsed": time.perf_counter() - start,
+            "error": error,
+        }
+    
+    def map(self, specs, concurrency=None):
+        """Run request specs on a thread pool; returns one result dict per spec, in order
+        
+        Each result has index, method, endpoint, response, status_code,
+        elapsed (seconds, including pacing waits) and error (the exception,
+        or None). Requests still go through the client delay and the global
+        rate limiter, so concurrency only bounds how many are in flight.
+        Concurrency defaults to LOAD_CONCURRENCY (lowered by preflight on a slow environment).
+        """
+        specs = list(specs)
+        if not specs:
+            return []
+        workers = max(1, min(int(concurrency or settings.LOAD_CONCURRENCY), len(specs)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="api-map") as pool:
+            return list(pool.map(self._run_spec, range(len(specs)), specs))
+    
+    async def gather(self, specs, concurrency=None):
+        """Async counterpart of map(): one task per spec, at most `concurrency` running
+        
+        Requests run on a worker pool so the event loop stays free; results
+        come back in spec order.
+        """
+        concurrency = max(1, int(concurrency or settings.LOAD_CONCURRENCY))
+        semaphore = asyncio.Semaphore(concurrency)
+        loop = asyncio.get_running_loop()
+        
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="api-gather") as pool:
+            async def run(index, spec):
+                async with semaphore:
+                    return await loop.run_in_executor(pool, self._run_spec, index, spec)
+            
+            return list(await asyncio.gather(*(run(i, spec) for i, spec in enumerate(specs))))
     
     # HTTP Methods - ADD THESE:
     def get(self, endpoint, **kwargs):
@@ -62,9 +240,66 @@ class APIClient:
         return self.request('DELETE', endpoint, **kwargs)
     
     # Auth methods
+    # Headers are replaced, never mutated in place, so a request already
+    # reading them always sees a consistent set. For concurrent flows prefer
+    # views (with_token / as_role) over flipping the token on a shared client.
     def set_auth_token(self, token):
-        self.session.headers.update({'Authorization': f'Bearer {token}'})
+        self.headers = {**self.headers, 'Authorization': f'Bearer {token}'}
     
     def clear_auth_token(self):
-        if 'Authorization' in self.session.headers:
-            del self.session.headers['Authorization']
\ No newline at end of file
+        self.headers = {k: v for k, v in self.headers.items() if k != 'Authorization'}
+    
+    # Auth views - share transport, pacing, encoder and metrics; own headers
+    def with_token(self, token, role=None):
+        """View of this client that sends `token`; the original client is not touched"""
+        view = copy.copy(self)
+        view.headers = {k: v for k, v in self.headers.items() if k != 'Authorization'}
+        if token:
+            view.headers['Authorization'] = f'Bearer {token}'
+        view.role = role
+        return view
+    
+    def anonymous(self):
+        """View of this client without any Authorization header"""
+        return self.with_token(None)
+    
+    def register_role(self, role, token=None, identifier=None, password=None):
+        """Make a role available to as_role() by token or by login credentials"""
+        with self._role_lock:
+            if token:
+                self._role_tokens[role] = token
+            if identifier:
+                self._role_credentials[role] = (identifier, password)
+    
+    def as_role(self, role):
+        """View authenticated as `role`, logging in once on first use
+        
+        The admin role falls back to ADMIN_EMAIL / ADMIN_PASSWORD from settings.
+        Raises PermissionError if the login fails.
+        """
+        # One lock per role: a slow admin login does not hold up other roles
+        with self._role_lock:
+            lock = self._role_locks.setdefault(role, threading.Lock())
+        with lock:
+            token = self._role_tokens.get(role)
+            if token is None:
+                token = self._role_tokens[role] = self._login_role(role)
+        return self.with_token(token, role=role)
+    
+    def _login_role(self, role):
+        credentials = self._role_credentials.get(role)
+        if credentials is None and role == "admin":
+            credentials = (settings.ADMIN_EMAIL, settings.ADMIN_PASSWORD)
+        if credentials is None:
+            raise PermissionError(f"No token or credentials registered for role '{role}'")
+        
+        identifier, password = credentials
+        response = self.anonymous().post(Endpoints.LOGIN, json={"identifier": identifier, "password": password})
+        token = None
+        if response.status_code == 200:
+            data = response.json().get("data") or {}
+            token = data.get("access_token") or data.get("token")
+        if not token:
+            raise PermissionError(f"Login as '{role}' failed: {response.status_code}")
+        logger.info(f"Logged in as role '{role}'")
+        return token
\ No newline at end of file
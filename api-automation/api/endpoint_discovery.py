@@ -0,0 +1,137 @@
+"""Discovery of which of several alternative routes an environment serves
+
+Some capabilities have moved between API versions (the artisan login used
+to be tried on four different paths, one after the other, for every test).
+EndpointDiscovery probes all candidates of a capability concurrently,
+without the client delay, and remembers the winning route per environment
+(base URL) in a small JSON cache file so later tests and later runs go
+straight to it until ENDPOINT_CACHE_TTL expires:
+
+    discovery = EndpointDiscovery(settings.BASE_URL)
+    endpoint, token = discovery.artisan_login(identifier, password)
+
+A cached route that stops working (404/405) is forgotten and rediscovered.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from api.client import APIClient
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Most likely first; on a tie the earlier candidate wins
+ARTISAN_LOGIN_CANDIDATES = ["/auth/login", "/artisan/login", "/login/artisan", "/auth/artisan/login"]
+
+# Answers meaning "this route does not exist here" rather than "the request was wrong"
+MISSING_ROUTE = (404, 405)
+
+
+def login_token(response):
+    """Access token from a successful login response, else None"""
+    if response.status_code != 200:
+        return None
+    try:
+        body = response.json()
+    except ValueError:
+        return None
+    data = body.get("data") or {}
+    return data.get("access_token") or data.get("token") or body.get("access_token") or body.get("token")
+
+
+class EndpointCache:
+    """{base_url: {capability: {"endpoint", "discovered_at"}}} persisted as JSON"""
+
+    def __init__(self, path=None, ttl=None):
+        self.path = path or settings.ENDPOINT_CACHE
+        self.ttl = settings.ENDPOINT_CACHE_TTL if ttl is None else ttl
+        self._lock = threading.Lock()
+
+    def _read(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write(self, data):
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def get(self, base_url, capability):
+        """Cached endpoint, or None if unknown or older than the TTL"""
+        entry = self._read().get(base_url, {}).get(capability)
+        if not entry or time.time() - entry.get("discovered_at", 0) > self.ttl:
+            return None
+        return entry["endpoint"]
+
+    def put(self, base_url, capability, endpoint):
+        with self._lock:
+            data = self._read()
+            data.setdefault(base_url, {})[capability] = {"endpoint": endpoint, "discovered_at": time.time()}
+            self._write(data)
+
+    def forget(self, base_url, capability):
+        with self._lock:
+            data = self._read()
+            if data.get(base_url, {}).pop(capability, None) is not None:
+                self._write(data)
+
+
+class EndpointDiscovery:
+    """Concurrent probing of alternative routes with a per-environment cache"""
+
+    def __init__(self, base_url=None, cache=None, timeout=None):
+        self.client = APIClient(base_url=base_url or settings.BASE_URL)
+        self.client.request_delay = 0  # Probes run side by side; the rate limiter still applies
+        self.cache = cache or EndpointCache()
+        self.timeout = timeout or settings.REQUEST_TIMEOUT
+        self.probes = 0
+
+    def _probe(self, method, endpoint, json_body):
+        self.probes += 1
+        try:
+            return self.client.anonymous().request(method, endpoint, json=json_body, timeout=self.timeout)
+        except Exception as e:
+            logger.info(f"Probe {method} {endpoint} failed: {type(e).__name__}: {e}")
+            return None
+
+    def discover(self, capability, candidates, method="POST", json_body=None, accept=None):
+        """(endpoint, response) of the first candidate whose answer passes accept(response)
+
+        Every candidate is probed at once; the winner is cached. Returns
+        (None, None) if no candidate is accepted (nothing is cached then).
+        """
+        accept = accept or (lambda r: r.status_code == 200)
+        with ThreadPoolExecutor(max_workers=len(candidates), thread_name_prefix="discovery") as pool:
+            responses = list(pool.map(lambda e: self._probe(method, e, json_body), candidates))
+
+        for endpoint, response in zip(candidates, responses):
+            if response is not None and accept(response):
+                self.cache.put(self.client.base_url, capability, endpoint)
+                logger.info(f"Discovered {capability}: {endpoint}")
+                return endpoint, response
+        return None, None
+
+    def resolve(self, capability, candidates, method="POST", json_body=None, accept=None):
+        """(endpoint, response): the cached route is tried first, discovery runs on a miss"""
+        endpoint = self.cache.get(self.client.base_url, capability)
+        if endpoint:
+            response = self._probe(method, endpoint, json_body)
+            if response is not None and response.status_code not in MISSING_ROUTE:
+                return endpoint, response
+            self.cache.forget(self.client.base_url, capability)
+        return self.discover(capability, candidates, method, json_body, accept)
+
+    def artisan_login(self, identifier, password):
+        """(endpoint, token) of an artisan login, or (endpoint or None, None) if it failed"""
+        endpoint, response = self.resolve("artisan_login", ARTISAN_LOGIN_CANDIDATES,
+                                          json_body={"identifier": identifier, "password": password},
+                                          accept=lambda r: login_token(r) is not None)
+        return endpoint, (login_token(response) if response is not None else None)
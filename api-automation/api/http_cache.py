@@ -0,0 +1,275 @@
+"""HTTP cache for rarely changing reference collections (techniques, units, files)
+
+APIClient answers cacheable GETs from memory while their TTL lasts; the
+hit returns a CachedResponse without touching the network, pacing or the
+rate limiter. Once stale, an entry with an ETag / Last-Modified is
+revalidated with If-None-Match / If-Modified-Since, and a 304 refreshes it
+without downloading the body again.
+
+  - TTLs per collection in CACHE_RULES; only 200 responses are stored,
+  - entries are keyed like single-flight (endpoint, params, auth identity),
+  - least recently used entries are evicted above HTTP_CACHE_MAX_BYTES,
+  - a successful write (POST/PUT/PATCH/DELETE) to a collection, e.g. a
+    technique created by the suite, drops that collection's entries,
+  - with HTTP_CACHE_FILE set, entries are saved at the end of the session
+    and loaded by the next run (stale ones are revalidated, not trusted).
+
+HTTP_CACHE=false turns it off; stats() carries the hit ratio. A hit's
+elapsed is zero, so response-time checks on these collections need
+HTTP_CACHE=false to measure the server.
+"""
+
+import base64
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+import requests
+from requests.structures import CaseInsensitiveDict
+from api.endpoints import Endpoints
+from api.single_flight import coalesce_key
+from config.settings import settings
+
+try:
+    import orjson
+except ImportError:  # Optional speed-up
+    orjson = None
+
+# collection -> GET prefixes it caches, TTL in seconds, write prefixes that invalidate it
+CACHE_RULES = {
+    "techniques": {"prefixes": [Endpoints.TECHNIQUES], "ttl": 300.0,
+                   "writes": [Endpoints.TECHNIQUES, Endpoints.TECHNIQUES_UPDATE]},
+    "units": {"prefixes": [Endpoints.UNITS], "ttl": 3600.0, "writes": [Endpoints.UNITS]},
+    "files": {"prefixes": [Endpoints.FILES], "ttl": 300.0, "writes": [Endpoints.FILES]},
+}
+
+_KEPT_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+
+def _matches(endpoint, prefix):
+    path, prefix = endpoint.split("?", 1)[0].strip("/"), prefix.strip("/")
+    return path == prefix or path.startswith(prefix + "/")
+
+
+class CachedResponse:
+    """A cached 200 with the parts of requests.Response the suite reads"""
+
+    from_cache = True
+    reason = "OK"
+    elapsed = timedelta(0)  # Served from memory
+
+    def __init__(self, entry):
+        self.status_code = entry["status"]
+        self.url = entry["url"]
+        self.headers = CaseInsensitiveDict(entry["headers"])
+        self.content = entry["content"]
+
+    @property
+    def request(self):
+        """The GET this entry answers (nothing was sent)"""
+        return requests.Request("GET", self.url).prepare()
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self, **kwargs):
+        """Parsed fresh on every call, so callers may mutate the result"""
+        if orjson is not None and not kwargs:
+            return orjson.loads(self.content)
+        return json.loads(self.content, **kwargs)
+
+    def iter_content(self, chunk_size=1, decode_unicode=False):
+        for i in range(0, len(self.content), chunk_size):
+            yield self.content[i:i + chunk_size]
+
+    def raise_for_status(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class HTTPCache:
+    """TTL + conditional-revalidation cache with an LRU memory bound"""
+
+    def __init__(self, rules=None, max_bytes=None, path=None):
+        self.rules = CACHE_RULES if rules is None else rules
+        self.max_bytes = max_bytes or settings.HTTP_CACHE_MAX_BYTES
+        self.path = path
+        self._entries = OrderedDict()   # key -> entry dict, least recently used first
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.revalidated = 0
+        self.stores = self.evictions = self.invalidations = 0
+        if path:
+            self.load()
+
+    def rule_for(self, endpoint, kind="prefixes"):
+        for name, rule in self.rules.items():
+            if any(_matches(endpoint, prefix) for prefix in rule[kind]):
+                return name
+        return None
+
+    # ── Request path ──────────────────────────────────────────────────────────
+
+    def request(self, client, method, endpoint, kwargs):
+        """Serve `method endpoint` for `client` from the cache where possible"""
+        if method.upper() != "GET":
+            response = client._fetch(method, endpoint, **kwargs)
+            if response.status_code < 400:
+                collection = self.rule_for(endpoint, "writes")
+                if collection:
+                    self.invalidate(collection, client.base_url)
+            return response
+
+        collection = self.rule_for(endpoint)
+        key = collection and coalesce_key(client.base_url, method, endpoint, client.headers, kwargs)
+        if not key:
+            return client._fetch(method, endpoint, **kwargs)
+        key = repr(key)
+
+        entry = self.get(key)
+        if entry is not None and entry["expires_at"] > time.time():
+            with self._lock:
+                self.hits += 1
+            return CachedResponse(entry)
+
+        validators = {}
+        if entry is not None:
+            if entry["headers"].get("ETag"):
+                validators["If-None-Match"] = entry["headers"]["ETag"]
+            if entry["headers"].get("Last-Modified"):
+                validators["If-Modified-Since"] = entry["headers"]["Last-Modified"]
+        if validators:
+            kwargs = {**kwargs, "headers": {**(kwargs.get("headers") or {}), **validators}}
+
+        response = client._fetch(method, endpoint, **kwargs)
+        if response.status_code == 304 and validators:
+            with self._lock:
+                self.revalidated += 1
+                entry["expires_at"] = time.time() + self.rules[collection]["ttl"]
+                for name in _KEPT_HEADERS:
+                    if response.headers.get(name):
+                        entry["headers"][name] = response.headers[name]
+            return CachedResponse(entry)
+
+        with self._lock:
+            self.misses += 1
+        if response.status_code == 200:
+            self.put(key, collection, client.base_url, response)
+        return response
+
+    # ── Storage ───────────────────────────────────────────────────────────────
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key, collection, base_url, response):
+        entry = {
+            "collection": collection, "base_url": base_url, "url": response.url,
+            "status": response.status_code, "content": response.content,
+            "headers": {name: response.headers[name] for name in _KEPT_HEADERS if response.headers.get(name)},
+            "stored_at": time.time(), "expires_at": time.time() + self.rules[collection]["ttl"],
+        }
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = entry
+            self._bytes += len(entry["content"])
+            self.stores += 1
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= len(entry["content"])
+
+    def invalidate(self, collection=None, base_url=None):
+        """Drop the entries of one collection (all if None) on one environment (all if None)"""
+        with self._lock:
+            keys = [key for key, entry in self._entries.items()
+                    if (collection is None or entry["collection"] == collection)
+                    and (base_url is None or entry["base_url"] == base_url)]
+            for key in keys:
+                self._remove(key)
+            self.invalidations += 1
+            return len(keys)
+
+    def clear(self):
+        self.invalidate()
+
+    # ── Persistence ───────────────────────────────────────────────────────────
+
+    def save(self, path=None):
+        path = path or self.path
+        with self._lock:
+            entries = [{**entry, "key": key, "content": base64.b64encode(entry["content"]).decode("ascii")}
+                       for key, entry in self._entries.items()]
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"entries": entries}, f)
+        os.replace(tmp_path, path)
+        return len(entries)
+
+    def load(self, path=None):
+        """Add entries saved by an earlier run; unreadable files are ignored"""
+        try:
+            with open(path or self.path, encoding="utf-8") as f:
+                saved = json.load(f)["entries"]
+        except (OSError, ValueError, KeyError):
+            return 0
+        loaded = 0
+        for entry in saved:
+            if entry.get("collection") not in self.rules:
+                continue
+            # Stale entries are only worth keeping if they can be revalidated
+            if entry["expires_at"] <= time.time() and not entry["headers"]:
+                continue
+            key = entry.pop("key")
+            entry["content"] = base64.b64decode(entry["content"])
+            with self._lock:
+                self._remove(key)
+                self._entries[key] = entry
+                self._bytes += len(entry["content"])
+            loaded += 1
+        return loaded
+
+    # ── Reporting ─────────────────────────────────────────────────────────────
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.revalidated + self.misses
+            return {
+                "entries": len(self._entries), "bytes": self._bytes,
+                "hits": self.hits, "revalidated": self.revalidated, "misses": self.misses,
+                "stores": self.stores, "evictions": self.evictions, "invalidations": self.invalidations,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "served_from_cache_ratio": (self.hits + self.revalidated) / lookups if lookups else 0.0,
+            }
+
+
+_http_cache = None
+_http_cache_lock = threading.Lock()
+
+
+def http_cache():
+    """Process-wide cache shared by every APIClient (None with HTTP_CACHE=false)"""
+    global _http_cache
+    if not settings.HTTP_CACHE:
+        return None
+    with _http_cache_lock:
+        if _http_cache is None:
+            _http_cache = HTTPCache(path=settings.HTTP_CACHE_FILE or None)
+        return _http_cache
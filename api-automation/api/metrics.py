@@ -0,0 +1,53 @@
+"""Per-client counters (requests, coalesced GETs, body encoding) readable from tests and load tools"""
+
+import threading
+
+
+class ClientMetrics:
+    """Thread-safe counters updated by APIClient; snapshot() returns a plain dict"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.requests = 0
+            self.coalesced = 0
+            self.encoded_bodies = 0
+            self.encoded_bytes = 0
+            self.encode_time = 0.0
+            self.encode_cache_hits = 0
+            self.encode_cache_misses = 0
+
+    def record_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def record_coalesced(self):
+        """A GET answered by another caller's identical in-flight request (one request saved)"""
+        with self._lock:
+            self.coalesced += 1
+
+    def record_encode(self, seconds, size, hits=0, misses=0):
+        with self._lock:
+            self.encoded_bodies += 1
+            self.encoded_bytes += size
+            self.encode_time += seconds
+            self.encode_cache_hits += hits
+            self.encode_cache_misses += misses
+
+    def snapshot(self):
+        with self._lock:
+            lookups = self.encode_cache_hits + self.encode_cache_misses
+            return {
+                "requests": self.requests,
+                "coalesced": self.coalesced,
+                "encoded_bodies": self.encoded_bodies,
+                "encoded_bytes": self.encoded_bytes,
+                "encode_time": self.encode_time,
+                "avg_encode_time": self.encode_time / self.encoded_bodies if self.encoded_bodies else 0.0,
+                "encode_cache_hits": self.encode_cache_hits,
+                "encode_cache_misses": self.encode_cache_misses,
+                "encode_cache_hit_ratio": self.encode_cache_hits / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,117 @@
+"""Auto-paginating iterator for list endpoints (products, whitelist audit, techniques)"""
+
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+
+def extract_pagination(body):
+    """Return the pagination block from a list response (meta.pagination or pagination)"""
+    if not isinstance(body, dict):
+        return {}
+    meta = body.get("meta") or {}
+    if isinstance(meta, dict) and isinstance(meta.get("pagination"), dict):
+        return meta["pagination"]
+    if isinstance(body.get("pagination"), dict):
+        return body["pagination"]
+    return {}
+
+
+class Paginator:
+    """Iterate every item of a paginated listing while prefetching the next pages
+
+    Page 1 is fetched first to learn `total_pages`; after that up to
+    `prefetch` upcoming pages are requested in background threads while the
+    caller consumes the current one. When the API only reports `has_next`,
+    pages are prefetched speculatively and iteration stops at the first
+    page that is empty or reports has_next=False.
+
+    Usage:
+        for product in Paginator(client, Endpoints.PRODUCTS, params={"status": "pending_approval"}):
+            ...
+    """
+
+    def __init__(self, client, endpoint, params=None, limit=50, prefetch=2, max_pages=None):
+        self.client = client
+        self.endpoint = endpoint
+        self.params = dict(params or {})
+        self.limit = limit
+        self.prefetch = max(int(prefetch), 0)
+        self.max_pages = max_pages
+
+        self.pagination = {}
+        self.pages_fetched = 0
+
+    def fetch_page(self, page):
+        """Fetch one page and return (items, pagination); items is None on failure"""
+        params = dict(self.params, page=page, limit=self.limit)
+        response = self.client.get(self.endpoint, params=params)
+
+        if response.status_code != 200:
+            logger.warning(f"Paginator: {self.endpoint} page {page} returned {response.status_code}")
+            return None, {}
+
+        body = response.json()
+        items = body.get("data", []) if isinstance(body, dict) else body
+        return items if isinstance(items, list) else [], extract_pagination(body)
+
+    def _last_page(self):
+        """Highest page number worth requesting, or None when unknown"""
+        total_pages = self.pagination.get("total_pages")
+        last = int(total_pages) if total_pages not in (None, "") else None
+        if self.max_pages is not None:
+            last = self.max_pages if last is None else min(last, self.max_pages)
+        return last
+
+    def pages(self):
+        """Yield (page_number, items) for every page in order"""
+        items, self.pagination = self.fetch_page(1)
+        if items is None:
+            return
+        self.pages_fetched = 1
+        yield 1, items
+
+        if not items or self.pagination.get("has_next") is False:
+            return
+
+        executor = ThreadPoolExecutor(max_workers=max(self.prefetch, 1),
+                                      thread_name_prefix="paginator")
+        pending = deque()
+        next_page = 2
+        try:
+            while True:
+                last = self._last_page()
+                while len(pending) < max(self.prefetch, 1) and (last is None or next_page <= last):
+                    pending.append((next_page, executor.submit(self.fetch_page, next_page)))
+                    next_page += 1
+                if not pending:
+                    return
+
+                page, future = pending.popleft()
+                items, pagination = future.result()
+                if items is None:
+                    return
+                if pagination:
+                    self.pagination = pagination
+                self.pages_fetched += 1
+                if items:
+                    yield page, items
+                if not items or pagination.get("has_next") is False:
+                    return
+        finally:
+            for _, future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def __iter__(self):
+        for _, items in self.pages():
+            yield from items
+
+    def first(self, predicate):
+        """Return the first item matching predicate, stopping the crawl early"""
+        for item in self:
+            if predicate(item):
+                return item
+        return None
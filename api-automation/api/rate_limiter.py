@@ -0,0 +1,109 @@
+"""Token-bucket rate limiter shared by concurrent request drivers"""
+
+import json
+import os
+import threading
+import time
+from config.settings import settings
+
+
+class RateLimiter:
+    """Thread-safe token bucket: `rate` requests per second with bursts up to `burst`
+
+    A rate of None or 0 disables limiting. acquire() reserves a send time
+    under the lock and sleeps outside it, so many threads can wait at once
+    without serializing on the lock.
+    """
+
+    def __init__(self, rate=None, burst=1):
+        self.rate = rate
+        self.burst = max(int(burst), 1)
+        self._lock = threading.Lock()
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+
+    def reserve(self, endpoint=None):
+        """Reserve one token and return how long the caller must wait for it"""
+        if not self.rate:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self, endpoint=None):
+        """Block until a request may be sent; returns the time spent waiting"""
+        wait = self.reserve(endpoint)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class EndpointRateLimiter:
+    """Routes each request to the limiter of its endpoint group (see load_profile)
+
+    groups: [(prefixes, RateLimiter)]; endpoints matching no prefix use `default`.
+    Grouped endpoints pass through `default` as well, so a global cap still applies.
+    """
+
+    def __init__(self, groups, default=None):
+        self.groups = [(tuple(p.strip("/") for p in prefixes), limiter) for prefixes, limiter in groups]
+        self.default = default or RateLimiter()
+        self.rate = self.default.rate
+
+    def limiter_for(self, endpoint):
+        if endpoint:
+            path = endpoint.strip("/")
+            for prefixes, limiter in self.groups:
+                if any(path == p or path.startswith(p + "/") for p in prefixes):
+                    return limiter
+        return self.default
+
+    def reserve(self, endpoint=None):
+        """Reserve a token from the group limiter and the default one; the longer wait wins"""
+        limiter = self.limiter_for(endpoint)
+        wait = limiter.reserve() if limiter is not self.default else 0.0
+        return max(wait, self.default.reserve())
+
+    def acquire(self, endpoint=None):
+        wait = self.reserve(endpoint)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+def load_profile(path, default=None):
+    """EndpointRateLimiter from a profile written by perf.rate_limit_discovery (None if missing)
+
+    Profile groups look like {"prefixes": ["/auth/login"], "rate": 0.8, "burst": 4};
+    groups without a rate (no limit found) are left unthrottled.
+    """
+    if not path or not os.path.exists(path):
+        return None
+    with open(path) as f:
+        profile = json.load(f)
+    groups = [(group["prefixes"], RateLimiter(group["rate"], group.get("burst", 1)))
+              for group in profile.get("groups", {}).values() if group.get("rate")]
+    return EndpointRateLimiter(groups, default)
+
+
+_global_limiter = None
+_global_lock = threading.Lock()
+
+
+def global_limiter():
+    """Process-wide limiter every APIClient passes through
+
+    RATE_LIMIT_RPS / RATE_LIMIT_BURST cap all requests; a discovered profile
+    at RATE_LIMIT_PROFILE (if present) adds per-endpoint-group limits on top.
+    """
+    global _global_limiter
+    with _global_lock:
+        if _global_limiter is None:
+            default = RateLimiter(settings.RATE_LIMIT_RPS or None, settings.RATE_LIMIT_BURST)
+            _global_limiter = load_profile(settings.RATE_LIMIT_PROFILE, default) or default
+        return _global_limiter
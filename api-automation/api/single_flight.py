@@ -0,0 +1,92 @@
+"""Single-flight coalescing of identical concurrent GETs
+
+When several threads ask for the same read at the same time (same base
+URL, endpoint, params and Authorization header), only the first one - the
+leader - sends it; the others wait for the leader's response and get the
+very same Response object (or its exception). Nothing is cached: once the
+leader's request finishes, the next identical GET goes out again.
+
+APIClient uses the process-wide instance from single_flight(), so separate
+clients (one per test) coalesce with each other as well. SINGLE_FLIGHT=false
+turns it off; drivers that must put every request on the server (e.g.
+perf.rate_limit_discovery) set client.single_flight = None.
+"""
+
+import threading
+from config.settings import settings
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Runs fn() once per key among concurrent callers and shares the outcome"""
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.coalesced = 0
+
+    def do(self, key, fn):
+        """(result, shared): shared is True if another caller's in-flight fn() produced it"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.leaders += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+    def stats(self):
+        with self._lock:
+            calls = self.leaders + self.coalesced
+            return {"requests_sent": self.leaders, "coalesced": self.coalesced,
+                    "saved_ratio": self.coalesced / calls if calls else 0.0}
+
+
+def coalesce_key(base_url, method, endpoint, headers, kwargs):
+    """Key of a coalescable request, or None (non-GET, streaming, bodies, files...)"""
+    if method.upper() != "GET" or set(kwargs) - {"params", "headers", "timeout"}:
+        return None
+    params = kwargs.get("params") or {}
+    params = tuple(sorted(params.items())) if isinstance(params, dict) else tuple(params)
+    extra = tuple(sorted((kwargs.get("headers") or {}).items()))
+    return (base_url, endpoint, repr(params), headers.get("Authorization"), extra)
+
+
+_single_flight = None
+_single_flight_lock = threading.Lock()
+
+
+def single_flight():
+    """Process-wide coalescer shared by every APIClient (None with SINGLE_FLIGHT=false)"""
+    global _single_flight
+    if not settings.SINGLE_FLIGHT:
+        return None
+    with _single_flight_lock:
+        if _single_flight is None:
+            _single_flight = SingleFlight()
+        return _single_flight
@@ -0,0 +1,153 @@
+"""Shared pooled HTTP transport borrowed by every APIClient
+
+Creating a requests.Session per client (or per test) means a new TCP+TLS
+handshake for every short test, and those sessions were never closed. A
+Transport owns one Session with a sized urllib3 connection pool; there is
+one Transport per (base URL, xdist worker) in this process, handed out by
+get_transport(). Clients keep their own headers (auth, content type) and
+pass them with every request, so borrowing a transport never leaks auth
+between tests. Cookies are not persisted on the shared session for the
+same reason.
+
+Idle pools are reaped by a background thread after HTTP_IDLE_TIMEOUT
+seconds (servers drop idle keep-alive connections anyway), and
+shutdown_transports() closes everything at the end of the session.
+"""
+
+import atexit
+import logging
+import threading
+import time
+from http.cookiejar import DefaultCookiePolicy
+import requests
+from requests.adapters import HTTPAdapter
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class Transport:
+    """One pooled requests.Session shared by all clients of a base URL"""
+
+    def __init__(self, base_url, pool_size=None, pool_block=None, keep_alive=None, idle_timeout=None):
+        self.base_url = base_url
+        self.pool_size = pool_size or settings.HTTP_POOL_SIZE
+        self.pool_block = settings.HTTP_POOL_BLOCK if pool_block is None else pool_block
+        self.keep_alive = settings.HTTP_KEEP_ALIVE if keep_alive is None else keep_alive
+        self.idle_timeout = settings.HTTP_IDLE_TIMEOUT if idle_timeout is None else idle_timeout
+
+        self.requests = 0
+        self.reaped = 0
+        self.closed = False
+        self.last_used = time.monotonic()
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.session = self._new_session()
+
+    def _new_session(self):
+        session = requests.Session()
+        session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))  # Never store cookies
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size, pool_block=self.pool_block)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        if not self.keep_alive:
+            session.headers["Connection"] = "close"
+        return session
+
+    def request(self, method, url, **kwargs):
+        """Send a request on the shared pool; headers come from the calling client"""
+        with self._lock:
+            if self.closed:
+                raise RuntimeError(f"Transport for {self.base_url} has been shut down")
+            self._in_flight += 1
+            self.requests += 1
+            session = self.session
+        try:
+            return session.request(method, url, **kwargs)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+                self.last_used = time.monotonic()
+
+    def reap(self):
+        """Close pooled connections if the transport has been idle too long; True if reaped"""
+        with self._lock:
+            if self.closed or self._in_flight or time.monotonic() - self.last_used < self.idle_timeout:
+                return False
+            old, self.session = self.session, self._new_session()
+            self.reaped += 1
+        old.close()
+        logger.info(f"Reaped idle connections for {self.base_url}")
+        return True
+
+    def connections_opened(self):
+        """Total connections the current pool has opened (new TCP/TLS handshakes)"""
+        total = 0
+        for adapter in {id(a): a for a in self.session.adapters.values()}.values():
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is not None:
+                    total += pool.num_connections
+        return total
+
+    def stats(self):
+        return {
+            "base_url": self.base_url,
+            "requests": self.requests,
+            "connections_opened": self.connections_opened(),
+            "reaped": self.reaped,
+            "pool_size": self.pool_size,
+            "keep_alive": self.keep_alive,
+        }
+
+    def close(self):
+        with self._lock:
+            self.closed = True
+        self.session.close()
+
+
+_transports = {}
+_registry_lock = threading.Lock()
+_reaper = None
+
+
+def _reap_loop():
+    while True:
+        with _registry_lock:
+            transports = list(_transports.values())
+        interval = min([t.idle_timeout for t in transports] or [settings.HTTP_IDLE_TIMEOUT])
+        time.sleep(max(interval / 2, 0.05))
+        for transport in transports:
+            transport.reap()
+
+
+def get_transport(base_url, worker_id=None, **options):
+    """Shared transport for (base_url, worker); options only apply when it is created"""
+    global _reaper
+    key = (base_url.rstrip("/"), worker_id or settings.WORKER_ID)
+    with _registry_lock:
+        transport = _transports.get(key)
+        if transport is None or transport.closed:
+            transport = _transports[key] = Transport(key[0], **options)
+        if _reaper is None:
+            _reaper = threading.Thread(target=_reap_loop, name="transport-reaper", daemon=True)
+            _reaper.start()
+        return transport
+
+
+def transport_stats():
+    with _registry_lock:
+        return [t.stats() for t in _transports.values()]
+
+
+def shutdown_transports():
+    """Close every shared transport (end of the test session / process)"""
+    with _registry_lock:
+        transports = list(_transports.values())
+        _transports.clear()
+    for transport in transports:
+        transport.close()
+
+
+atexit.register(shutdown_transports)
@@ -0,0 +1,227 @@
+"""Streaming multipart uploads to Endpoints.FILES
+
+Product payloads reference file ids that must already exist; FileUploader
+creates them. Each file is sent as a multipart/form-data body that is read
+straight from a memory-mapped local file in small blocks, so a large file
+is never copied into memory as a whole (the body has a known length, so the
+request still carries a Content-Length instead of chunked encoding):
+
+    uploader = FileUploader(client, concurrency=4)
+    report = uploader.upload_many(["a.jpg", "b.jpg"])
+    payload["files"] = payload_files(report["ids"])
+
+Uploads run on a thread pool through APIClient.request, so pacing, the rate
+limiter and the circuit breaker apply. The report carries per-file results,
+bytes, elapsed time, throughput and latency percentiles; an optional
+progress callback receives an UploadProgress after every block sent.
+"""
+
+import logging
+import mimetypes
+import mmap
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from api.endpoints import Endpoints
+from perf.stats import summarize
+
+logger = logging.getLogger(__name__)
+
+CRLF = b"\r\n"
+
+
+class MultipartFile:
+    """Read-only, seekable multipart/form-data body backed by an mmap of one file
+
+    Only the part headers and the closing boundary are held in memory; the
+    file content is sliced from the mapping as the transport reads it.
+    """
+
+    def __init__(self, path, field="file", filename=None, content_type=None, fields=None, on_read=None):
+        self.path = path
+        self.boundary = uuid.uuid4().hex
+        filename = filename or os.path.basename(path)
+        content_type = content_type or mimetypes.guess_type(filename)[0] or "application/octet-stream"
+
+        head = b""
+        for name, value in (fields or {}).items():
+            head += (f"--{self.boundary}\r\nContent-Disposition: form-data; name=\"{name}\"\r\n\r\n"
+                     f"{value}\r\n").encode("utf-8")
+        head += (f"--{self.boundary}\r\nContent-Disposition: form-data; name=\"{field}\"; "
+                 f"filename=\"{filename}\"\r\nContent-Type: {content_type}\r\n\r\n").encode("utf-8")
+        self._head = head
+        self._tail = f"\r\n--{self.boundary}--\r\n".encode("utf-8")
+
+        self._file = open(path, "rb")
+        self.file_size = os.fstat(self._file.fileno()).st_size
+        # mmap cannot map an empty file
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self.file_size else b""
+        self._segments = ((0, self._head), (len(self._head), self._map),
+                          (len(self._head) + self.file_size, self._tail))
+        self._length = len(self._head) + self.file_size + len(self._tail)
+        self._position = 0
+        self.on_read = on_read
+
+    @property
+    def content_type(self):
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    def __len__(self):
+        return self._length
+
+    def __iter__(self):
+        while True:
+            block = self.read(64 * 1024)
+            if not block:
+                return
+            yield block
+
+    def read(self, size=-1):
+        """Next block of the body: never more than `size` bytes, b"" at the end"""
+        if size is None or size < 0:
+            size = self._length - self._position
+        out = []
+        remaining = size
+        for start, segment in self._segments:
+            if remaining <= 0:
+                break
+            end = start + len(segment)
+            if self._position >= end:
+                continue
+            offset = self._position - start
+            block = segment[offset:offset + remaining]
+            out.append(block)
+            self._position += len(block)
+            remaining -= len(block)
+        data = b"".join(out)
+        if data and self.on_read:
+            self.on_read(len(data))
+        return data
+
+    def tell(self):
+        return self._position
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        """Rewind support for retries and redirects (the on_read count is not undone)"""
+        base = {os.SEEK_SET: 0, os.SEEK_CUR: self._position, os.SEEK_END: self._length}[whence]
+        self._position = min(max(base + offset, 0), self._length)
+        return self._position
+
+    def close(self):
+        if self.file_size:
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class UploadProgress:
+    """Bytes and files sent so far by one upload_many() call"""
+
+    def __init__(self, files_total, bytes_total):
+        self.files_total = files_total
+        self.bytes_total = bytes_total
+        self.files_done = 0
+        self.bytes_sent = 0
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def add_bytes(self, count):
+        with self._lock:
+            self.bytes_sent += count
+
+    def file_done(self):
+        with self._lock:
+            self.files_done += 1
+
+    @property
+    def throughput(self):
+        """Bytes per second so far"""
+        elapsed = time.perf_counter() - self.started
+        return self.bytes_sent / elapsed if elapsed > 0 else 0.0
+
+
+def file_id(response):
+    """Id of the uploaded file from an upload response, else None"""
+    try:
+        data = response.json().get("data")
+    except ValueError:
+        return None
+    if isinstance(data, list):
+        data = data[0] if data else None
+    return (data or {}).get("id") if isinstance(data, dict) else None
+
+
+def payload_files(ids):
+    """files entries for a product payload"""
+    return [{"id": fid, "is_active": True, "deleted": False} for fid in ids]
+
+
+class FileUploader:
+    """Uploads local files concurrently and collects their ids"""
+
+    def __init__(self, client, concurrency=4, endpoint=Endpoints.FILES, field="file", fields=None,
+                 progress=None):
+        self.client = client
+        self.concurrency = max(int(concurrency), 1)
+        self.endpoint = endpoint
+        self.field = field
+        self.fields = fields or {}
+        self.progress = progress
+
+    def _upload(self, path, tracker):
+        result = {"path": path, "file_id": None, "status_code": None, "bytes": 0, "elapsed": None, "error": None}
+        start = time.perf_counter()
+        try:
+            def on_read(count):
+                tracker.add_bytes(count)
+                if self.progress:
+                    self.progress(tracker)
+
+            with MultipartFile(path, self.field, fields=self.fields, on_read=on_read) as body:
+                result["bytes"] = body.file_size
+                response = self.client.post(self.endpoint, data=body, headers={"Content-Type": body.content_type})
+            result["status_code"] = response.status_code
+            if response.status_code in (200, 201):
+                result["file_id"] = file_id(response)
+            if result["file_id"] is None:
+                result["error"] = f"HTTP {response.status_code}: {response.text[:120]}"
+        except Exception as e:
+            result["error"] = f"{type(e).__name__}: {e}"
+            logger.error(f"Upload of {path} failed: {result['error']}")
+        result["elapsed"] = time.perf_counter() - start
+        tracker.file_done()
+        return result
+
+    def upload(self, path):
+        """Upload one file; result dict with file_id (None on failure) and error"""
+        return self._upload(path, UploadProgress(1, os.path.getsize(path)))
+
+    def upload_many(self, paths):
+        """Upload every path concurrently and return the report dict (results in path order)"""
+        paths = list(paths)
+        tracker = UploadProgress(len(paths), sum(os.path.getsize(p) for p in paths))
+        with ThreadPoolExecutor(max_workers=min(self.concurrency, max(len(paths), 1)),
+                                thread_name_prefix="upload") as pool:
+            results = list(pool.map(lambda p: self._upload(p, tracker), paths))
+        elapsed = time.perf_counter() - tracker.started
+
+        uploaded = [r for r in results if r["file_id"]]
+        sent = sum(r["bytes"] for r in uploaded)
+        return {
+            "files": results,
+            "ids": [r["file_id"] for r in uploaded],
+            "uploaded": len(uploaded),
+            "failed": len(results) - len(uploaded),
+            "bytes": sent,
+            "elapsed": elapsed,
+            "throughput_mbps": sent / elapsed / 1e6 if elapsed > 0 else 0.0,
+            "files_per_second": len(uploaded) / elapsed if elapsed > 0 else 0.0,
+            "latency": summarize([r["elapsed"] for r in uploaded]),
+        }
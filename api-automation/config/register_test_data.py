@@ -9,28 +9,24 @@ Field Requirements:
 - email: OPTIONAL
 """
 
-import uuid
-import time
-import random
+from utils.identity import default_generator
 
 # ============================================
 # DATA GENERATORS
 # ============================================
+# Backed by utils/identity.py: unique per run, per xdist worker and across runs
 
 def generate_unique_email(base="artisan"):
     """Generate a unique email for testing"""
-    timestamp = int(time.time() * 1000)
-    return f"{base}_{timestamp}_{uuid.uuid4().hex[:4]}@test.com"
+    return default_generator().email(base)
 
 def generate_unique_phone():
     """Generate a unique phone number for testing (Bangladesh format)"""
-    phone_suffix = ''.join(str(random.randint(0, 9)) for _ in range(8))
-    return f"+88017{phone_suffix}"
+    return default_generator().phone("bd")
 
 def generate_unique_pk_phone():
     """Generate a unique Pakistan phone number"""
-    suffix = ''.join(str(random.randint(0, 9)) for _ in range(9))
-    return f"+92{suffix}"
+    return default_generator().phone("pk")
 
 # ============================================
 # ARTISAN REGISTRATION TEST DATA
@@ -2,6 +2,7 @@
 
 import os
 import sys
+import uuid
 from dotenv import load_dotenv
 
 try:
@@ -13,6 +14,8 @@ except Exception as e:
     print(f"⚠ Warning: Could not load .env file: {e}")
     print("⚠ Using default settings...")
 
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
 class Settings:
     # API Configuration
     BASE_URL = os.getenv("BASE_URL", "https://api.uat.teresaapp.com/api/v1")
@@ -26,6 +29,79 @@ class Settings:
     # NEW: Rate limiting protection
     MAX_RETRIES = int(os.getenv("MAX_RETRIES", "2"))
     RATE_LIMIT_MAX_WAIT = int(os.getenv("RATE_LIMIT_MAX_WAIT", "60"))
+    RATE_LIMIT_RPS = float(os.getenv("RATE_LIMIT_RPS", "0"))      # Process-wide cap, 0 = off
+    RATE_LIMIT_BURST = int(os.getenv("RATE_LIMIT_BURST", "1"))
+    RATE_LIMIT_PROFILE = os.getenv("RATE_LIMIT_PROFILE", os.path.join(PROJECT_ROOT, "rate_limits.json"))
+    
+    # Circuit breakers (see api/circuit_breaker.py): skip | fail | off
+    CIRCUIT_BREAKER = os.getenv("CIRCUIT_BREAKER", "skip").lower()
+    CIRCUIT_CONSECUTIVE_FAILURES = int(os.getenv("CIRCUIT_CONSECUTIVE_FAILURES", "3"))
+    CIRCUIT_FAILURE_RATE = float(os.getenv("CIRCUIT_FAILURE_RATE", "0.5"))
+    CIRCUIT_WINDOW = int(os.getenv("CIRCUIT_WINDOW", "20"))
+    CIRCUIT_MIN_REQUESTS = int(os.getenv("CIRCUIT_MIN_REQUESTS", "10"))
+    CIRCUIT_RESET_TIMEOUT = float(os.getenv("CIRCUIT_RESET_TIMEOUT", "30"))
+    CIRCUIT_PROBE_TIMEOUT = float(os.getenv("CIRCUIT_PROBE_TIMEOUT", "5"))
+    
+    # Preflight readiness check before UAT runs (see utils/preflight.py): abort | breaker | off
+    PREFLIGHT = os.getenv("PREFLIGHT", "breaker").lower()
+    PREFLIGHT_TIMEOUT = float(os.getenv("PREFLIGHT_TIMEOUT", "5"))
+    PREFLIGHT_SLOW_LATENCY = float(os.getenv("PREFLIGHT_SLOW_LATENCY", "2.0"))
+    LOAD_CONCURRENCY = int(os.getenv("LOAD_CONCURRENCY", "8"))   # Default for client.map/gather; preflight may lower it
+    
+    # Discovered alternative routes per environment (see api/endpoint_discovery.py)
+    ENDPOINT_CACHE = os.getenv("ENDPOINT_CACHE", os.path.join(PROJECT_ROOT, ".endpoint_cache.json"))
+    ENDPOINT_CACHE_TTL = float(os.getenv("ENDPOINT_CACHE_TTL", str(24 * 3600)))
+    
+    # Reference data snapshot (valid technique/file ids, units) for payload factories
+    REFERENCE_DATA = os.getenv("REFERENCE_DATA", "on").lower()               # on | off (built-in ids)
+    REFERENCE_DATA_CACHE = os.getenv("REFERENCE_DATA_CACHE", os.path.join(PROJECT_ROOT, ".reference_data.json"))
+    REFERENCE_DATA_TTL = float(os.getenv("REFERENCE_DATA_TTL", str(6 * 3600)))
+    
+    # Fuzzing: response signatures already reported (python -m utils.fuzzer --save)
+    FUZZ_SIGNATURES = os.getenv("FUZZ_SIGNATURES", os.path.join(PROJECT_ROOT, ".fuzz_signatures.json"))
+    
+    # Shared HTTP transport (see api/transport.py)
+    HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "10"))
+    HTTP_POOL_BLOCK = os.getenv("HTTP_POOL_BLOCK", "false").lower() == "true"
+    HTTP_KEEP_ALIVE = os.getenv("HTTP_KEEP_ALIVE", "true").lower() == "true"
+    HTTP_IDLE_TIMEOUT = float(os.getenv("HTTP_IDLE_TIMEOUT", "30"))
+    SINGLE_FLIGHT = os.getenv("SINGLE_FLIGHT", "true").lower() == "true"   # Coalesce identical concurrent GETs
+    HTTP_CACHE = os.getenv("HTTP_CACHE", "true").lower() == "true"          # Cache reference collections
+    HTTP_CACHE_MAX_BYTES = int(os.getenv("HTTP_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+    HTTP_CACHE_FILE = os.getenv("HTTP_CACHE_FILE", "")                      # e.g. .http_cache.json; empty = memory only
+    
+    # Parallel execution (pytest-xdist sets these in each worker process)
+    WORKER_ID = os.getenv("PYTEST_XDIST_WORKER", "gw0")
+    WORKER_INDEX = int(WORKER_ID[2:]) if WORKER_ID[2:].isdigit() else 0
+    WORKER_COUNT = int(os.getenv("PYTEST_XDIST_WORKER_COUNT", "1"))
+    
+    # Run namespace: shared by all xdist workers of one run (TEST_RUN_ID overrides)
+    RUN_ID = (os.getenv("TEST_RUN_ID")
+              or os.getenv("PYTEST_XDIST_TESTRUNUID", "")[:6]
+              or uuid.uuid4().hex[:6])
+    
+    # Scope searches/listings to this run's data (see utils/namespace.py): run | off
+    NAMESPACE_SCOPE = os.getenv("NAMESPACE_SCOPE", "run").lower()
+    
+    # Unique identity generation (see utils/identity.py)
+    IDENTITY_LEDGER = os.getenv("IDENTITY_LEDGER", os.path.join(PROJECT_ROOT, ".identity_ledger.json"))
+    IDENTITY_KEY = os.getenv("IDENTITY_KEY", "teresa-uat-identities")
+    IDENTITY_BLOCK_SIZE = int(os.getenv("IDENTITY_BLOCK_SIZE", "1000"))
+    IDENTITY_SLOT = int(os.getenv("IDENTITY_SLOT", "0"))     # This machine's slot ...
+    IDENTITY_SLOTS = int(os.getenv("IDENTITY_SLOTS", "1"))   # ... out of N machines without a shared ledger
+    # Walk the keyed sequence from 0 only when the key or slot is set explicitly; a fresh
+    # ledger otherwise starts at a random offset so clean CI checkouts do not replay numbers
+    IDENTITY_PINNED = bool(os.getenv("IDENTITY_KEY") or os.getenv("IDENTITY_SLOT"))
+    
+    # Cleanup of created test data (see utils/cleanup.py): on | off
+    CLEANUP = os.getenv("CLEANUP", "on").lower()
+    CLEANUP_LEDGER = os.getenv("CLEANUP_LEDGER", os.path.join(PROJECT_ROOT, ".cleanup_ledger.json"))
+    CLEANUP_CONCURRENCY = int(os.getenv("CLEANUP_CONCURRENCY", "4"))
+    CLEANUP_TIMEOUT = float(os.getenv("CLEANUP_TIMEOUT", "60"))        # Wait at session end; the rest is swept later
+    CLEANUP_SWEEP_AGE = float(os.getenv("CLEANUP_SWEEP_AGE", str(6 * 3600)))  # Entries of crashed runs
+    
+    # Product index (see utils/product_index.py)
+    PRODUCT_INDEX_MAX_ITEMS = int(os.getenv("PRODUCT_INDEX_MAX_ITEMS", "500"))
     
     # Test Data - UAT Environment
     TEST_USER_IDENTIFIER = os.getenv("TEST_USER_IDENTIFIER", "admin")
@@ -390,13 +390,20 @@
 
 """Test data for Product Creation API tests - Focused on data types and validation rules"""
 
-import time
-import uuid
+from utils.namespace import current_namespace
+from utils.payload_template import PayloadTemplate, REMOVE
+from utils.reference_data import FALLBACK, FILE, TECHNIQUE, ReferenceSnapshot
 
 
 class ProductTestData:
     """Test data configuration for product creation tests - Based on API validation rules"""
     
+    # ==================== REFERENCE DATA ====================
+    # Valid technique/file ids and units; the session snapshot replaces the
+    # built-in ids (use_reference), TECHNIQUE[i] / FILE[i] placeholders in the
+    # case tables below are filled in by resolve()
+    REFERENCE = ReferenceSnapshot(None, FALLBACK)
+    
     # ==================== API VALIDATION LIMITS ====================
     VALIDATION_LIMITS = {
         "name_max_length": 30,
@@ -453,10 +460,10 @@ class ProductTestData:
             {"name": "Cotton", "price": 20.50, "quantity": 5, "unit": "kg"}
         ],
         "techniques": [
-            {"id": "8fc243e7-d556-43b6-81a8-392d30b586c5", "deleted": False}
+            {"id": TECHNIQUE[0], "deleted": False}
         ],
         "files": [
-            {"id": "d4f9620a-dc9e-4946-86e5-4ccd6f1645cc", "is_active": True, "deleted": False}
+            {"id": FILE[0], "is_active": True, "deleted": False}
         ],
         "measurements": [
             {"size": "Standard", "width": 10.5, "length": 10.5, "height": 15.0}
@@ -717,19 +724,19 @@ class ProductTestData:
         # Valid cases
         {
             "name": "single_technique",
-            "techniques": [{"id": "8fc243e7-d556-43b6-81a8-392d30b586c5", "deleted": False}],
+            "techniques": [{"id": TECHNIQUE[0], "deleted": False}],
             "should_pass": True
         },
         {
             "name": "single_technique_without_deleted",
-            "techniques": [{"id": "8fc243e7-d556-43b6-81a8-392d30b586c5"}],
+            "techniques": [{"id": TECHNIQUE[0]}],
             "should_pass": True
         },
         {
             "name": "multiple_techniques_2",
             "techniques": [
-                {"id": "8fc243e7-d556-43b6-81a8-392d30b586c5", "deleted": False},
-                {"id": "fcae2e4e-b8b5-4a5f-b879-111896c2e849", "deleted": False}
+                {"id": TECHNIQUE[0], "deleted": False},
+                {"id": TECHNIQUE[1], "deleted": False}
             ],
             "should_pass": True
         },
@@ -747,7 +754,7 @@ class ProductTestData:
         },
         {
             "name": "techniques_with_deleted_true",
-            "techniques": [{"id": "8fc243e7-d556-43b6-81a8-392d30b586c5", "deleted": True}],
+            "techniques": [{"id": TECHNIQUE[0], "deleted": True}],
             "should_pass": True
         },
         
@@ -789,7 +796,7 @@ class ProductTestData:
         },
         {
             "name": "technique_extra_fields",
-            "techniques": [{"id": "8fc243e7-d556-43b6-81a8-392d30b586c5", "deleted": False, "extra": "field"}],
+            "techniques": [{"id": TECHNIQUE[0], "deleted": False, "extra": "field"}],
             "should_pass": True  # Extra fields might be ignored
         },
     ]
@@ -799,29 +806,29 @@ class ProductTestData:
         # Valid cases
         {
             "name": "single_file",
-            "files": [{"id": "d4f9620a-dc9e-4946-86e5-4ccd6f1645cc", "is_active": True, "deleted": False}],
+            "files": [{"id": FILE[0], "is_active": True, "deleted": False}],
             "should_pass": True
         },
         {
             "name": "single_file_without_is_active",
-            "files": [{"id": "d4f9620a-dc9e-4946-86e5-4ccd6f1645cc", "deleted": False}],
+            "files": [{"id": FILE[0], "deleted": False}],
             "should_pass": True
         },
         {
             "name": "single_file_without_deleted",
-            "files": [{"id": "d4f9620a-dc9e-4946-86e5-4ccd6f1645cc", "is_active": True}],
+            "files": [{"id": FILE[0], "is_active": True}],
             "should_pass": True
         },
         {
             "name": "single_file_minimum_fields",
-            "files": [{"id": "d4f9620a-dc9e-4946-86e5-4ccd6f1645cc"}],
+            "files": [{"id": FILE[0]}],
             "should_pass": True
         },
         {
             "name": "multiple_files_2",
             "files": [
-                {"id": "d4f9620a-dc9e-4946-86e5-4ccd6f1645cc", "is_active": True, "deleted": False},
-                {"id": "58a82002-020b-4e12-917f-5fcb3dccd29d", "is_active": True, "deleted": False}
+                {"id": FILE[0], "is_active": True, "deleted": False},
+                {"id": FILE[1], "is_active": True, "deleted": False}
             ],
             "should_pass": True
         },
@@ -839,7 +846,7 @@ class ProductTestData:
         },
         {
             "name": "files_with_is_active_false",
-            "files": [{"id": "d4f9620a-dc9e-4946-86e5-4ccd6f1645cc", "is_active": False, "deleted": False}],
+            "files": [{"id": FILE[0], "is_active": False, "deleted": False}],
             "should_pass": True
         },
         
@@ -881,7 +888,7 @@ class ProductTestData:
         },
         {
             "name": "file_extra_fields",
-            "files": [{"id": "d4f9620a-dc9e-4946-86e5-4ccd6f1645cc", "is_active": True, "deleted": False, "extra": "field"}],
+            "files": [{"id": FILE[0], "is_active": True, "deleted": False, "extra": "field"}],
             "should_pass": True  # Extra fields might be ignored
         },
     ]
@@ -1082,72 +1089,68 @@ class ProductTestData:
     
     @staticmethod
     def generate_unique_product_name(base_name="Test Product"):
-        """Generate a unique product name within 30 character limit"""
-        timestamp = int(time.time())
-        unique_id = str(uuid.uuid4())[:4]
-        name = f"{base_name} {timestamp}-{unique_id}"
-        # Ensure within 30 characters
-        if len(name) > 30:
-            name = f"{base_name[:15]} {timestamp}"
-        return name[:30]
+        """Generate a unique product name in this run's namespace within the 30 character limit"""
+        return current_namespace().name(base_name, max_length=30)
+    
+    # ==================== PAYLOAD TEMPLATES ====================
+    # Frozen base payload; nested lists/dicts are shared between built payloads
+    VALID_PRODUCT_TEMPLATE = PayloadTemplate({
+        "name": "Test Product",  # Replaced with a unique name on every build
+        "description": "This is a test product created for API validation",
+        "hours_to_make": 2.5,
+        "monthly_qty": 50,
+        "annual_qty": 600,
+        "custom_price": 25.99,
+        "is_active": True,
+        "status": "draft",
+        "workshops": [],
+        "materials": [
+            {
+                "name": "Cotton",
+                "price": 20.50,
+                "quantity": 5,
+                "unit": "kg"
+            }
+        ],
+        "techniques": REFERENCE.techniques(),
+        "files": REFERENCE.files(),
+        "measurements": [
+            {
+                "size": "Standard",
+                "width": 10.5,
+                "length": 10.5,
+                "height": 15.0,
+                "description": "Standard size measurement"
+            }
+        ]
+    })
     
     @staticmethod
-    def get_valid_product_payload(**kwargs):
-        """Get a valid product payload with optional overrides"""
-        payload = {
-            "name": ProductTestData.generate_unique_product_name(),
-            "description": "This is a test product created for API validation",
-            "hours_to_make": 2.5,
-            "monthly_qty": 50,
-            "annual_qty": 600,
-            "custom_price": 25.99,
-            "is_active": True,
-            "status": "draft",
-            "workshops": [],
-            "materials": [
-                {
-                    "name": "Cotton",
-                    "price": 20.50,
-                    "quantity": 5,
-                    "unit": "kg"
-                }
-            ],
-            "techniques": [
-                {
-                    "id": "8fc243e7-d556-43b6-81a8-392d30b586c5",
-                    "deleted": False
-                }
-            ],
-            "files": [
-                {
-                    "id": "d4f9620a-dc9e-4946-86e5-4ccd6f1645cc",
-                    "is_active": True,
-                    "deleted": False
-                }
-            ],
-            "measurements": [
-                {
-                    "size": "Standard",
-                    "width": 10.5,
-                    "length": 10.5,
-                    "height": 15.0,
-                    "description": "Standard size measurement"
-                }
-            ]
-        }
-        
-        # Update with any provided kwargs
-        payload.update(kwargs)
-        
-        # Handle field removal if specified
-        if kwargs.get("remove_field"):
-            field_to_remove = kwargs["remove_field"]
-            if field_to_remove in payload:
-                del payload[field_to_remove]
-            if "remove_field" in payload:
-                del payload["remove_field"]
-        
-        return payload
+    def get_valid_product_payload(patches=None, **kwargs):
+        """Get a valid product payload with optional overrides and path patches
+
+        patches: {"materials.0.price": 10.0, ...} applied copy-on-write;
+        nested lists/dicts in the result are read-only (see utils.payload_template).
+        """
+        remove_field = kwargs.pop("remove_field", None)
+        if "name" not in kwargs:  # Not setdefault: that would spend a unique name on every call
+            kwargs["name"] = ProductTestData.generate_unique_product_name()
+        if remove_field:
+            kwargs[remove_field] = REMOVE
+        return ProductTestData.VALID_PRODUCT_TEMPLATE.build(patches, **kwargs)
+    
+    @classmethod
+    def use_reference(cls, snapshot):
+        """Build payloads with the snapshot's technique id, file id and unit"""
+        cls.REFERENCE = snapshot
+        cls.VALID_PRODUCT_TEMPLATE = cls.VALID_PRODUCT_TEMPLATE.derive(
+            {"materials.0.unit": snapshot.unit()},
+            techniques=snapshot.techniques(), files=snapshot.files())
+    
+    @classmethod
+    def resolve(cls, value):
+        """Case-table value with TECHNIQUE[i] / FILE[i] placeholders replaced by real ids"""
+        return cls.REFERENCE.resolve(value)
     
     @staticmethod
     def get_payload_without_field(field_name):
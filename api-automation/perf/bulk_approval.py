@@ -0,0 +1,186 @@
+"""Concurrent bulk product approval driver for the RBAC product status endpoint
+
+Fires approve/reject PATCHes at Endpoints.PRODUCT_STATUS for N pending
+products at a fixed concurrency (optionally capped to a request rate),
+verifies the final product states through the listing endpoint and
+reports throughput, latency percentiles and error/conflict rates.
+
+    # Local development against the stub server
+    python -m perf.bulk_approval --stub --count 500 --concurrency 32
+
+    # UAT, capped at 2 requests/second
+    python -m perf.bulk_approval --count 20 --concurrency 4 --rate 2
+"""
+
+import argparse
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from api.endpoints import Endpoints
+from api.paginator import Paginator
+from api.rate_limiter import RateLimiter
+from perf.stats import summarize, format_summary
+
+
+class BulkApprovalDriver:
+    """Runs a batch of product status changes concurrently and measures them"""
+
+    def __init__(self, client, concurrency=8, rate=None, burst=1, reject_ratio=0.0,
+                 reason="Bulk approval driver"):
+        self.client = client
+        self.concurrency = max(int(concurrency), 1)
+        self.limiter = RateLimiter(rate, burst)
+        self.reject_ratio = reject_ratio
+        self.reason = reason
+
+    def target_status(self, position):
+        """Deterministic approve/reject split: every 1/reject_ratio-th product is rejected"""
+        if self.reject_ratio and int((position + 1) * self.reject_ratio) > int(position * self.reject_ratio):
+            return "rejected"
+        return "approved"
+
+    def _change_status(self, position, product_id):
+        status = self.target_status(position)
+        payload = {"product_id": product_id, "status": status, "reason": f"{self.reason} #{position + 1}"}
+
+        self.limiter.acquire()
+        start = time.perf_counter()
+        try:
+            response = self.client.patch(Endpoints.PRODUCT_STATUS, json=payload)
+            code, error = response.status_code, None
+        except Exception as e:
+            code, error = None, str(e)
+        latency = time.perf_counter() - start
+
+        return {"product_id": product_id, "status": status, "code": code,
+                "latency": latency, "error": error}
+
+    def verify(self, results):
+        """Re-list products by status and return ids whose final state is wrong"""
+        expected = {r["product_id"]: r["status"] for r in results if r["code"] == 200}
+        actual = {}
+        for status in set(expected.values()):
+            for product in Paginator(self.client, Endpoints.PRODUCTS, params={"status": status},
+                                     limit=100, prefetch=self.concurrency):
+                if product.get("id") in expected:
+                    actual[product["id"]] = product.get("status")
+        return sorted(pid for pid, status in expected.items() if actual.get(pid) != status)
+
+    def run(self, product_ids, verify=True):
+        """Change the status of every product and return the report dict"""
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="bulk-approval") as pool:
+            results = list(pool.map(self._change_status, range(len(product_ids)), product_ids))
+        elapsed = time.perf_counter() - start
+
+        codes = {}
+        for result in results:
+            key = str(result["code"]) if result["code"] is not None else "error"
+            codes[key] = codes.get(key, 0) + 1
+
+        total = len(results)
+        succeeded = codes.get("200", 0)
+        report = {
+            "requests": total,
+            "concurrency": self.concurrency,
+            "rate_cap": self.limiter.rate,
+            "elapsed": elapsed,
+            "throughput": succeeded / elapsed if elapsed else 0.0,
+            "status_codes": codes,
+            "success_rate": succeeded / total if total else 0.0,
+            "error_rate": (total - succeeded) / total if total else 0.0,
+            "conflict_rate": codes.get("409", 0) / total if total else 0.0,
+            "latency": summarize([r["latency"] for r in results]),
+            "errors": [r["error"] for r in results if r["error"]][:10],
+        }
+        if verify:
+            mismatched = self.verify(results)
+            report["verified"] = not mismatched
+            report["mismatched"] = mismatched
+        return report
+
+
+def print_report(report):
+    print(f"\n{'='*70}")
+    print("BULK PRODUCT APPROVAL REPORT")
+    print(f"{'='*70}")
+    print(f"   Requests:     {report['requests']} (concurrency {report['concurrency']}, "
+          f"rate cap {report['rate_cap'] or 'none'})")
+    print(f"   Elapsed:      {report['elapsed']:.2f}s")
+    print(f"   Throughput:   {report['throughput']:.1f} approvals/s")
+    print(f"   Latency:      {format_summary(report['latency'])}")
+    print(f"   Status codes: {report['status_codes']}")
+    print(f"   Error rate:   {report['error_rate']:.1%}  Conflict rate: {report['conflict_rate']:.1%}")
+    if "verified" in report:
+        mark = "✓" if report["verified"] else "❌"
+        print(f"   {mark} Final states verified ({len(report['mismatched'])} mismatched)")
+    for error in report["errors"]:
+        print(f"   ⚠ {error}")
+    print(f"{'='*70}")
+
+
+def main():
+    from api.client import APIClient
+    from config.settings import settings
+    from utils.product_index import ProductIndex
+
+    parser = argparse.ArgumentParser(description="Bulk product approval load driver")
+    parser.add_argument("--stub", action="store_true", help="Run against a local stub server")
+    parser.add_argument("--base-url", default=settings.BASE_URL)
+    parser.add_argument("--count", type=int, default=20, help="Number of pending products to process")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--rate", type=float, default=None,
+                        help="Max requests/second (defaults to 2 for non-stub runs)")
+    parser.add_argument("--reject-ratio", type=float, default=0.0)
+    parser.add_argument("--no-verify", action="store_true")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    stub = None
+    base_url = args.base_url
+    identifier, password = settings.ADMIN_EMAIL, settings.ADMIN_PASSWORD
+    if args.stub:
+        from utils.stub_server import StubAPIServer
+        stub = StubAPIServer().start()
+        stub.seed_products(args.count, status="pending_approval")
+        base_url = stub.base_url
+        identifier, password = stub.admin_identifier, stub.admin_password
+    elif args.rate is None:
+        args.rate = 2.0
+
+    client = APIClient(base_url=base_url)
+    client.request_delay = 0  # Pacing is handled by the driver's rate cap
+    try:
+        response = client.post(Endpoints.LOGIN, json={"identifier": identifier, "password": password})
+        token = response.json().get("data", {}).get("access_token") if response.status_code == 200 else None
+        if not token:
+            print(f"❌ Admin login failed: {response.status_code}")
+            return 1
+        client.set_auth_token(token)
+
+        index = ProductIndex(client, max_items=args.count)
+        product_ids = []
+        while len(product_ids) < args.count:
+            product_id = index.acquire("pending_approval")
+            if not product_id:
+                break
+            product_ids.append(product_id)
+        print(f"✓ {len(product_ids)} pending product(s) selected")
+        if not product_ids:
+            return 1
+
+        driver = BulkApprovalDriver(client, concurrency=args.concurrency, rate=args.rate,
+                                    reject_ratio=args.reject_ratio)
+        report = driver.run(product_ids, verify=not args.no_verify)
+        if args.json:
+            print(json.dumps(report, indent=2))
+        else:
+            print_report(report)
+        return 0 if report["error_rate"] == 0 and report.get("verified", True) else 1
+    finally:
+        if stub:
+            stub.stop()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
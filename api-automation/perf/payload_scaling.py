@@ -0,0 +1,225 @@
+"""Payload-size scaling benchmark for product creation
+
+ProductTestData.VALIDATION_LIMITS caps the product collections (materials,
+techniques, files, measurements), but only single-item payloads were ever
+timed. This sweeps one collection at a time from 1 item past its limit
+(limit + 1 and 2 x limit, which should be rejected), with every other field
+at its valid default, and measures for each point:
+
+  - client encode time (BodyEncoder, the bytes APIClient would send),
+  - request size in bytes,
+  - server latency of POST /products with the pre-encoded body (response.elapsed,
+    so the client's 3s pacing is not part of it),
+  - the status codes (where the server starts rejecting the size).
+
+Per dimension it fits latency = a + b * n and latency ~ n ** k over the
+accepted points, and ranks the dimensions by the latency a payload at the
+limit adds over a single-item one, i.e. which dimension makes product
+creation slow first.
+
+    python -m perf.payload_scaling --stub
+    python -m perf.payload_scaling --dimensions materials,files --repeats 2   # UAT, artisan login
+
+Created products are recorded for cleanup (utils/cleanup.py).
+"""
+
+import argparse
+import json
+import time
+from api.body_encoder import BodyEncoder
+from api.endpoints import Endpoints
+from config.test_data_product_creation import ProductTestData
+from perf.stats import linear_fit, percentile, power_fit
+from utils.cleanup import track_created
+from utils.workflow import extract_path
+
+# Collection -> its VALIDATION_LIMITS key
+DIMENSIONS = {
+    "materials": "materials_max",
+    "techniques": "techniques_max",
+    "files": "files_max",
+    "measurements": "measurements_max",
+}
+
+STEPS = (1, 2, 5, 10, 20, 50, 100, 200)
+
+
+def sweep_sizes(limit, beyond=True):
+    """1 ... limit on a rough log scale, plus limit + 1 and 2 x limit when beyond"""
+    sizes = {n for n in STEPS if n <= limit} | {limit}
+    if beyond:
+        sizes |= {limit + 1, 2 * limit}
+    return sorted(sizes)
+
+
+def make_items(dimension, count, reference=None):
+    """count valid entries of a product collection (ids cycle through the reference snapshot)"""
+    reference = reference or ProductTestData.REFERENCE
+    if dimension == "materials":
+        return [{"name": f"Material {i + 1}", "price": 10.0 + i, "quantity": 1 + i % 10,
+                 "unit": reference.unit(i)} for i in range(count)]
+    if dimension == "techniques":
+        return [{"id": reference.technique_id(i), "deleted": False} for i in range(count)]
+    if dimension == "files":
+        return [{"id": reference.file_id(i), "is_active": True, "deleted": False} for i in range(count)]
+    if dimension == "measurements":
+        return [{"size": f"Size {i + 1}", "width": 10.0 + i, "length": 10.0 + i, "height": 15.0,
+                 "description": f"Measurement {i + 1}"} for i in range(count)]
+    raise ValueError(f"Unknown dimension: {dimension}")
+
+
+class PayloadScalingBenchmark:
+    """Times product creation across collection sizes, one dimension at a time"""
+
+    def __init__(self, client, repeats=3, track=True, ledger=None):
+        self.client = client
+        self.repeats = max(int(repeats), 1)
+        self.track = track
+        self.ledger = ledger
+        self.encoder = BodyEncoder()
+
+    def measure(self, dimension, count):
+        """One sweep point: medians over `repeats` fresh payloads"""
+        items = make_items(dimension, count)
+        encodes, latencies, statuses, size = [], [], {}, 0
+        for _ in range(self.repeats):
+            payload = ProductTestData.get_valid_product_payload(status="pending", **{dimension: items})
+            start = time.perf_counter()
+            body = self.encoder.encode(payload)[0]
+            encodes.append(time.perf_counter() - start)
+            size = len(body)
+
+            try:
+                response = self.client.post(Endpoints.PRODUCTS, data=body)
+            except Exception as e:
+                statuses["error"] = statuses.get("error", 0) + 1
+                print(f"   ⚠ {dimension}={count}: {type(e).__name__}: {e}")
+                continue
+            # Transport time only (send to response headers): the client's pacing and
+            # rate-limiter waits happen before the request and stay out of the fit
+            latencies.append(response.elapsed.total_seconds())
+            statuses[str(response.status_code)] = statuses.get(str(response.status_code), 0) + 1
+            if response.status_code in (200, 201) and self.track:
+                try:
+                    product_id = extract_path(response.json(), ("id", "data.id"))
+                except ValueError:
+                    product_id = None
+                if product_id:
+                    track_created("product", {"id": product_id, "name": payload["name"]},
+                                  ledger=self.ledger, base_url=self.client.base_url)
+
+        accepted = sum(n for code, n in statuses.items() if code in ("200", "201"))
+        return {
+            "dimension": dimension, "count": count, "request_bytes": size,
+            "encode_ms": percentile(encodes, 50) * 1000,
+            "latency_ms": percentile(latencies, 50) * 1000 if latencies else None,
+            "statuses": statuses, "accepted": accepted == self.repeats,
+        }
+
+    def run(self, dimensions=None, beyond=True):
+        """{dimension: {"limit", "points", "fit"}} plus the ranking"""
+        limits = ProductTestData.VALIDATION_LIMITS
+        self.measure("materials", 1)  # Warm-up: connection setup and server caches stay out of the first point
+        results = {}
+        for dimension in dimensions or DIMENSIONS:
+            limit = limits[DIMENSIONS[dimension]]
+            points = [self.measure(dimension, n) for n in sweep_sizes(limit, beyond)]
+            results[dimension] = {"limit": limit, "points": points, "fit": fit_dimension(points, limit)}
+        ranking = sorted(results, key=lambda d: results[d]["fit"].get("added_at_limit_ms") or 0, reverse=True)
+        return {"dimensions": results, "ranking": ranking}
+
+
+def fit_dimension(points, limit):
+    """Linear and power-law fits of latency, plus bytes and encode time per item, over accepted points"""
+    accepted = [p for p in points if p["accepted"] and p["latency_ms"] is not None]
+    over = [p["count"] for p in points if p["count"] > limit and p["accepted"]]
+    fit = {
+        "accepted_points": len(accepted),
+        "largest_accepted": max((p["count"] for p in points if p["accepted"]), default=None),
+        "limit_enforced": not over,
+    }
+    if len(accepted) < 2:
+        return fit
+    counts = [p["count"] for p in accepted]
+    latencies = [p["latency_ms"] for p in accepted]
+    intercept, slope, r2 = linear_fit(counts, latencies)
+    _, exponent, _ = power_fit(counts, latencies)
+    fit.update({
+        "base_ms": intercept, "ms_per_item": slope, "r2": r2, "exponent": exponent,
+        "added_at_limit_ms": slope * (limit - 1),
+        "bytes_per_item": linear_fit(counts, [p["request_bytes"] for p in accepted])[1],
+        "encode_us_per_item": linear_fit(counts, [p["encode_ms"] for p in accepted])[1] * 1000,
+        "shape": "flat" if slope * (limit - 1) < max(intercept, 1e-9) * 0.1
+                 else ("superlinear" if exponent > 1.2 else "linear"),
+    })
+    return fit
+
+
+def print_report(report):
+    print(f"\n{'='*70}")
+    print(f"PAYLOAD SIZE SCALING: POST {Endpoints.PRODUCTS}")
+    print(f"{'='*70}")
+    for dimension, result in report["dimensions"].items():
+        fit = result["fit"]
+        print(f"\n   {dimension} (limit {result['limit']})")
+        for p in result["points"]:
+            within = p["count"] <= result["limit"]
+            mark = "✓" if p["accepted"] == within else ("❌" if within else "⚠")
+            latency = f"{p['latency_ms']:.1f}ms" if p["latency_ms"] is not None else "-"
+            print(f"   {mark} n={p['count']:<4} {p['request_bytes']:>7}B  encode {p['encode_ms']:.3f}ms  "
+                  f"server {latency:>9}  {p['statuses']}")
+        if "ms_per_item" in fit:
+            print(f"     fit: {fit['base_ms']:.1f}ms + {fit['ms_per_item']:.3f}ms/item (r²={fit['r2']:.2f}), "
+                  f"~n^{fit['exponent']:.2f} [{fit['shape']}], {fit['bytes_per_item']:.0f}B/item, "
+                  f"+{fit['added_at_limit_ms']:.1f}ms at the limit")
+        if not fit["limit_enforced"]:
+            print(f"     ⚠ accepted {fit['largest_accepted']} items, above the documented limit")
+    print(f"\n   Slowest dimensions first: {', '.join(report['ranking'])}")
+    print(f"{'='*70}")
+
+
+def main():
+    from api.client import APIClient
+    from config.settings import settings
+
+    parser = argparse.ArgumentParser(description="Product creation latency versus payload collection sizes")
+    parser.add_argument("--stub", action="store_true", help="Run against a local stub server")
+    parser.add_argument("--base-url", default=settings.BASE_URL)
+    parser.add_argument("--dimensions", default=",".join(DIMENSIONS))
+    parser.add_argument("--repeats", type=int, default=3, help="Requests per sweep point (medians are reported)")
+    parser.add_argument("--within-limits", action="store_true", help="Do not send sizes above the limits")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    stub = None
+    client = APIClient(base_url=args.base_url)
+    if args.stub:
+        from utils.stub_server import StubAPIServer
+        stub = StubAPIServer().start()
+        client = APIClient(base_url=stub.base_url)
+        client.request_delay = 0
+        client.set_auth_token("stub-admin-token")
+    else:
+        import os
+        from api.endpoint_discovery import EndpointDiscovery
+        identifier = os.getenv("ARTISAN_IDENTIFIER") or os.getenv("ARTISAN_PHONE") or os.getenv("ARTISAN_EMAIL")
+        _, token = EndpointDiscovery(args.base_url).artisan_login(identifier, os.getenv("ARTISAN_PASSWORD"))
+        if not token:
+            print("❌ Artisan login failed (ARTISAN_IDENTIFIER / ARTISAN_PASSWORD)")
+            return 1
+        client.set_auth_token(token)
+    try:
+        benchmark = PayloadScalingBenchmark(client, repeats=args.repeats, track=not args.stub)
+        report = benchmark.run(args.dimensions.split(","), beyond=not args.within_limits)
+        if args.json:
+            print(json.dumps(report, indent=2))
+        else:
+            print_report(report)
+        return 0
+    finally:
+        if stub:
+            stub.stop()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
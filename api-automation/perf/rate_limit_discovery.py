@@ -0,0 +1,259 @@
+"""Rate-limit threshold discovery per endpoint group
+
+For each endpoint group this probes the server and records where it starts
+answering 429:
+
+  1. burst   - requests sent back to back until the first 429,
+  2. window  - Retry-After, or the time until requests are accepted again;
+               the burst is measured a second time right after recovery,
+               which starts on a fixed-window boundary, and the smaller
+               burst is kept,
+  3. rate    - open-model probes (perf.scheduler) at a doubling rate until
+               one draws a 429, then bisection between the last clean and
+               the first limited rate.
+
+The result is written as a profile (default settings.RATE_LIMIT_PROFILE)
+that api.rate_limiter.global_limiter() loads, so every client paces each
+group at `safety` x the discovered limits instead of guessing delays:
+
+    # Local development against the stub server
+    python -m perf.rate_limit_discovery --stub
+
+    # UAT: only the auth group, writing the default profile
+    python -m perf.rate_limit_discovery --groups auth
+"""
+
+import argparse
+import json
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from api.endpoints import Endpoints
+from api.rate_limiter import RateLimiter
+from perf.scheduler import constant_arrivals, run_open_model
+
+# group -> endpoint prefixes the limits apply to, and the request used to probe them
+ENDPOINT_GROUPS = {
+    "auth": {
+        "prefixes": [Endpoints.LOGIN, Endpoints.REGISTER],
+        "probe": {"method": "POST", "endpoint": Endpoints.LOGIN,
+                  "json": {"identifier": "rate_limit_probe@test.com", "password": "wrong-password"}},
+        "auth": None,
+    },
+    "products": {
+        "prefixes": [Endpoints.PRODUCTS, Endpoints.PRODUCT_STATUS],
+        "probe": {"method": "GET", "endpoint": Endpoints.PRODUCTS, "params": {"page": 1, "limit": 1}},
+        "auth": "admin",
+    },
+    "techniques": {
+        "prefixes": [Endpoints.TECHNIQUES],
+        "probe": {"method": "GET", "endpoint": Endpoints.TECHNIQUES, "params": {"page": 1, "limit": 1}},
+        "auth": "admin",
+    },
+    "whitelist": {
+        "prefixes": [Endpoints.WHITELIST_AUDIT],
+        "probe": {"method": "GET", "endpoint": Endpoints.WHITELIST_AUDIT, "params": {"page": 1, "limit": 1}},
+        "auth": "admin",
+    },
+}
+
+
+def parse_retry_after(value):
+    """Seconds from a Retry-After header (delay-seconds or HTTP-date); None if absent/invalid"""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max((parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimitDiscovery:
+    """Searches burst, window and sustained rate at which an endpoint group answers 429"""
+
+    def __init__(self, client, max_burst=200, start_rate=1.0, max_rate=50.0, precision=0.1, max_bisections=6,
+                 min_probe=5.0, poll_interval=0.5, max_wait=120.0, safety=0.8):
+        # Discovery must see the raw server behaviour: no client-side pacing
+        self.client = client
+        self.client.request_delay = 0
+        self.client.rate_limiter = RateLimiter()
+        self.client.http_cache = None  # Cached reads would never reach the server's limiter
+        self.client.single_flight = None  # Nor would concurrent identical probes merged into one
+        self.max_burst = max_burst
+        self.start_rate = start_rate
+        self.max_rate = max_rate
+        self.precision = precision
+        self.max_bisections = max_bisections
+        self.min_probe = min_probe
+        self.poll_interval = poll_interval
+        self.max_wait = max_wait
+        self.safety = safety
+        self.requests = 0
+
+    def _sender(self, group):
+        view = self.client.as_role(group["auth"]) if group.get("auth") else self.client.anonymous()
+        spec = dict(group["probe"])
+        method, endpoint = spec.pop("method", "GET"), spec.pop("endpoint")
+
+        def send(_index=None):
+            self.requests += 1
+            return view.request(method, endpoint, **spec)
+        return send
+
+    def _wait_recovered(self, send):
+        """Poll until the group accepts requests again; returns the seconds waited (None on timeout)"""
+        start = time.monotonic()
+        while send().status_code == 429:
+            if time.monotonic() - start > self.max_wait:
+                return None
+            time.sleep(self.poll_interval)
+        return time.monotonic() - start
+
+    def _burst(self, send):
+        """Back-to-back requests until the first 429: (accepted, retry_after, started) or (accepted, None, None)"""
+        started = time.monotonic()
+        for accepted in range(self.max_burst):
+            response = send()
+            if response.status_code == 429:
+                return accepted, parse_retry_after(response.headers.get("Retry-After")), started
+        return self.max_burst, None, None
+
+    def _probe(self, send, rate, duration, cooldown):
+        """True if `rate` requests/second for `duration` seconds draw no 429"""
+        time.sleep(cooldown)
+        self._wait_recovered(send)
+        timeline = constant_arrivals(rate, duration=duration)
+        report = run_open_model(send, timeline, concurrency=max(4, min(int(rate), 64)))
+        return "429" not in report["status_codes"]
+
+    def discover(self, name, group):
+        """Discover the limits of one group; returns its profile entry"""
+        send = self._sender(group)
+        start_requests = self.requests
+        entry = {"prefixes": list(group["prefixes"]), "limited": False, "rate": None, "burst": None,
+                 "discovered": {}}
+
+        self._wait_recovered(send)
+        burst, retry_after, started = self._burst(send)
+        if started is None:
+            entry["discovered"] = {"burst": None, "note": f"no 429 within {self.max_burst} back-to-back requests"}
+            entry["discovered"]["requests"] = self.requests - start_requests
+            return entry
+
+        recovered = self._wait_recovered(send)
+        # The first request that got through opened a new window: measure again from there
+        second_burst, second_retry, second_start = self._burst(send)
+        second_recovery = self._wait_recovered(send) if second_start else None
+        burst = min(burst + 1, second_burst + 1) if second_start else burst + 1  # + the recovery request
+        window = (second_retry or retry_after
+                  or (time.monotonic() - second_start if second_recovery is not None else None)
+                  or recovered)
+
+        duration = max(self.min_probe, 2 * (window or 0))
+        cooldown = window or self.poll_interval
+        good, bad = 0.0, None
+        rate = self.start_rate
+        while rate <= self.max_rate:
+            if self._probe(send, rate, duration, cooldown):
+                good, rate = rate, rate * 2
+            else:
+                bad = rate
+                break
+        for _ in range(self.max_bisections if bad is not None else 0):
+            if (bad - good) / bad <= self.precision:
+                break
+            mid = (good + bad) / 2
+            if self._probe(send, mid, duration, cooldown):
+                good = mid
+            else:
+                bad = mid
+
+        # Nothing passed (even the slowest probe drew a 429): fall back to the burst/window bound
+        sustained = good or (burst / window if window else None)
+        entry.update(
+            limited=True,
+            rate=round(sustained * self.safety, 3) if sustained else None,
+            burst=max(1, int(burst * self.safety)),
+            discovered={"burst": burst, "window": window, "retry_after": second_retry or retry_after,
+                        "sustained_rate": sustained, "first_limited_rate": bad,
+                        "requests": self.requests - start_requests},
+        )
+        return entry
+
+    def run(self, groups=None):
+        groups = groups or ENDPOINT_GROUPS
+        profile = {"base_url": self.client.base_url,
+                   "discovered_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                   "safety": self.safety, "groups": {}}
+        for name, group in groups.items():
+            print(f"▶ Discovering rate limits for '{name}'...")
+            profile["groups"][name] = entry = self.discover(name, group)
+            print_group(name, entry)
+        return profile
+
+
+def write_profile(profile, path):
+    with open(path, "w") as f:
+        json.dump(profile, f, indent=2)
+
+
+def print_group(name, entry):
+    found = entry["discovered"]
+    if not entry["limited"]:
+        print(f"   ⚠ {name}: {found.get('note', 'no limit found')} ({found.get('requests', 0)} requests)")
+        return
+    window = f"{found['window']:.2f}s" if found.get("window") else "unknown"
+    sustained = f"{found['sustained_rate']:.2f}/s" if found.get("sustained_rate") else "unknown"
+    print(f"   ✓ {name}: burst {found['burst']}, window {window}, sustained {sustained} "
+          f"-> limiter rate {entry['rate']}/s burst {entry['burst']} ({found['requests']} requests)")
+
+
+def main():
+    from api.client import APIClient
+    from config.settings import settings
+
+    parser = argparse.ArgumentParser(description="Discover server rate limits per endpoint group")
+    parser.add_argument("--stub", action="store_true", help="Run against a local stub server with demo limits")
+    parser.add_argument("--base-url", default=settings.BASE_URL)
+    parser.add_argument("--groups", default=",".join(ENDPOINT_GROUPS), help="Comma separated group names")
+    parser.add_argument("--output", default=None,
+                        help=f"Profile path (default {settings.RATE_LIMIT_PROFILE}; stub runs print only)")
+    parser.add_argument("--max-rate", type=float, default=50.0)
+    parser.add_argument("--safety", type=float, default=0.8, help="Fraction of the discovered limits to use")
+    args = parser.parse_args()
+
+    stub = None
+    base_url = args.base_url
+    options = {}
+    if args.stub:
+        from utils.stub_server import StubAPIServer
+        stub = StubAPIServer().start()
+        stub.rate_limit("/auth", limit=10, window=1)
+        stub.rate_limit("/products", limit=30, window=1, retry_after=False)
+        base_url = stub.base_url
+        options = {"min_probe": 1.0, "poll_interval": 0.05}
+
+    client = APIClient(base_url=base_url)
+    if stub:
+        client.register_role("admin", identifier=stub.admin_identifier, password=stub.admin_password)
+    groups = {name: ENDPOINT_GROUPS[name] for name in args.groups.split(",") if name}
+    try:
+        profile = RateLimitDiscovery(client, max_rate=args.max_rate, safety=args.safety, **options).run(groups)
+        output = args.output or (None if stub else settings.RATE_LIMIT_PROFILE)
+        if output:
+            write_profile(profile, output)
+            print(f"✓ Profile written to {output}")
+        else:
+            print(json.dumps(profile, indent=2))
+        return 0
+    finally:
+        if stub:
+            stub.stop()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
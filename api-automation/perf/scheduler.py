@@ -0,0 +1,175 @@
+"""Open-model request scheduler that avoids coordinated omission
+
+A closed loop ("send, wait for the response, sleep, repeat") stops sending
+while the server stalls, so the requests that *should* have gone out during
+the stall are never measured and percentiles come out optimistic. This
+scheduler fixes the arrival times up front (constant, Poisson or stepped
+rates) and, for every request, measures:
+
+    latency       end - intended send time   (what a user arriving on schedule sees)
+    service_time  end - actual send time     (what the closed loop would have reported)
+    lag           actual - intended send time (how far behind the generator fell)
+
+    timeline = poisson_arrivals(rate=20, duration=30, seed=1)
+    report = OpenModelScheduler(lambda i: client.get(Endpoints.HEALTH), timeline, concurrency=32).run()
+    print_report(report)
+
+send(i) may be a plain function (run on a thread pool of `concurrency`
+workers) or a coroutine function (use run_async()). When every worker is
+busy, the next request waits, and that wait counts as latency.
+"""
+
+import asyncio
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from perf.stats import summarize, format_summary
+
+
+# ── Arrival timelines (seconds from the start, ascending) ────────────────────
+
+def constant_arrivals(rate, duration=None, count=None):
+    """Evenly spaced arrivals at `rate` per second, for `duration` seconds or `count` requests"""
+    if count is None:
+        count = int(rate * duration)
+    return [i / rate for i in range(count)]
+
+
+def poisson_arrivals(rate, duration, seed=None):
+    """Poisson process: exponential gaps with mean 1/rate"""
+    rng = random.Random(seed)
+    arrivals = []
+    t = rng.expovariate(rate)
+    while t < duration:
+        arrivals.append(t)
+        t += rng.expovariate(rate)
+    return arrivals
+
+
+def step_arrivals(stages, poisson=False, seed=None):
+    """Concatenated stages of (duration, rate); rate 0 is a pause"""
+    arrivals = []
+    offset = 0.0
+    for i, (duration, rate) in enumerate(stages):
+        if rate:
+            stage = (poisson_arrivals(rate, duration, None if seed is None else seed + i) if poisson
+                     else constant_arrivals(rate, duration))
+            arrivals += [offset + t for t in stage]
+        offset += duration
+    return arrivals
+
+
+# ── Scheduler ─────────────────────────────────────────────────────────────────
+
+class OpenModelScheduler:
+    """Issues send(i) at timeline[i] regardless of how earlier requests are doing"""
+
+    def __init__(self, send, timeline, concurrency=64, lag_tolerance=0.01):
+        self.send = send
+        self.timeline = list(timeline)
+        self.concurrency = max(int(concurrency), 1)
+        self.lag_tolerance = lag_tolerance
+
+    def _record(self, index, intended, actual, end, response=None, error=None):
+        return {"index": index, "intended": intended, "actual": actual, "end": end,
+                "latency": end - intended, "service_time": end - actual, "lag": actual - intended,
+                "code": response.status_code if response is not None else None, "error": error}
+
+    def run(self):
+        """Send on a thread pool; blocks until every scheduled request has completed"""
+        results = [None] * len(self.timeline)
+        start = time.perf_counter()
+
+        def run_one(index, intended):
+            actual = time.perf_counter() - start
+            # Recording is inside the try as well: a send() result without status_code is a failure too
+            try:
+                response = self.send(index)
+                results[index] = self._record(index, intended, actual, time.perf_counter() - start, response)
+            except Exception as e:
+                results[index] = self._record(index, intended, actual, time.perf_counter() - start,
+                                              error=f"{type(e).__name__}: {e}")
+
+        futures = []
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="open-model") as pool:
+            for index, intended in enumerate(self.timeline):
+                delay = intended - (time.perf_counter() - start)
+                if delay > 0:
+                    time.sleep(delay)
+                futures.append(pool.submit(run_one, index, intended))
+        for future in futures:
+            future.result()  # Anything that still escaped surfaces here, not as a None result
+        return self.report(results, time.perf_counter() - start)
+
+    async def run_async(self):
+        """Send as asyncio tasks; `concurrency` bounds the requests in flight"""
+        slots = asyncio.Semaphore(self.concurrency)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+
+        async def run_one(index, intended):
+            async with slots:
+                actual = loop.time() - start
+                try:
+                    response = await self.send(index)
+                    return self._record(index, intended, actual, loop.time() - start, response)
+                except Exception as e:
+                    return self._record(index, intended, actual, loop.time() - start,
+                                        error=f"{type(e).__name__}: {e}")
+
+        tasks = []
+        for index, intended in enumerate(self.timeline):
+            delay = intended - (loop.time() - start)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(run_one(index, intended)))
+        results = await asyncio.gather(*tasks)
+        return self.report(results, loop.time() - start)
+
+    def report(self, results, elapsed):
+        codes = {}
+        for result in results:
+            key = str(result["code"]) if result["code"] is not None else "error"
+            codes[key] = codes.get(key, 0) + 1
+        total = len(results)
+        span = self.timeline[-1] if self.timeline else 0.0
+        lags = [r["lag"] for r in results]
+        return {
+            "requests": total,
+            "concurrency": self.concurrency,
+            "elapsed": elapsed,
+            "offered_rate": (total - 1) / span if span else 0.0,
+            "achieved_rate": total / elapsed if elapsed else 0.0,
+            "latency": summarize([r["latency"] for r in results]),
+            "service_time": summarize([r["service_time"] for r in results]),
+            "schedule_lag": summarize(lags),
+            "behind_schedule": sum(1 for lag in lags if lag > self.lag_tolerance) / total if total else 0.0,
+            "status_codes": codes,
+            "errors": [r["error"] for r in results if r["error"]][:10],
+            "results": results,
+        }
+
+
+def run_open_model(send, timeline, concurrency=64):
+    """Run `timeline` with a sync or async send(i) and return the report"""
+    scheduler = OpenModelScheduler(send, timeline, concurrency)
+    if asyncio.iscoroutinefunction(send):
+        return asyncio.run(scheduler.run_async())
+    return scheduler.run()
+
+
+def print_report(report, title="OPEN-MODEL LOAD REPORT"):
+    print(f"\n{'='*70}")
+    print(title)
+    print(f"{'='*70}")
+    print(f"   Requests:      {report['requests']} (concurrency {report['concurrency']})")
+    print(f"   Rate:          offered {report['offered_rate']:.1f}/s, achieved {report['achieved_rate']:.1f}/s")
+    print(f"   Latency:       {format_summary(report['latency'])}")
+    print(f"   Service time:  {format_summary(report['service_time'])}")
+    print(f"   Schedule lag:  {format_summary(report['schedule_lag'])}")
+    mark = "✓" if report["behind_schedule"] == 0 else "⚠"
+    print(f"   {mark} Behind schedule: {report['behind_schedule']:.1%} of requests")
+    print(f"   Status codes:  {report['status_codes']}")
+    for error in report["errors"]:
+        print(f"   ⚠ {error}")
+    print(f"{'='*70}")
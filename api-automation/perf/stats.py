@@ -0,0 +1,65 @@
+"""Latency statistics helpers for performance drivers"""
+
+import math
+
+
+def percentile(values, pct):
+    """Linear-interpolated percentile of a list of numbers (pct in 0-100)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100.0
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(values, percentiles=(50, 90, 95, 99)):
+    """Summary dict (count/min/mean/max and pXX keys) for a list of latencies"""
+    if not values:
+        return {"count": 0}
+    summary = {
+        "count": len(values),
+        "min": min(values),
+        "mean": sum(values) / len(values),
+        "max": max(values),
+    }
+    for pct in percentiles:
+        summary[f"p{pct}"] = percentile(values, pct)
+    return summary
+
+
+def format_summary(summary, unit="s"):
+    """One-line human readable rendering of summarize() output"""
+    if not summary.get("count"):
+        return "no samples"
+    keys = [k for k in summary if k.startswith("p")]
+    parts = [f"n={summary['count']}", f"min={summary['min']:.3f}{unit}", f"mean={summary['mean']:.3f}{unit}"]
+    parts += [f"{k}={summary[k]:.3f}{unit}" for k in keys]
+    parts.append(f"max={summary['max']:.3f}{unit}")
+    return ", ".join(parts)
+
+
+def linear_fit(xs, ys):
+    """Least-squares y = intercept + slope * x; returns (intercept, slope, r2)"""
+    n = len(xs)
+    if n < 2:
+        return (ys[0] if ys else 0.0), 0.0, 0.0
+    mean_x, mean_y = sum(xs) / n, sum(ys) / n
+    sxx = sum((x - mean_x) ** 2 for x in xs)
+    if not sxx:
+        return mean_y, 0.0, 0.0
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / sxx
+    intercept = mean_y - slope * mean_x
+    ss_tot = sum((y - mean_y) ** 2 for y in ys)
+    ss_res = sum((y - intercept - slope * x) ** 2 for x, y in zip(xs, ys))
+    return intercept, slope, (1 - ss_res / ss_tot) if ss_tot else 1.0
+
+
+def power_fit(xs, ys):
+    """y = coefficient * x ** exponent fitted in log-log space (positive points only); (coefficient, exponent, r2)"""
+    points = [(math.log(x), math.log(y)) for x, y in zip(xs, ys) if x > 0 and y > 0]
+    if len(points) < 2:
+        return 0.0, 0.0, 0.0
+    intercept, exponent, r2 = linear_fit([p[0] for p in points], [p[1] for p in points])
+    return math.exp(intercept), exponent, r2
@@ -0,0 +1,143 @@
+"""Upload throughput versus file size and concurrency
+
+Generates files of each size in a temporary directory and uploads a batch
+of them with FileUploader at each concurrency level, reporting throughput,
+files/second and latency percentiles per (size, concurrency) point.
+
+The benchmark client does not use the 3s request pacing, which would
+serialize every concurrency level; RATE_LIMIT_RPS bounds it on UAT.
+
+    # Local stub (default sizes 64K, 1M, 8M; concurrency 1, 4, 8)
+    python -m perf.upload_benchmark --stub --files 16
+
+    # UAT, small files only, at most 2 requests/second
+    RATE_LIMIT_RPS=2 python -m perf.upload_benchmark --sizes 64K --concurrency 1,2 --files 4
+"""
+
+import argparse
+import json
+import os
+import tempfile
+from api.endpoints import Endpoints
+from api.uploads import FileUploader
+from perf.stats import format_summary
+
+UNITS = {"K": 1024, "M": 1024 * 1024, "G": 1024 * 1024 * 1024}
+
+
+def parse_size(text):
+    """"64K" / "8M" / "1500" -> bytes"""
+    text = text.strip().upper()
+    if text and text[-1] in UNITS:
+        return int(float(text[:-1]) * UNITS[text[-1]])
+    return int(text)
+
+
+def format_size(size):
+    for suffix, factor in (("G", UNITS["G"]), ("M", UNITS["M"]), ("K", UNITS["K"])):
+        if size >= factor and size % factor == 0:
+            return f"{size // factor}{suffix}"
+    return f"{size}B"
+
+
+def make_files(directory, size, count):
+    """count files of `size` random bytes, written in 1 MiB blocks"""
+    paths = []
+    for i in range(count):
+        path = os.path.join(directory, f"bench-{format_size(size)}-{i}.bin")
+        with open(path, "wb") as f:
+            remaining = size
+            while remaining:
+                block = os.urandom(min(remaining, 1024 * 1024))
+                f.write(block)
+                remaining -= len(block)
+        paths.append(path)
+    return paths
+
+
+def run_benchmark(client, sizes, concurrencies, files=8, endpoint=Endpoints.FILES):
+    """One report row per (size, concurrency)"""
+    rows = []
+    with tempfile.TemporaryDirectory(prefix="upload-bench-") as directory:
+        for size in sizes:
+            paths = make_files(directory, size, files)
+            for concurrency in concurrencies:
+                report = FileUploader(client, concurrency=concurrency, endpoint=endpoint).upload_many(paths)
+                rows.append({
+                    "size": size,
+                    "concurrency": concurrency,
+                    "uploaded": report["uploaded"],
+                    "failed": report["failed"],
+                    "elapsed": report["elapsed"],
+                    "throughput_mbps": report["throughput_mbps"],
+                    "files_per_second": report["files_per_second"],
+                    "latency": report["latency"],
+                })
+            for path in paths:
+                os.remove(path)
+    return rows
+
+
+def print_report(rows):
+    print(f"\n{'='*70}")
+    print(f"UPLOAD BENCHMARK")
+    print(f"{'='*70}")
+    print(f"   {'size':>6} {'conc':>5} {'ok':>4} {'fail':>5} {'MB/s':>9} {'files/s':>8}")
+    for row in rows:
+        mark = "✓" if not row["failed"] else "❌"
+        print(f" {mark} {format_size(row['size']):>6} {row['concurrency']:>5} {row['uploaded']:>4} "
+              f"{row['failed']:>5} {row['throughput_mbps']:>9.1f} {row['files_per_second']:>8.1f}")
+        print(f"          latency: {format_summary(row['latency'])}")
+    best = max(rows, key=lambda r: r["throughput_mbps"], default=None)
+    if best:
+        print(f"   Best: {best['throughput_mbps']:.1f} MB/s with {format_size(best['size'])} files "
+              f"at concurrency {best['concurrency']}")
+    print(f"{'='*70}")
+
+
+def main():
+    from api.client import APIClient
+    from api.endpoint_discovery import login_token
+    from config.settings import settings
+
+    parser = argparse.ArgumentParser(description="File upload throughput benchmark")
+    parser.add_argument("--stub", action="store_true", help="Run against a local stub server")
+    parser.add_argument("--base-url", default=settings.BASE_URL)
+    parser.add_argument("--sizes", default="64K,1M,8M", help="Comma-separated file sizes (K/M/G suffixes)")
+    parser.add_argument("--concurrency", default="1,4,8", help="Comma-separated concurrency levels")
+    parser.add_argument("--files", type=int, default=8, help="Files uploaded per (size, concurrency) point")
+    parser.add_argument("--json", action="store_true", help="Print the rows as JSON")
+    args = parser.parse_args()
+
+    stub = None
+    base_url = args.base_url
+    identifier, password = settings.ADMIN_EMAIL, settings.ADMIN_PASSWORD
+    if args.stub:
+        from utils.stub_server import StubAPIServer
+        stub = StubAPIServer().start()
+        base_url = stub.base_url
+        identifier, password = stub.admin_identifier, stub.admin_password
+
+    client = APIClient(base_url=base_url)
+    client.request_delay = 0  # The rate limiter (RATE_LIMIT_RPS) bounds the load instead
+    try:
+        token = login_token(client.post(Endpoints.LOGIN, json={"identifier": identifier, "password": password}))
+        if not token:
+            print("❌ Admin login failed")
+            return 1
+        client.set_auth_token(token)
+
+        rows = run_benchmark(client, [parse_size(s) for s in args.sizes.split(",")],
+                             [int(c) for c in args.concurrency.split(",")], files=args.files)
+        if args.json:
+            print(json.dumps(rows, indent=2))
+        else:
+            print_report(rows)
+        return 0 if all(not row["failed"] for row in rows) else 1
+    finally:
+        if stub:
+            stub.stop()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,436 @@
+"""Virtual-user load model: many simulated artisans and admins per process
+
+Each virtual user is an asyncio task with its own authenticated client view
+(session affinity: token, cookies-free headers and per-user state stay with
+the user for its whole life), its own random stream and a weighted mix of
+actions separated by think time. A schedule of linear stages sets the target
+number of active users over time; the runner starts users to reach it and
+asks surplus users to stop after their current action (graceful ramp-down).
+
+    # Local development: prove the runner scales against the stub server
+    python -m perf.virtual_users --stub --users 2000 --ramp-up 5 --hold 20 --think exp:1
+
+    # UAT, 20 users, capped at 2 requests/second for the whole process
+    RATE_LIMIT_RPS=2 python -m perf.virtual_users --users 20 --ramp-up 60 --hold 300
+
+Profiles are plain objects, so new behaviours are a list of Actions:
+
+    profile = UserProfile("browser", [Action("browse", browse_products, weight=5)],
+                          think_time=uniform(1, 3))
+    report = run_virtual_users(AsyncAPIClient(base_url), [profile], ramp(200, 30, 120, 30))
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from api.async_client import AsyncAPIClient
+from api.endpoints import Endpoints
+from config.test_data_product_creation import ProductTestData
+from perf.stats import summarize, format_summary
+from utils.identity import default_generator
+
+
+# ── Think time ────────────────────────────────────────────────────────────────
+# Each factory returns callable(rng) -> seconds.
+
+def constant(seconds):
+    return lambda rng: seconds
+
+
+def uniform(low, high):
+    return lambda rng: rng.uniform(low, high)
+
+
+def exponential(mean, cap=None):
+    """Poisson-like pauses with the given mean, optionally capped"""
+    cap = cap if cap is not None else mean * 10
+    return lambda rng: min(rng.expovariate(1.0 / mean), cap) if mean > 0 else 0.0
+
+
+def normal(mean, stddev, low=0.0):
+    """Gaussian pauses clamped at `low` (never negative)"""
+    return lambda rng: max(rng.gauss(mean, stddev), low)
+
+
+THINK_TIMES = {"constant": constant, "uniform": uniform, "exp": exponential, "normal": normal}
+
+
+def parse_think_time(spec):
+    """'constant:1', 'uniform:0.5:2', 'exp:1', 'normal:1:0.3' -> think-time callable"""
+    kind, *args = spec.split(":")
+    if kind not in THINK_TIMES:
+        raise ValueError(f"Unknown think time '{kind}' (expected one of {', '.join(THINK_TIMES)})")
+    return THINK_TIMES[kind](*(float(a) for a in args))
+
+
+# ── Profiles ─────────────────────────────────────────────────────────────────
+
+class Action:
+    """Weighted user action: async fn(user) -> response (None when there was nothing to do)"""
+
+    def __init__(self, name, fn, weight=1):
+        self.name = name
+        self.fn = fn
+        self.weight = weight
+
+
+class UserProfile:
+    """Kind of user: weighted actions, session setup and think time"""
+
+    def __init__(self, name, actions, weight=1, on_start=None, think_time=None):
+        self.name = name
+        self.actions = list(actions)
+        self.weight = weight
+        self.on_start = on_start
+        self.think_time = think_time or constant(1.0)
+        self._weights = [a.weight for a in self.actions]
+
+    def pick(self, rng):
+        return rng.choices(self.actions, weights=self._weights)[0]
+
+
+class VirtualUser:
+    """One simulated user: its own client view, state dict and random stream"""
+
+    def __init__(self, user_id, profile, client, rng):
+        self.id = user_id
+        self.profile = profile
+        self.client = client       # Replaced by an authenticated view in on_start
+        self.rng = rng
+        self.state = {}
+        self._stop = asyncio.Event()
+
+    @property
+    def stopping(self):
+        return self._stop.is_set()
+
+    def stop(self):
+        self._stop.set()
+
+    async def think(self):
+        """Pause for one think time; returns early when the user is asked to stop"""
+        pause = self.profile.think_time(self.rng)
+        if pause > 0:
+            try:
+                await asyncio.wait_for(self._stop.wait(), pause)
+            except asyncio.TimeoutError:
+                pass
+
+
+# ── Schedule ─────────────────────────────────────────────────────────────────
+
+class Schedule:
+    """Target active users over time as linear stages of (duration, users)
+
+    Each stage moves the target from the previous stage's users (0 at the
+    start) to its own users over its duration.
+    """
+
+    def __init__(self, stages):
+        self.stages = [(float(duration), int(users)) for duration, users in stages]
+        self.duration = sum(duration for duration, _ in self.stages)
+        self.peak = max((users for _, users in self.stages), default=0)
+
+    def target(self, elapsed):
+        previous = 0
+        for duration, users in self.stages:
+            if elapsed < duration:
+                return round(previous + (users - previous) * elapsed / duration)
+            elapsed -= duration
+            previous = users
+        return previous
+
+
+def ramp(users, ramp_up, hold, ramp_down=0.0):
+    """Ramp linearly to `users`, hold, then ramp back down to zero"""
+    stages = [(ramp_up, users), (hold, users)]
+    if ramp_down:
+        stages.append((ramp_down, 0))
+    return Schedule(stages)
+
+
+# ── Runner ───────────────────────────────────────────────────────────────────
+
+class VirtualUserRunner:
+    """Keeps the number of active virtual users on the schedule and records results"""
+
+    def __init__(self, client, profiles, schedule, tick=0.1, seed=None):
+        self.client = client
+        self.profiles = list(profiles)
+        self.schedule = schedule
+        self.tick = tick
+        self.rng = random.Random(seed)
+        self.users = []            # Active users, oldest first
+        self.peak_users = 0
+        self.started = 0
+        self.start_failures = 0
+        self.actions = {}          # action name -> {"latencies": [], "failed": 0, "skipped": 0}
+        self.status_codes = {}
+        self.errors = []
+
+    def _record(self, name, latency, response=None, error=None):
+        stats = self.actions.setdefault(name, {"latencies": [], "failed": 0, "skipped": 0})
+        if error is None and response is None:
+            stats["skipped"] += 1
+            return
+        stats["latencies"].append(latency)
+        code = str(response.status_code) if response is not None else "error"
+        self.status_codes[code] = self.status_codes.get(code, 0) + 1
+        if error is not None or response.status_code >= 400:
+            stats["failed"] += 1
+            if len(self.errors) < 10:
+                self.errors.append(f"{name}: {error or f'HTTP {response.status_code}'}")
+
+    async def _timed(self, name, call):
+        start = time.perf_counter()
+        try:
+            response = await call
+        except Exception as e:
+            self._record(name, time.perf_counter() - start, error=f"{type(e).__name__}: {e}")
+            return False
+        self._record(name, time.perf_counter() - start, response)
+        return True
+
+    async def _live(self, user):
+        profile = user.profile
+        if profile.on_start:
+            start = time.perf_counter()
+            try:
+                await profile.on_start(user)
+            except Exception as e:
+                self.start_failures += 1
+                self._record(f"{profile.name}.on_start", time.perf_counter() - start,
+                             error=f"{type(e).__name__}: {e}")
+                await user._stop.wait()  # Keep the slot so the schedule does not respawn a storm
+                return
+        while not user.stopping:
+            action = profile.pick(user.rng)
+            await self._timed(f"{profile.name}.{action.name}", action.fn(user))
+            await user.think()
+
+    def _spawn(self):
+        profile = self.rng.choices(self.profiles, weights=[p.weight for p in self.profiles])[0]
+        self.started += 1
+        user = VirtualUser(self.started, profile, self.client, random.Random(self.rng.random()))
+        user.task = asyncio.create_task(self._live(user))
+        self.users.append(user)
+
+    async def run(self):
+        """Follow the schedule to its end, stop every user and return the report"""
+        start = time.perf_counter()
+        stopped = []
+        while True:
+            elapsed = time.perf_counter() - start
+            self.users = [u for u in self.users if not u.task.done()]
+            if elapsed >= self.schedule.duration:
+                break
+            target = self.schedule.target(elapsed)
+            active = [u for u in self.users if not u.stopping]
+            for _ in range(target - len(active)):
+                self._spawn()
+            for user in reversed(active[target:]):  # Newest users leave first
+                user.stop()
+                stopped.append(user.task)
+            self.peak_users = max(self.peak_users, sum(1 for u in self.users if not u.stopping))
+            await asyncio.sleep(self.tick)
+
+        for user in self.users:
+            user.stop()
+        await asyncio.gather(*(u.task for u in self.users), *stopped, return_exceptions=True)
+        return self.report(time.perf_counter() - start)
+
+    def report(self, elapsed):
+        total = sum(len(s["latencies"]) for s in self.actions.values())
+        failed = sum(s["failed"] for s in self.actions.values())
+        return {
+            "elapsed": elapsed,
+            "peak_users": self.peak_users,
+            "users_started": self.started,
+            "start_failures": self.start_failures,
+            "actions": total,
+            "throughput": total / elapsed if elapsed else 0.0,
+            "error_rate": failed / total if total else 0.0,
+            "requests": self.client.metrics.snapshot()["requests"],
+            "status_codes": self.status_codes,
+            "per_action": {name: {"latency": summarize(s["latencies"]), "failed": s["failed"],
+                                  "skipped": s["skipped"]}
+                           for name, s in sorted(self.actions.items())},
+            "errors": self.errors,
+        }
+
+
+def run_virtual_users(client, profiles, schedule, tick=0.1, seed=None):
+    """Synchronous entry point: run the schedule on a fresh event loop and close the client"""
+    async def main():
+        try:
+            return await VirtualUserRunner(client, profiles, schedule, tick, seed).run()
+        finally:
+            await client.close()
+    return asyncio.run(main())
+
+
+# ── Default profiles ─────────────────────────────────────────────────────────
+
+def _data(response):
+    return (response.json() or {}).get("data") if response.content else None
+
+
+async def artisan_on_start(user):
+    """Register a fresh artisan, have the admin approve it, and log in as that artisan"""
+    identity = default_generator()
+    email, phone, password = identity.email("vu_artisan"), identity.phone(), "TestPassword123!"
+    user.state.update(email=email, phone=phone, products=[])
+
+    response = await user.client.anonymous().post(Endpoints.REGISTER, json={
+        "f_name": "Virtual", "l_name": f"Artisan {user.id}", "phone": phone, "email": email, "password": password})
+    if response.status_code not in (200, 201):
+        raise RuntimeError(f"register returned {response.status_code}")
+
+    admin = await user.client.as_role("admin")
+    user_id = None
+    for _ in range(20):
+        response = await admin.get(Endpoints.WHITELIST_AUDIT, params={"search": email, "page": 1, "limit": 10})
+        user_id = next((u.get("id") for u in _data(response) or [] if u.get("email") == email), None)
+        if user_id:
+            break
+        await asyncio.sleep(0.5)
+    if not user_id:
+        raise RuntimeError("registration never appeared in the whitelist")
+    await admin.patch(Endpoints.WHITELIST_AUDIT,
+                      json={"user_id": user_id, "status": "approved", "reason": "Virtual user"})
+
+    token = await user.client.login(email, password)
+    if not token:
+        raise RuntimeError("artisan login failed")
+    user.state["user_id"] = user_id
+    user.client = user.client.with_token(token, role="artisan")
+
+
+async def browse_products(user):
+    return await user.client.get(Endpoints.PRODUCTS, params={"page": user.rng.randint(1, 3), "limit": 10})
+
+
+async def list_techniques(user):
+    return await user.client.get(Endpoints.TECHNIQUES, params={"page": 1, "limit": 10})
+
+
+async def create_product(user):
+    response = await user.client.post(Endpoints.PRODUCTS,
+                                      json=ProductTestData.get_valid_product_payload(status="pending"))
+    if response.status_code in (200, 201):
+        body = response.json()
+        user.state["products"].append(body.get("id") or (body.get("data") or {}).get("id"))
+    return response
+
+
+async def admin_on_start(user):
+    user.client = await user.client.as_role("admin")
+    user.state["pending"] = []
+
+
+async def review_pending(user):
+    response = await user.client.get(Endpoints.PRODUCTS, params={"status": "pending_approval", "page": 1,
+                                                                 "limit": 20})
+    if response.status_code == 200:
+        user.state["pending"] = [p["id"] for p in _data(response) or []]
+    return response
+
+
+async def approve_product(user):
+    if not user.state["pending"]:
+        return None
+    product_id = user.state["pending"].pop()
+    status = "approved" if user.rng.random() < 0.9 else "rejected"
+    return await user.client.patch(Endpoints.PRODUCT_STATUS,
+                                   json={"product_id": product_id, "status": status, "reason": "Virtual admin"})
+
+
+async def whitelist_search(user):
+    return await user.client.get(Endpoints.WHITELIST_AUDIT,
+                                 params={"search": "vu_artisan", "page": 1, "limit": 10})
+
+
+def artisan_profile(weight=9, think_time=None):
+    return UserProfile("artisan", [
+        Action("browse_products", browse_products, weight=6),
+        Action("list_techniques", list_techniques, weight=3),
+        Action("create_product", create_product, weight=1),
+    ], weight=weight, on_start=artisan_on_start, think_time=think_time)
+
+
+def admin_profile(weight=1, think_time=None):
+    return UserProfile("admin", [
+        Action("review_pending", review_pending, weight=3),
+        Action("approve_product", approve_product, weight=3),
+        Action("whitelist_search", whitelist_search, weight=1),
+    ], weight=weight, on_start=admin_on_start, think_time=think_time)
+
+
+def print_report(report):
+    print(f"\n{'='*70}")
+    print("VIRTUAL USER REPORT")
+    print(f"{'='*70}")
+    print(f"   Users:        peak {report['peak_users']}, started {report['users_started']}, "
+          f"failed to start {report['start_failures']}")
+    print(f"   Elapsed:      {report['elapsed']:.2f}s")
+    print(f"   Actions:      {report['actions']} ({report['throughput']:.1f}/s, {report['requests']} requests)")
+    print(f"   Status codes: {report['status_codes']}")
+    print(f"   Error rate:   {report['error_rate']:.1%}")
+    for name, stats in report["per_action"].items():
+        mark = "✓" if not stats["failed"] else "❌"
+        print(f"   {mark} {name:<26} {format_summary(stats['latency'])}")
+    for error in report["errors"]:
+        print(f"   ⚠ {error}")
+    print(f"{'='*70}")
+
+
+def main():
+    from config.settings import settings
+
+    parser = argparse.ArgumentParser(description="Virtual-user load runner")
+    parser.add_argument("--stub", action="store_true", help="Run against a local stub server")
+    parser.add_argument("--base-url", default=settings.BASE_URL)
+    parser.add_argument("--users", type=int, default=10, help="Peak number of virtual users")
+    parser.add_argument("--ramp-up", type=float, default=10.0)
+    parser.add_argument("--hold", type=float, default=30.0)
+    parser.add_argument("--ramp-down", type=float, default=5.0)
+    parser.add_argument("--think", default="exp:1", help="constant:S, uniform:LO:HI, exp:MEAN or normal:MEAN:SD")
+    parser.add_argument("--admin-ratio", type=float, default=0.1, help="Share of users that are admins")
+    parser.add_argument("--pool-size", type=int, default=100, help="Max open connections")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    stub = None
+    base_url = args.base_url
+    if args.stub:
+        from utils.stub_server import StubAPIServer
+        stub = StubAPIServer().start()
+        stub.seed_products(200)
+        stub.seed_techniques(30)
+        base_url = stub.base_url
+
+    client = AsyncAPIClient(base_url, pool_size=args.pool_size)
+    if stub:
+        client.register_role("admin", identifier=stub.admin_identifier, password=stub.admin_password)
+
+    think = parse_think_time(args.think)
+    profiles = [artisan_profile(weight=1 - args.admin_ratio, think_time=think),
+                admin_profile(weight=args.admin_ratio, think_time=think)]
+    try:
+        report = run_virtual_users(client, [p for p in profiles if p.weight > 0],
+                                   ramp(args.users, args.ramp_up, args.hold, args.ramp_down), seed=args.seed)
+        if args.json:
+            print(json.dumps(report, indent=2))
+        else:
+            print_report(report)
+        return 0 if report["error_rate"] == 0 and not report["start_failures"] else 1
+    finally:
+        if stub:
+            stub.stop()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -58,67 +58,85 @@ def admin_auth_token(api_client):
     
     return None
 
-@pytest.fixture(scope="function")  # CHANGED: function scope
-def artisan_credentials():
-    """Get artisan credentials from environment variables"""
-    return {
-        "phone": os.getenv("ARTISAN_PHONE"),
-        "password": os.getenv("ARTISAN_PASSWORD")
-    }
+@pytest.fixture(scope="session")
+def product_index():
+    """Session-wide product id index shared by the product approval tests"""
+    from api.client import APIClient
+    from api.endpoints import Endpoints
+    from config.settings import settings
+    from utils.product_index import ProductIndex
+    
+    client = APIClient(base_url=settings.BASE_URL)
+    
+    try:
+        response = client.post(Endpoints.LOGIN, json={
+            "identifier": settings.ADMIN_EMAIL,
+            "password": settings.ADMIN_PASSWORD
+        })
+        if response.status_code == 200:
+            token = response.json().get("data", {}).get("access_token")
+            if token:
+                client.set_auth_token(token)
+    except Exception as e:
+        print(f"   ⚠ Product index could not log in as admin: {e}")
+    
+    # Only this run's products; missing ones are created (NAMESPACE_SCOPE=off: any product)
+    if settings.NAMESPACE_SCOPE == "off":
+        index = ProductIndex(client)
+    else:
+        from utils.journeys import ProductProvisioner
+        from utils.namespace import current_namespace
+        index = ProductIndex(client, namespace=current_namespace(), provision=ProductProvisioner(client))
+    
+    yield index
+    
+    print(f"\n   Product index: {index.listing_requests} listing request(s), final counts {index.counts()}")
+    client.clear_auth_token()
 
-@pytest.fixture(scope="function")  # CHANGED: function scope to match api_client
-def artisan_auth_token(api_client, artisan_credentials):
-    """Get artisan authentication token"""
-    phone = artisan_credentials["phone"]
-    password = artisan_credentials["password"]
+@pytest.fixture(scope="session")
+def stub_server():
+    """Local stub API server for offline tests (see utils/stub_server.py)"""
+    from utils.stub_server import StubAPIServer
     
-    if not phone or not password:
-        print("   ⚠ Artisan credentials not found in environment variables")
-        return None
+    server = StubAPIServer().start()
     
-    print(f"   Getting artisan token for phone: {phone[:4]}****")
+    yield server
     
-    login_data = {
-        "phone": phone,
-        "password": password
-    }
+    server.stop()
+
+@pytest.fixture(scope="function")
+def stub_client(stub_server):
+    """API client pointed at the local stub with the UAT delay disabled"""
+    from api.client import APIClient
     
-    try:
-        # Try different possible login endpoints for artisan
-        login_endpoints = [
-            "/auth/login",
-            "/artisan/login", 
-            "/login/artisan",
-            "/auth/artisan/login"
-        ]
-        
-        token = None
-        successful_endpoint = None
-        
-        for endpoint in login_endpoints:
-            try:
-                response = api_client.post(endpoint, json=login_data)
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    if data.get("success"):
-                        token = data.get("data", {}).get("access_token") or data.get("data", {}).get("token")
-                        if token:
-                            successful_endpoint = endpoint
-                            break
-            except:
-                continue  # Try next endpoint
-        
-        if token:
-            print(f"   ✓ Artisan token obtained from {successful_endpoint}")
-            return token
-        else:
-            print(f"   ⚠ Could not get artisan token from any endpoint")
+    client = APIClient(base_url=stub_server.base_url)
+    client.request_delay = 0
     
-    except Exception as e:
-        print(f"   ⚠ Error getting artisan token: {e}")
+    yield client
     
-    return None
+    client.clear_auth_token()
+
+@pytest.fixture(scope="session")
+def offline_identities(tmp_path_factory):
+    """Identity generator on a temporary ledger, shared by the offline tests of the session"""
+    from utils.identity import IdentityGenerator
+    
+    return IdentityGenerator(ledger_path=str(tmp_path_factory.mktemp("identity") / "identity_ledger.json"))
+
+@pytest.fixture(autouse=True)
+def offline_identity_ledger(request, monkeypatch):
+    """Offline tests reserve phone blocks from a temporary ledger, never the UAT one"""
+    if request.node.get_closest_marker("offline"):
+        monkeypatch.setattr("utils.identity._default_generator", request.getfixturevalue("offline_identities"))
+
+@pytest.fixture(autouse=True)
+def offline_admin_credentials(request, monkeypatch):
+    """Offline tests log in as the stub's admin, whatever UAT credentials the environment holds"""
+    if request.node.get_closest_marker("offline"):
+        from config.settings import settings
+        from utils.stub_server import StubAPIServer
+        monkeypatch.setattr(settings, "ADMIN_EMAIL", StubAPIServer.ADMIN_IDENTIFIER)
+        monkeypatch.setattr(settings, "ADMIN_PASSWORD", StubAPIServer.ADMIN_PASSWORD)
 
 @pytest.fixture(scope="session", autouse=True)
 def session_setup():
@@ -134,15 +152,118 @@ def session_setup():
     
     yield
     
+    # Clean up this worker's test data (and stale entries of crashed runs) at bounded concurrency
+    from utils.cleanup import Reaper, print_report as print_cleanup
+    if settings.CLEANUP != "off":
+        reaper = Reaper()
+        if reaper.ledger.pending(settings.BASE_URL, settings.RUN_ID, settings.WORKER_ID):
+            report = reaper.start(settings.RUN_ID, settings.WORKER_ID,
+                                  sweep_age=settings.CLEANUP_SWEEP_AGE).join(settings.CLEANUP_TIMEOUT)
+            if report:
+                print_cleanup(report)
+            else:
+                print(f"Cleanup still running after {settings.CLEANUP_TIMEOUT:.0f}s; "
+                      f"the rest is swept by the next run (python -m utils.cleanup)")
+    
+    from api.circuit_breaker import circuit_breakers
+    for breaker in circuit_breakers().snapshot():
+        if breaker["times_opened"]:
+            print(f"Circuit {breaker['name']}: {breaker['state']}, opened {breaker['times_opened']} time(s), "
+                  f"last error: {breaker['last_error']}")
+    
+    from api.transport import shutdown_transports, transport_stats
+    for stats in transport_stats():
+        print(f"HTTP pool {stats['base_url']}: {stats['requests']} requests, "
+              f"{stats['connections_opened']} connection(s) opened")
+    from api.single_flight import single_flight
+    coalescer = single_flight()
+    if coalescer and coalescer.coalesced:
+        stats = coalescer.stats()
+        print(f"Single-flight: {stats['coalesced']} identical concurrent GET(s) coalesced "
+              f"({stats['saved_ratio']:.0%} of coalescable calls saved)")
+    from api.http_cache import http_cache
+    cache = http_cache()
+    if cache:
+        stats = cache.stats()
+        if stats["hits"] + stats["revalidated"] + stats["misses"]:
+            print(f"HTTP cache: {stats['hit_ratio']:.0%} hit ratio ({stats['hits']} hit(s), "
+                  f"{stats['revalidated']} revalidated, {stats['misses']} miss(es), "
+                  f"{stats['invalidations']} invalidation(s), {stats['bytes'] / 1024:.0f} KiB)")
+        if cache.path:
+            cache.save()
+    shutdown_transports()
+    
     print(f"\n{'='*80}")
     print(f"Test Session Complete")
     print(f"End Time: {time.strftime('%Y-%m-%d %H:%M:%S')}")
     print(f"{'='*80}")
 
+def pytest_collection_finish(session):
+    """Preflight UAT and snapshot its reference data once before the first UAT test
+    
+    PREFLIGHT=abort|breaker|off, REFERENCE_DATA=on|off; offline-only runs skip both.
+    """
+    from config.settings import settings
+    
+    if session.config.option.collectonly:
+        return
+    if all(item.get_closest_marker("offline") for item in session.items):
+        return
+    from api.circuit_breaker import circuit_breakers
+    
+    if settings.PREFLIGHT != "off":
+        from utils.preflight import print_report, run_preflight
+        
+        report = run_preflight()
+        print_report(report)
+        settings.LOAD_CONCURRENCY = report["recommended_concurrency"]
+        if not report["ok"]:
+            if settings.PREFLIGHT == "abort":
+                pytest.exit(f"Preflight failed: {report['reason']}", returncode=3)
+            breakers = circuit_breakers()
+            breakers.get(breakers.host(settings.BASE_URL)).trip(f"preflight: {report['reason']}")
+    
+    # Valid technique/file ids for the product payloads, instead of hard-coded ones
+    if settings.REFERENCE_DATA != "off" and not circuit_breakers().check(settings.BASE_URL):
+        from config.test_data_product_creation import ProductTestData
+        from utils.reference_data import load_reference_data
+        
+        snapshot = load_reference_data()
+        ProductTestData.use_reference(snapshot)
+        print(f"Reference data: {snapshot.summary()}")
+
+def pytest_runtest_setup(item):
+    """Skip (CIRCUIT_BREAKER=skip) or fail (=fail) UAT tests at once while the UAT circuit is open"""
+    if item.get_closest_marker("offline"):
+        return
+    from api.circuit_breaker import circuit_breakers
+    from config.settings import settings
+    
+    reason = circuit_breakers().check(settings.BASE_URL)
+    if reason:
+        if settings.CIRCUIT_BREAKER == "fail":
+            pytest.fail(f"UAT unavailable: {reason}", pytrace=False)
+        pytest.skip(f"UAT unavailable: {reason}")
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """Report a test that ran into an open circuit as skipped, not as a failure"""
+    outcome = yield
+    report = outcome.get_result()
+    from api.circuit_breaker import CircuitOpenError
+    from config.settings import settings
+    
+    if (call.excinfo is not None and call.excinfo.errisinstance(CircuitOpenError)
+            and settings.CIRCUIT_BREAKER == "skip"):
+        report.outcome = "skipped"
+        report.longrepr = (str(item.path), item.location[1], f"Skipped: UAT unavailable: {call.excinfo.value}")
+
 @pytest.fixture(autouse=True)
-def test_delay():
+def test_delay(request):
     """Add small delay between tests to prevent rate limiting"""
     yield
+    if request.node.get_closest_marker("offline"):
+        return  # Stub-backed tests never touch UAT
     from config.settings import settings
     time.sleep(settings.TEST_DELAY if hasattr(settings, 'TEST_DELAY') else 1.0)
 
@@ -163,57 +284,35 @@ def artisan_credentials():
         "password": password
     }
 
+@pytest.fixture(scope="session")
+def endpoint_discovery():
+    """Alternative-route discovery for UAT, cached per environment (see api/endpoint_discovery.py)"""
+    from api.endpoint_discovery import EndpointDiscovery
+    from config.settings import settings
+    
+    return EndpointDiscovery(settings.BASE_URL)
+
 @pytest.fixture(scope="function")
-def artisan_auth_token(api_client, artisan_credentials):
-    """Get artisan authentication token"""
+def artisan_auth_token(artisan_credentials, endpoint_discovery):
+    """Get artisan authentication token from the discovered artisan login endpoint"""
     if not artisan_credentials:
         return None
     
     identifier = artisan_credentials["identifier"]
-    password = artisan_credentials["password"]
     
     print(f"   Getting artisan token for: {identifier[:4]}****")
     
-    login_data = {
-        "identifier": identifier,
-        "password": password
-    }
-    
     try:
-        response = api_client.post("/auth/login", json=login_data)
-        
-        if response.status_code == 200:
-            data = response.json()
-            if data.get("success"):
-                # Try different possible token field names
-                token = (
-                    data.get("data", {}).get("access_token") or
-                    data.get("data", {}).get("token") or
-                    data.get("access_token") or
-                    data.get("token")
-                )
-                if token:
-                    print(f"   ✓ Artisan token obtained")
-                    
-                    # Check if it's really artisan (optional)
-                    user_data = data.get("data", {}).get("user", {})
-                    user_role = user_data.get("role", "").lower()
-                    if "artisan" in user_role:
-                        print(f"   ✓ User role: {user_role}")
-                    else:
-                        print(f"   ⚠ User role may not be artisan: {user_role}")
-                    
-                    return token
-                else:
-                    print(f"   ⚠ No token in response data")
-            else:
-                print(f"   ⚠ Login unsuccessful: {data.get('message')}")
-        else:
-            print(f"   ⚠ Login failed with status: {response.status_code}")
-            if response.text:
-                print(f"   Response: {response.text[:200]}")
-    
+        endpoint, token = endpoint_discovery.artisan_login(identifier, artisan_credentials["password"])
     except Exception as e:
         print(f"   ⚠ Error getting artisan token: {e}")
+        return None
     
-    return None
\ No newline at end of file
+    if token:
+        print(f"   ✓ Artisan token obtained from {endpoint}")
+        return token
+    if endpoint:
+        print(f"   ⚠ Artisan login failed on {endpoint}")
+    else:
+        print(f"   ⚠ Could not get artisan token from any login endpoint")
+    return None
@@ -0,0 +1,66 @@
+"""AsyncAPIClient tests against the local stub server (offline)"""
+
+import asyncio
+import pytest
+from api.async_client import AsyncAPIClient
+from api.endpoints import Endpoints
+
+
+@pytest.mark.offline
+class TestAsyncClient:
+    """Round trips, keep-alive pooling and auth views"""
+
+    @pytest.fixture
+    def client(self, stub_server):
+        client = AsyncAPIClient(stub_server.base_url, pool_size=4)
+        client.register_role("admin", identifier=stub_server.admin_identifier,
+                             password=stub_server.admin_password)
+        return client
+
+    def test_round_trip_and_keep_alive(self, client, stub_server):
+        """Concurrent requests reuse at most pool_size connections"""
+        async def scenario():
+            health = await client.get(Endpoints.HEALTH)
+            pages = await asyncio.gather(*[client.get(Endpoints.PRODUCTS, params={"page": 1, "limit": 5})
+                                           for _ in range(50)])
+            await client.close()
+            return health, pages
+
+        before = stub_server.connection_count
+        health, pages = asyncio.run(scenario())
+
+        assert health.ok and health.json()["data"]["status"] == "ok"
+        assert health.url.endswith("/api/v1/health") and health.elapsed > 0
+        assert all(p.status_code == 200 for p in pages)
+        assert client.pool.connections_opened <= 4
+        assert stub_server.connection_count - before == client.pool.connections_opened
+        assert client.metrics.snapshot()["requests"] == 51
+
+    def test_json_body_and_error_status(self, client):
+        """json= bodies go through the encoder; error statuses are returned, not raised"""
+        async def scenario():
+            created = await client.anonymous().post(Endpoints.REGISTER, json={"email": "only@test.com"})
+            missing = await client.get("/no-such-route")
+            await client.close()
+            return created, missing
+
+        created, missing = asyncio.run(scenario())
+
+        assert created.status_code == 422 and not created.ok
+        assert missing.status_code == 404
+        assert client.metrics.snapshot()["encoded_bodies"] == 1
+
+    def test_concurrent_as_role_logs_in_once(self, client):
+        """Many tasks asking for the admin view share a single login"""
+        async def scenario():
+            views = await asyncio.gather(*[client.as_role("admin") for _ in range(20)])
+            response = await views[0].patch(Endpoints.PRODUCT_STATUS, json={"status": "approved"})
+            await client.close()
+            return views, response
+
+        views, response = asyncio.run(scenario())
+
+        assert client.metrics.snapshot()["requests"] == 2  # One login, one PATCH
+        assert {v.headers["Authorization"] for v in views} == {"Bearer stub-admin-token"}
+        assert "Authorization" not in client.headers
+        assert response.status_code == 422
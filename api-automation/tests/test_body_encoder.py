@@ -0,0 +1,96 @@
+"""Request body encoder tests (offline, stub server)"""
+
+import json
+import time
+import pytest
+from api import body_encoder
+from api.body_encoder import BodyEncoder
+from config.test_data_product_creation import ProductTestData
+from utils.payload_template import PayloadTemplate
+from utils.stub_server import envelope
+
+
+@pytest.mark.offline
+class TestBodyEncoder:
+    """Byte output, template caching and client integration"""
+
+    @pytest.fixture(params=["json", "orjson"])
+    def encoder(self, request):
+        if request.param == "orjson" and body_encoder.orjson is None:
+            pytest.skip("orjson not installed")
+        return BodyEncoder(use_orjson=request.param == "orjson")
+
+    def test_output_matches_standard_json(self, encoder):
+        """Plain, frozen and spliced payloads all decode to the same data"""
+        template = PayloadTemplate({"name": "Café", "materials": [{"price": 20.5}], "ids": ["a", "b"]})
+        payload = template.build(name="Crème")
+
+        for value in (payload, template.base, {"plain": [1, 2.5, None, True]}):
+            data, _hits, _misses = encoder.encode(value)
+            assert isinstance(data, bytes)
+            assert json.loads(data) == json.loads(json.dumps(value))
+
+    def test_nan_is_rejected_like_requests(self):
+        """NaN / Infinity raise instead of going out as invalid JSON"""
+        for value in (float("nan"), float("inf")):
+            with pytest.raises(ValueError):
+                BodyEncoder(use_orjson=False).encode({"price": value})
+
+    def test_frozen_fields_are_encoded_once(self, encoder):
+        """Builds from one template reuse cached bytes; only volatile fields are re-encoded"""
+        template = ProductTestData.VALID_PRODUCT_TEMPLATE
+        fields = sum(1 for value in template.base.values() if isinstance(value, tuple))
+
+        _data, hits, misses = encoder.encode(template.build(name="first"))
+        assert (hits, misses) == (0, fields)
+
+        data, hits, misses = encoder.encode(template.build({"materials.0.price": 1.0}, name="second"))
+        assert (hits, misses) == (fields - 1, 1)
+        assert json.loads(data)["materials"][0]["price"] == 1.0
+        assert json.loads(data)["techniques"] == json.loads(json.dumps(template.base["techniques"]))
+
+    def test_client_sends_encoded_body(self, stub_client, stub_server):
+        """APIClient posts the encoded bytes and records encode metrics"""
+        received = []
+
+        @stub_server.route("POST", "/echo")
+        def echo(request):
+            received.append((request.headers.get("content-type"), request.json()))
+            return 201, envelope(data=request.json())
+
+        payload = ProductTestData.get_valid_product_payload(name="Encoded Product")
+        response = stub_client.post("/echo", json=payload)
+        stub_client.post("/echo", json=ProductTestData.get_valid_product_payload())
+
+        assert response.status_code == 201
+        assert received[0] == ("application/json", json.loads(json.dumps(payload)))
+        metrics = stub_client.metrics.snapshot()
+        print(f"   Encoder: {stub_client.encoder.name}, metrics: {metrics}")
+        assert metrics["requests"] == 2 and metrics["encoded_bodies"] == 2
+        assert metrics["encode_time"] > 0 and metrics["encode_cache_hits"] > 0
+
+    @pytest.mark.performance
+    def test_cached_encoding_is_faster(self):
+        """Encoding large template builds beats json.dumps of the equivalent plain dict"""
+        encoder = BodyEncoder()
+        base = ProductTestData.VALID_PRODUCT_TEMPLATE
+        limits = ProductTestData.VALIDATION_LIMITS
+        template = base.derive(
+            materials=base.get("materials") * limits["materials_max"],
+            measurements=base.get("measurements") * limits["measurements_max"],
+        )
+        payloads = [template.build(name=f"Load {i}") for i in range(5_000)]
+        plain = [json.loads(json.dumps(p)) for p in payloads]
+
+        start = time.perf_counter()
+        for payload in plain:
+            json.dumps(payload).encode()
+        baseline = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for payload in payloads:
+            encoder.encode(payload)
+        cached = time.perf_counter() - start
+
+        print(f"   json.dumps: {baseline:.3f}s, {encoder.name} + cache: {cached:.3f}s")
+        assert cached < baseline
@@ -0,0 +1,66 @@
+"""Bulk product approval driver tests against the local stub server (offline)"""
+
+import time
+import pytest
+from api.rate_limiter import RateLimiter
+from perf.bulk_approval import BulkApprovalDriver
+
+
+@pytest.mark.offline
+@pytest.mark.performance
+class TestBulkApprovalDriver:
+    """Concurrent PATCH driver, verification and reporting"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, stub_client, stub_server):
+        self.client = stub_client
+        self.stub = stub_server
+        self.client.set_auth_token("stub-admin-token")
+
+    def test_bulk_approve_and_verify(self):
+        """Every product reaches its target state and the report adds up"""
+        products = self.stub.seed_products(40, status="pending_approval")
+        ids = [p["id"] for p in products]
+
+        driver = BulkApprovalDriver(self.client, concurrency=8, reject_ratio=0.25)
+        report = driver.run(ids)
+
+        print(f"   Throughput: {report['throughput']:.1f}/s, p95: {report['latency']['p95']:.4f}s")
+        assert report["status_codes"] == {"200": 40}
+        assert report["verified"] is True
+        assert report["error_rate"] == 0.0
+        assert sum(1 for p in products if p["status"] == "rejected") == 10
+        latency = report["latency"]
+        assert latency["min"] <= latency["p50"] <= latency["p95"] <= latency["max"]
+
+    def test_errors_are_counted(self):
+        """Unknown products come back as 404 errors and are excluded from verification"""
+        ids = [p["id"] for p in self.stub.seed_products(3)]
+        ids.append("00000000-0000-4000-8000-000000000000")
+
+        report = BulkApprovalDriver(self.client, concurrency=2).run(ids)
+
+        assert report["status_codes"] == {"200": 3, "404": 1}
+        assert report["error_rate"] == 0.25
+        assert report["verified"] is True
+
+    def test_rate_cap_is_respected(self):
+        """A 40 req/s cap spreads 12 requests over at least ~0.25s"""
+        ids = [p["id"] for p in self.stub.seed_products(12)]
+
+        start = time.perf_counter()
+        BulkApprovalDriver(self.client, concurrency=6, rate=40).run(ids, verify=False)
+        elapsed = time.perf_counter() - start
+
+        assert elapsed >= 11 / 40 * 0.9
+
+
+@pytest.mark.offline
+def test_rate_limiter_burst():
+    """The bucket allows `burst` immediate requests, then paces at `rate`"""
+    limiter = RateLimiter(rate=10, burst=3)
+    waits = [limiter.reserve() for _ in range(5)]
+
+    assert waits[:3] == [0.0, 0.0, 0.0]
+    assert waits[3] == pytest.approx(0.1, abs=0.02)
+    assert waits[4] == pytest.approx(0.2, abs=0.02)
@@ -0,0 +1,107 @@
+"""Circuit breaker tests against local stub servers and a dead port (offline)"""
+
+import socket
+import time
+import pytest
+from api.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreakers, CircuitOpenError
+from api.client import APIClient
+from api.endpoints import Endpoints
+from utils.stub_server import StubAPIServer, envelope
+
+
+def dead_url():
+    """Base URL of a local port nobody listens on (connections are refused at once)"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}/api/v1"
+
+
+def make_client(base_url, **options):
+    client = APIClient(base_url=base_url)
+    client.request_delay = 0
+    client.circuit = CircuitBreakers(enabled=True, **{"consecutive": 3, "reset_timeout": 0.2, **options})
+    return client
+
+
+@pytest.mark.offline
+class TestCircuitBreaker:
+    """Opening thresholds, fail-fast behaviour and health-probed recovery"""
+
+    def test_dead_host_fails_fast(self):
+        """After 3 connection errors further requests fail immediately, even with the client delay on"""
+        client = make_client(dead_url())
+        for _ in range(3):
+            with pytest.raises(Exception) as excinfo:
+                client.get(Endpoints.PRODUCTS)
+            assert not isinstance(excinfo.value, CircuitOpenError)
+
+        client.request_delay = 3.0
+        start = time.perf_counter()
+        with pytest.raises(CircuitOpenError, match="3/3 recent requests failed"):
+            client.post(Endpoints.LOGIN, json={})
+        assert time.perf_counter() - start < 0.1
+        assert client.circuit.check(client.base_url, probe=lambda: False) is not None
+
+    def test_server_errors_open_only_their_group(self):
+        """5xx on one endpoint group trips that group by failure rate; other groups keep working"""
+        with StubAPIServer() as stub:
+            calls = {"n": 0}
+
+            @stub.route("GET", "/flaky")
+            def flaky(request):
+                calls["n"] += 1
+                return (503 if calls["n"] % 3 else 200), envelope(message="flaky")
+
+            client = make_client(stub.base_url, consecutive=10, min_requests=6, failure_rate=0.5)
+            codes = []
+            with pytest.raises(CircuitOpenError):
+                for _ in range(20):
+                    codes.append(client.get("/flaky").status_code)
+
+            assert codes == [503, 503, 200, 503, 503, 200, 503]  # Trips on the first failure past 6 samples
+            assert client.get(Endpoints.HEALTH).status_code == 200
+            assert client.circuit.check(stub.base_url) is None  # Host breaker still closed
+            states = {b["name"].split("/")[-1]: b["state"] for b in client.circuit.snapshot()}
+            assert states["flaky"] == OPEN and states["health"] == CLOSED
+
+    def test_health_probe_recovers_the_circuit(self):
+        """After the reset timeout a passing health probe half-opens; the next success closes"""
+        with StubAPIServer() as stub:
+            client = make_client(stub.base_url)
+            breaker = client.circuit.get(client.circuit.host(stub.base_url))
+            for _ in range(3):
+                breaker.record(False, "ConnectionError: simulated")
+            assert breaker.state == OPEN
+            with pytest.raises(CircuitOpenError):
+                client.get(Endpoints.PRODUCTS)
+
+            # A failing probe keeps it open and doubles the wait
+            time.sleep(0.25)
+            with pytest.raises(CircuitOpenError):
+                breaker.allow(probe=lambda: False)
+            assert breaker.state == OPEN and breaker._timeout == pytest.approx(0.4)
+
+            time.sleep(0.45)
+            assert client.get(Endpoints.PRODUCTS).status_code == 200  # Real HEALTH probe, then the request
+            assert breaker.state == CLOSED and breaker.times_opened == 2
+            assert stub.request_count >= 2
+
+    def test_half_open_failure_reopens(self):
+        breakers = CircuitBreakers(enabled=True, consecutive=2, reset_timeout=0.05)
+        breaker = breakers.get("uat.example")
+        breaker.record(False, "boom")
+        breaker.record(False, "boom")
+        time.sleep(0.06)
+        breaker.allow(probe=lambda: True)
+        assert breaker.state == HALF_OPEN
+
+        breaker.record(False, "still broken")
+        assert breaker.state == OPEN and "still broken" in breaker.reason()
+
+    def test_disabled_breakers_never_raise(self):
+        breakers = CircuitBreakers(enabled=False)
+        for _ in range(10):
+            breakers.record("http://dead.example", "/x", error=ConnectionError("down"))
+        breakers.before("http://dead.example", "/x")
+        assert breakers.check("http://dead.example") is None
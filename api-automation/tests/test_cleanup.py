@@ -0,0 +1,100 @@
+"""Cleanup ledger and background reaper tests against a local stub server (offline)"""
+
+import time
+import pytest
+from api.client import APIClient
+from config.settings import settings
+from utils.cleanup import CleanupLedger, CreatedEntities, Reaper, print_report
+from utils.stub_server import StubAPIServer, envelope
+
+
+@pytest.fixture
+def stub():
+    with StubAPIServer() as server:
+        @server.route("DELETE", "/techniques/{technique_id}")
+        def delete_technique(request):
+            technique = next((t for t in server.techniques if t["id"] == request.path_params["technique_id"]), None)
+            if technique is None:
+                return 404, envelope(message="Technique not found", success=False)
+            server.techniques.remove(technique)
+            return 200, envelope(message="Technique deleted")
+        yield server
+
+
+@pytest.fixture
+def ledger(tmp_path):
+    return CleanupLedger(str(tmp_path / "cleanup_ledger.json"))
+
+
+def make_reaper(stub, ledger, concurrency=4):
+    client = APIClient(base_url=stub.base_url)
+    client.request_delay = 0
+    client.register_role("admin", token="stub-admin-token")
+    return Reaper(client, ledger, concurrency)
+
+
+@pytest.mark.offline
+class TestCleanup:
+    """Recording, background reaping, failures kept for the next sweep"""
+
+    def test_reaps_a_run_in_the_background(self, stub, ledger):
+        products = stub.seed_products(6)
+        techniques = stub.seed_techniques(2)
+        register = APIClient(base_url=stub.base_url)
+        register.request_delay = 0
+        assert register.post("/auth/register", json={"f_name": "A", "l_name": "B", "phone": "+8801700000001",
+                                                      "email": "reap_me@test.com", "password": "x"}).status_code == 201
+
+        for product in products:
+            ledger.record("product", "run1", "gw0", stub.base_url, id=product["id"])
+        for technique in techniques:
+            ledger.record("technique", "run1", "gw0", stub.base_url, id=technique["id"])
+        ledger.record("artisan", "run1", "gw0", stub.base_url, email="reap_me@test.com", phone="+8801700000001")
+        ledger.record("product", "run2", "gw0", stub.base_url, id=stub.seed_products(1)[0]["id"])
+
+        report = make_reaper(stub, ledger).start("run1", "gw0").join(timeout=10)
+        print_report(report)
+
+        assert report["found"] == report["cleaned"] == 9 and not report["failed"]
+        assert report["by_kind"] == {"product": 6, "technique": 2, "artisan": 1}
+        assert all(p["status"] == "rejected" for p in products) and not stub.techniques
+        assert stub.find_user("reap_me@test.com") and stub.whitelist[-1]["status"] == "rejected"
+        assert [e["run_id"] for e in ledger.pending()] == ["run2"]  # Other runs are left alone
+
+    def test_failures_stay_for_the_next_sweep(self, stub, ledger):
+        ledger.record("product", "run1", "gw0", stub.base_url, id="not-a-uuid")   # 422
+        ledger.record("technique", "run1", "gw0", stub.base_url, id="gone-already")  # 404 counts as cleaned
+        ledger.record("widget", "run1", "gw0", stub.base_url, id="1")
+
+        report = make_reaper(stub, ledger).reap(run_id="run1")
+
+        assert report["cleaned"] == 1 and len(report["failed"]) == 2
+        left = {e["kind"]: e for e in ledger.pending()}
+        assert set(left) == {"product", "widget"} and left["product"]["attempts"] == 1
+        assert left["product"]["last_error"].startswith("HTTP 422")
+        assert "no cleanup action" in left["widget"]["last_error"]
+
+    def test_sweep_picks_up_crashed_runs_only_when_old_enough(self, stub, ledger):
+        product = stub.seed_products(1)[0]
+        ledger.record("product", "crashed", "gw3", stub.base_url, id=product["id"])
+        reaper = make_reaper(stub, ledger)
+
+        assert reaper.reap(older_than=3600)["found"] == 0
+        assert reaper.reap(dry_run=True)["found"] == 1 and product["status"] == "pending_approval"
+        time.sleep(0.05)
+        assert reaper.reap(older_than=0.01)["cleaned"] == 1 and product["status"] == "rejected"
+
+    def test_created_entities_record_the_current_run(self, ledger, monkeypatch):
+        created = CreatedEntities("technique", ledger=ledger)
+        created.append("11111111-1111-1111-1111-111111111111")
+        created.append({"id": "22222222-2222-2222-2222-222222222222", "name": "x", "scenario": "ignored"})
+
+        assert len(created) == 2
+        entries = ledger.pending(settings.BASE_URL, settings.RUN_ID, settings.WORKER_ID)
+        assert [e["id"] for e in entries] == ["11111111-1111-1111-1111-111111111111",
+                                              "22222222-2222-2222-2222-222222222222"]
+        assert "scenario" not in entries[1]
+
+        monkeypatch.setattr(settings, "CLEANUP", "off")
+        created.append("33333333-3333-3333-3333-333333333333")
+        assert len(created) == 3 and len(ledger.pending()) == 2
@@ -0,0 +1,107 @@
+"""Per-request auth context tests against the local stub server (offline)"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from api.endpoints import Endpoints
+from utils.stub_server import envelope
+from utils.user_manager import UserManager
+
+
+@pytest.mark.offline
+class TestClientAuthViews:
+    """with_token / as_role views share the pool but never each other's auth"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, stub_client, stub_server):
+        self.client = stub_client
+        self.stub = stub_server
+
+        @stub_server.route("GET", "/auth-echo")
+        def auth_echo(request):
+            return 200, envelope(data={"token": request.token})
+
+    def token_seen(self, client):
+        return client.get("/auth-echo").json()["data"]["token"]
+
+    def test_views_do_not_touch_the_client(self):
+        """A view gets its own headers; the original client and other views are unchanged"""
+        admin = self.client.with_token("stub-admin-token", role="admin")
+        artisan = admin.with_token("artisan-token")
+
+        assert self.token_seen(admin) == "stub-admin-token"
+        assert self.token_seen(artisan) == "artisan-token"
+        assert self.token_seen(self.client) is None
+        assert "Authorization" not in self.client.headers
+        assert admin.transport is self.client.transport and admin.metrics is self.client.metrics
+
+    def test_concurrent_roles_from_one_client(self):
+        """Admin and artisan calls interleaved across threads never leak tokens"""
+        self.client.register_role("artisan", token="artisan-token")
+        views = {"admin": self.client.as_role("admin"), "artisan": self.client.as_role("artisan")}
+
+        def call(i):
+            role = "admin" if i % 2 else "artisan"
+            return role, self.token_seen(views[role])
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(call, range(200)))
+
+        expected = {"admin": "stub-admin-token", "artisan": "artisan-token"}
+        assert all(token == expected[role] for role, token in results)
+        assert views["admin"].role == "admin"
+
+    def test_as_role_logs_in_once(self):
+        """The first as_role('admin') logs in with settings credentials; later calls reuse the token"""
+        before = self.stub.request_count
+        first = self.client.as_role("admin")
+        logins = self.stub.request_count - before
+        self.client.as_role("admin")
+
+        assert logins == 1
+        assert self.stub.request_count - before == 1
+        assert first.get(Endpoints.HEALTH).status_code == 200
+
+        with pytest.raises(PermissionError):
+            self.client.as_role("auditor")
+        self.client.register_role("artisan", identifier="nobody", password="wrong")
+        with pytest.raises(PermissionError):
+            self.client.as_role("artisan")
+
+    def test_slow_login_does_not_block_other_roles(self, monkeypatch):
+        """Roles log in under their own locks"""
+        self.client.register_role("artisan", token="artisan-token")
+        started, login = threading.Event(), self.client._login_role
+
+        def slow_login(role):
+            started.set()
+            time.sleep(0.5)
+            return login(role)
+        monkeypatch.setattr(self.client, "_login_role", slow_login)
+
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            admin = pool.submit(self.client.as_role, "admin")
+            started.wait(2)
+            start = time.perf_counter()
+            artisan = self.client.as_role("artisan")
+            waited = time.perf_counter() - start
+            assert self.token_seen(admin.result()) == "stub-admin-token"
+
+        assert waited < 0.2 and self.token_seen(artisan) == "artisan-token"
+
+    def test_views_share_pacing(self):
+        """Changing the delay on the client applies to views created from it"""
+        view = self.client.anonymous()
+        self.client.request_delay = 0.25
+        assert view.request_delay == 0.25
+        self.client.request_delay = 0
+
+    def test_user_manager_leaves_client_auth_alone(self):
+        """UserManager whitelist lookups run on an admin view, not on the shared client"""
+        user = self.stub.seed_whitelist(1, email_prefix="auth_view")[0]
+        self.client.set_auth_token("artisan-token")
+
+        manager = UserManager(self.client)
+        assert manager.find_user_in_whitelist(user["email"], None) == user["id"]
+        assert self.client.headers["Authorization"] == "Bearer artisan-token"
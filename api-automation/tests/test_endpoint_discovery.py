@@ -0,0 +1,67 @@
+"""Artisan login endpoint discovery and its per-environment cache (offline)"""
+
+import time
+import pytest
+from api.endpoint_discovery import ARTISAN_LOGIN_CANDIDATES, EndpointCache, EndpointDiscovery
+from utils.stub_server import StubAPIServer, envelope
+
+ARTISAN = ("0790000001", "artisan-pass")
+
+
+@pytest.fixture(scope="module")
+def artisan_stub():
+    """Artisans log in on /auth/artisan/login only (the last candidate); every request takes 0.2s"""
+    with StubAPIServer(latency=0.2) as server:
+        @server.route("POST", "/auth/artisan/login")
+        def artisan_login(request):
+            data = request.json()
+            if (data.get("identifier"), data.get("password")) != ARTISAN:
+                return 401, envelope(message="Invalid credentials", success=False)
+            return 200, envelope({"access_token": "stub-artisan-token", "user": {"role": "artisan"}})
+        yield server
+
+
+@pytest.mark.offline
+class TestEndpointDiscovery:
+    """Concurrent probing, cached winners, TTL and stale-route recovery"""
+
+    def test_discovers_concurrently_and_caches(self, artisan_stub, tmp_path):
+        cache = EndpointCache(str(tmp_path / "endpoints.json"), ttl=60)
+        discovery = EndpointDiscovery(artisan_stub.base_url, cache=cache)
+
+        start = time.perf_counter()
+        endpoint, token = discovery.artisan_login(*ARTISAN)
+        elapsed = time.perf_counter() - start
+
+        assert (endpoint, token) == ("/auth/artisan/login", "stub-artisan-token")
+        assert discovery.probes == len(ARTISAN_LOGIN_CANDIDATES)
+        assert elapsed < 0.2 * len(ARTISAN_LOGIN_CANDIDATES) * 0.75  # Not one after the other
+        assert cache.get(artisan_stub.base_url, "artisan_login") == "/auth/artisan/login"
+
+        # Another process / a later run goes straight to the cached route
+        again = EndpointDiscovery(artisan_stub.base_url, cache=EndpointCache(cache.path, ttl=60))
+        assert again.artisan_login(*ARTISAN) == ("/auth/artisan/login", "stub-artisan-token")
+        assert again.probes == 1
+
+    def test_cache_is_per_environment_and_expires(self, artisan_stub, tmp_path):
+        cache = EndpointCache(str(tmp_path / "endpoints.json"), ttl=60)
+        cache.put(artisan_stub.base_url, "artisan_login", "/auth/artisan/login")
+
+        assert cache.get("https://other.example/api/v1", "artisan_login") is None
+        assert EndpointCache(cache.path, ttl=0).get(artisan_stub.base_url, "artisan_login") is None
+
+    def test_stale_cached_route_is_rediscovered(self, artisan_stub, tmp_path):
+        cache = EndpointCache(str(tmp_path / "endpoints.json"), ttl=60)
+        cache.put(artisan_stub.base_url, "artisan_login", "/login/artisan")  # 404 on this environment
+        discovery = EndpointDiscovery(artisan_stub.base_url, cache=cache)
+
+        assert discovery.artisan_login(*ARTISAN) == ("/auth/artisan/login", "stub-artisan-token")
+        assert discovery.probes == 1 + len(ARTISAN_LOGIN_CANDIDATES)
+        assert cache.get(artisan_stub.base_url, "artisan_login") == "/auth/artisan/login"
+
+    def test_wrong_credentials_cache_nothing(self, artisan_stub, tmp_path):
+        cache = EndpointCache(str(tmp_path / "endpoints.json"), ttl=60)
+        discovery = EndpointDiscovery(artisan_stub.base_url, cache=cache)
+
+        assert discovery.artisan_login(ARTISAN[0], "wrong") == (None, None)
+        assert cache.get(artisan_stub.base_url, "artisan_login") is None
@@ -0,0 +1,79 @@
+"""Mutation fuzzing engine tests against a local stub server (offline)"""
+
+import time
+import pytest
+from api.client import APIClient
+from utils.fuzzer import Case, Fuzzer, FuzzTarget, Mutation, Mutator, registration_target, signature_key
+from utils.identity import IdentityGenerator
+from utils.namespace import Namespace
+from utils.payload_template import REMOVE, PayloadTemplate
+from utils.stub_server import StubAPIServer, envelope
+
+
+@pytest.fixture
+def fuzz_client():
+    with StubAPIServer() as server:
+        @server.route("POST", "/echo-names")
+        def echo_names(request):
+            data = request.json()
+            if isinstance(data.get("f_name"), str) and len(data["f_name"]) > 10:
+                return 500, envelope(message="Internal server error", success=False)
+            return 201, envelope({"id": "x"}, message="Created")
+
+        client = APIClient(base_url=server.base_url)
+        client.request_delay = 0
+        yield client
+
+
+@pytest.fixture
+def namespace(tmp_path):
+    generator = IdentityGenerator(run_id="f1f2f3", worker_id="gw0", ledger_path=str(tmp_path / "identity_ledger.json"))
+    return Namespace("f1f2f3", generator=generator, enabled=True)
+
+
+@pytest.mark.offline
+class TestFuzzer:
+    """Fast mutation, novel-signature clustering and minimization"""
+
+    def test_mutator_covers_every_kind_quickly(self):
+        template = PayloadTemplate({"name": "x", "qty": 2, "tags": ["a"], "meta": {"k": "v"}})
+        mutator = Mutator(template, seed=7, max_mutations=3)
+        kinds = {m.kind.split(":")[0] for m in mutator.singles}
+        assert kinds == {"missing", "type", "length", "unicode", "injection", "number", "extra"}
+
+        start = time.perf_counter()
+        cases = list(mutator.cases(5000))
+        payloads = [mutator.build(case, {"name": "fresh"}) for case in cases]
+        assert 5000 / (time.perf_counter() - start) > 2000
+
+        assert [c.describe() for c in cases[-20:]] == [c.describe() for c in list(Mutator(template, 7, 3).cases(5000))[-20:]]
+        assert template.get("meta.k") == "v" and template.get("name") == "x"  # Template untouched
+        first_name_mutation = next(i for i, c in enumerate(cases) if c.mutations[0].path == ("name",))
+        assert all(p["name"] == "fresh" for p, c in zip(payloads, cases) if not any(m.path[0] == "name" for m in c.mutations))
+        assert "name" not in payloads[first_name_mutation]  # The first mutation of a field removes it
+
+    def test_reports_only_novel_signatures(self, fuzz_client, namespace):
+        fuzzer = Fuzzer(fuzz_client, registration_target(namespace), concurrency=8, track=False)
+        report = fuzzer.run(cases=400, minimize=False)
+
+        novel = {c["signature"]: c for c in report["novel"]}
+        assert report["baseline"] == "201 user registered successfully []" and report["baseline"] not in novel
+        assert "422 validation failed [phone]" in novel and novel["422 validation failed [phone]"]["example"]
+        failures = [c for c in report["novel"] if c["failure"]]
+        assert failures and failures[0]["signature"].startswith("500 internal server error")
+        assert report["generated_per_second"] > 1000
+
+        again = Fuzzer(fuzz_client, registration_target(namespace), concurrency=8, known=fuzzer.signatures(),
+                       track=False).run(cases=400, minimize=False)
+        assert again["novel"] == [] and again["failures"] == 0
+
+    def test_failures_are_minimized(self, fuzz_client):
+        target = FuzzTarget("names", "/echo-names", PayloadTemplate({"f_name": "Ann", "l_name": "Lee"}))
+        fuzzer = Fuzzer(fuzz_client, target)
+        case = Case(0, [Mutation(("l_name",), REMOVE, "missing"), Mutation(("f_name",), "A" * 10000, "length:10000")])
+        failing = fuzzer.probe(case.mutations)
+        assert signature_key(failing) == "500 internal server error []"
+
+        minimized = fuzzer.minimize(case, failing)
+        assert [m.path for m in minimized.mutations] == [("f_name",)]
+        assert 10 < len(minimized.mutations[0].value) <= 20
@@ -0,0 +1,98 @@
+"""HTTP cache tests for reference collections against a local stub server (offline)"""
+
+import time
+import pytest
+from api.client import APIClient
+from api.http_cache import CACHE_RULES, HTTPCache
+from utils.assertions import Assertions
+from utils.stub_server import StubAPIServer, envelope
+
+
+@pytest.fixture
+def etag_stub():
+    """Stub with ETags, GET /units and POST /techniques; counts GETs by If-None-Match"""
+    with StubAPIServer() as server:
+        server.etags = True
+        server.gets = {"plain": 0, "conditional": 0}
+        server.seed_techniques(3)
+
+        @server.route("GET", "/units")
+        def list_units(request):
+            server.gets["conditional" if request.headers.get("if-none-match") else "plain"] += 1
+            return 200, envelope([{"id": i, "name": f"unit {i}"} for i in range(int(request.query.get("page", 1)) * 50)])
+
+        @server.route("POST", "/techniques")
+        def create_technique(request):
+            return 201, envelope(server.seed_techniques(1)[0])
+        yield server
+
+
+def make_client(base_url, cache):
+    client = APIClient(base_url=base_url)
+    client.request_delay = 0
+    client.http_cache = cache
+    return client
+
+
+@pytest.mark.offline
+class TestHTTPCache:
+    """Fresh hits skip the network, stale entries revalidate, writes invalidate"""
+
+    def test_fresh_hits_return_in_microseconds(self, etag_stub):
+        cache = HTTPCache()
+        client = make_client(etag_stub.base_url, cache)
+
+        first = client.get("/units/")
+        started = time.perf_counter()
+        hits = [client.get("/units/") for _ in range(1000)]
+        per_hit = (time.perf_counter() - started) / 1000
+
+        assert first.status_code == 200 and not getattr(first, "from_cache", False)
+        assert all(r.from_cache and r.json() == first.json() for r in hits[:5])
+        assert etag_stub.gets == {"plain": 1, "conditional": 0}
+        assert per_hit < 0.0005
+        Assertions.assert_response_time(hits[0], 0.001)  # Hits carry elapsed and request like a real response
+        assert hits[0].request.method == "GET" and hits[0].request.url == first.request.url
+
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"]) == (1000, 1) and stats["hit_ratio"] > 0.99
+        assert not getattr(client.with_token("stub-admin-token").get("/units/"), "from_cache", False)  # Keyed by auth
+
+    def test_stale_entries_are_revalidated_with_etag(self, etag_stub):
+        cache = HTTPCache(rules={**CACHE_RULES, "units": {**CACHE_RULES["units"], "ttl": 0.0}})
+        client = make_client(etag_stub.base_url, cache)
+
+        bodies = [client.get("/units/").json() for _ in range(3)]
+
+        assert bodies[0] == bodies[1] == bodies[2]
+        assert etag_stub.gets == {"plain": 1, "conditional": 2}
+        assert (cache.stats()["misses"], cache.stats()["revalidated"]) == (1, 2)
+
+    def test_suite_writes_invalidate_their_collection(self, etag_stub):
+        cache = HTTPCache()
+        client = make_client(etag_stub.base_url, cache)
+        client.get("/units/")
+        before = client.get("/techniques/").json()["data"]
+
+        assert client.post("/techniques/", json={}).status_code == 201
+        after = client.get("/techniques/").json()["data"]
+
+        assert len(after) == len(before) + 1
+        assert client.get("/units/").from_cache  # Other collections keep their entries
+        assert cache.stats()["invalidations"] == 1
+
+    def test_lru_bound_and_disk_round_trip(self, etag_stub, tmp_path):
+        cache = HTTPCache(max_bytes=7000, path=str(tmp_path / "http_cache.json"))
+        client = make_client(etag_stub.base_url, cache)
+        for page in (1, 2, 1, 3):  # ~1.6, ~3.1, ~4.8 KB: page 2 is the least recently used
+            client.get("/units/", params={"page": page})
+
+        assert cache.stats()["evictions"] == 1 and cache.stats()["bytes"] <= 7000
+        assert client.get("/units/", params={"page": 1}).from_cache
+        assert cache.save() == 2
+
+        reloaded = HTTPCache(path=str(tmp_path / "http_cache.json"))
+        sent = dict(etag_stub.gets)
+        response = make_client(etag_stub.base_url, reloaded).get("/units/", params={"page": 3})
+        assert response.from_cache and len(response.json()["data"]) == 150
+        assert etag_stub.gets == sent
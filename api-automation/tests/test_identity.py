@@ -0,0 +1,82 @@
+"""Unique identity generator tests (offline, no API calls)"""
+
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from utils.identity import FeistelPermutation, IdentityGenerator
+
+
+@pytest.mark.offline
+class TestIdentityGenerator:
+    """Uniqueness across threads, workers and runs"""
+
+    @pytest.fixture
+    def ledger(self, tmp_path):
+        return str(tmp_path / "identity_ledger.json")
+
+    def test_permutation_is_bijective(self):
+        """Small domains (including non-square sizes) map onto themselves exactly"""
+        for size in (1, 7, 1000, 1234):
+            permute = FeistelPermutation(size, "test-key")
+            assert sorted(permute(i) for i in range(size)) == list(range(size))
+
+    def test_phone_formats(self, ledger):
+        """Generated numbers keep the registration API's phone formats"""
+        generator = IdentityGenerator(run_id="r1", worker_id="gw0", ledger_path=ledger)
+
+        assert re.fullmatch(r"\+88017\d{8}", generator.phone("bd"))
+        assert re.fullmatch(r"\+92\d{9}", generator.phone("pk"))
+        assert re.fullmatch(r"artisan_r1gw0x\d+@test\.com", generator.email("artisan"))
+
+    def test_threads_never_collide(self, ledger):
+        """Concurrent callers crossing block boundaries still get unique numbers"""
+        generator = IdentityGenerator(run_id="r1", worker_id="gw0", ledger_path=ledger, block_size=50)
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            phones = list(pool.map(lambda _: generator.phone(), range(5000)))
+            emails = list(pool.map(lambda _: generator.email(), range(5000)))
+
+        assert len(set(phones)) == 5000
+        assert len(set(emails)) == 5000
+
+    def test_workers_and_runs_share_the_ledger(self, ledger):
+        """Two workers and a later run reserve disjoint blocks from the same ledger"""
+        gw0 = IdentityGenerator(run_id="run1", worker_id="gw0", ledger_path=ledger, block_size=100)
+        gw1 = IdentityGenerator(run_id="run1", worker_id="gw1", ledger_path=ledger, block_size=100)
+        first_run = {g.phone() for g in (gw0, gw1) for _ in range(250)}
+
+        next_run = IdentityGenerator(run_id="run2", worker_id="gw0", ledger_path=ledger, block_size=100)
+        second_run = {next_run.phone() for _ in range(500)}
+
+        assert len(first_run) == 500
+        assert not first_run & second_run
+
+    def test_fresh_ledgers_start_apart_unless_pinned(self, tmp_path):
+        """Clean checkouts do not replay the previous pipeline's numbers; an explicit key does"""
+        fresh = [IdentityGenerator(ledger_path=str(tmp_path / f"fresh-{i}.json"), pinned=False) for i in range(2)]
+        pinned = [IdentityGenerator(ledger_path=str(tmp_path / f"pinned-{i}.json"), key="ci-key") for i in range(2)]
+
+        assert not {fresh[0].phone() for _ in range(100)} & {fresh[1].phone() for _ in range(100)}
+        assert [pinned[0].phone() for _ in range(3)] == [pinned[1].phone() for _ in range(3)]
+
+    def test_machine_slots_are_disjoint(self, tmp_path):
+        """Machines without a shared ledger stay apart through IDENTITY_SLOT(S)"""
+        a = IdentityGenerator(ledger_path=str(tmp_path / "a.json"), slot=0, slots=2)
+        b = IdentityGenerator(ledger_path=str(tmp_path / "b.json"), slot=1, slots=2)
+
+        assert not {a.phone() for _ in range(2000)} & {b.phone() for _ in range(2000)}
+
+    def test_bulk_generation(self, ledger):
+        """Bulk generation fills a preallocated array with unique numbers quickly"""
+        generator = IdentityGenerator(ledger_path=ledger)
+
+        start = time.perf_counter()
+        numbers = generator.bulk_phone_numbers(200_000)
+        elapsed = time.perf_counter() - start
+
+        print(f"   Generated {len(numbers)} numbers in {elapsed:.2f}s ({len(numbers) / elapsed:,.0f}/s)")
+        assert numbers.itemsize == 8 and len(numbers) == 200_000
+        assert len(set(numbers)) == 200_000
+        assert all(n < 10 ** 8 for n in numbers)
+        assert generator.phone() not in {generator.format_phone(n) for n in numbers}
@@ -0,0 +1,109 @@
+"""Streaming JSON item parser and APIClient.stream_items tests (offline, local stub)"""
+
+import json
+import pytest
+from api.endpoints import Endpoints
+from utils.json_stream import JSONItemStream, iter_json_items
+
+
+def chunked(raw, size):
+    """Split bytes into fixed-size chunks to simulate socket reads"""
+    return [raw[i:i + size] for i in range(0, len(raw), size)]
+
+
+@pytest.mark.offline
+class TestJSONItemStream:
+    """Incremental parser correctness across arbitrary chunk boundaries"""
+
+    DOCUMENT = {
+        "success": True,
+        "message": "Techniques with \"data\" [brackets] {braces}, escapes \\",
+        "meta": {"data": [1, 2, 3]},
+        "data": [
+            {"id": "a", "values": [{"language_code": "en", "name": "Weaving"}],
+             "children": [{"id": "a1", "children": []}, {"id": "a2", "children": [{"id": "a2x"}]}]},
+            {"id": "b", "name": "quote \" and backslash \\ and ] , }", "unicode": "ہنر"},
+            "plain string",
+            42,
+            None,
+            [1, [2, 3]],
+        ],
+        "trailer": {"total": 6},
+    }
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64, 100000])
+    def test_items_match_full_parse(self, chunk_size):
+        """Every chunking of the document yields exactly the parsed data array"""
+        raw = json.dumps(self.DOCUMENT, ensure_ascii=False).encode()
+
+        items = list(iter_json_items(chunked(raw, chunk_size)))
+
+        assert items == self.DOCUMENT["data"]
+
+    def test_top_level_array_and_empty_array(self):
+        """key=None streams a bare array; an empty target array yields nothing"""
+        raw = json.dumps([{"id": 1}, {"id": 2}]).encode()
+        assert list(iter_json_items(chunked(raw, 5), key=None)) == [{"id": 1}, {"id": 2}]
+
+        stream = JSONItemStream()
+        assert stream.feed(b'{"success": true, "data": [ ]}') == []
+        assert stream.found and stream.finished
+
+    def test_missing_key_yields_nothing(self):
+        """Error envelopes without a data array produce no items"""
+        stream = JSONItemStream()
+        assert stream.feed(b'{"success": false, "message": "Unauthorized"}') == []
+        assert not stream.found
+
+    def test_buffer_stays_bounded(self):
+        """Consumed items are discarded so the buffer never holds the whole body"""
+        item = {"id": "x" * 36, "email": "test_artisan@test.com", "status": "pending_approval"}
+        raw = json.dumps({"success": True, "data": [item] * 5000}).encode()
+
+        stream = JSONItemStream()
+        largest = 0
+        count = 0
+        for chunk in chunked(raw, 4096):
+            count += len(stream.feed(chunk))
+            largest = max(largest, len(stream._buf))
+
+        print(f"   Body: {len(raw)} bytes, peak buffer: {largest} bytes")
+        assert count == 5000
+        assert largest < 4096 + 2 * len(json.dumps(item))
+
+
+@pytest.mark.offline
+class TestClientStreamItems:
+    """APIClient.stream_items against the local stub server"""
+
+    def test_stream_whitelist_stops_on_first_match(self, stub_client, stub_server):
+        """Searching streamed whitelist items stops as soon as the email matches"""
+        users = stub_server.seed_whitelist(200, email_prefix="stream_user")
+        target = users[3]["email"]
+        position = stub_server.whitelist.index(users[3]) + 1  # Other tests share the stub
+
+        seen = 0
+        found = None
+        params = {"limit": len(stub_server.whitelist)}
+        for user in stub_client.stream_items(Endpoints.WHITELIST_AUDIT, params=params):
+            seen += 1
+            if user.get("email") == target:
+                found = user
+                break
+
+        print(f"   Found {target} after {seen} items")
+        assert found["id"] == users[3]["id"]
+        assert seen == position
+
+    def test_stream_nested_techniques(self, stub_client, stub_server):
+        """Techniques with nested children stream as whole items"""
+        stub_server.seed_techniques(5, children=4)
+
+        techniques = list(stub_client.stream_items(Endpoints.TECHNIQUES, params={"limit": 5}))
+
+        assert len(techniques) == 5
+        assert all(len(t["children"]) == 4 for t in techniques)
+
+    def test_stream_non_200_yields_nothing(self, stub_client):
+        """Error responses are not streamed"""
+        assert list(stub_client.stream_items("/does-not-exist")) == []
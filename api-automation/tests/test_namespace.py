@@ -0,0 +1,82 @@
+"""Run-scoped namespace tests: generation, search scoping, product index and whitelist (offline)"""
+
+import pytest
+from utils.cleanup import CleanupLedger
+from utils.identity import IdentityGenerator
+from utils.journeys import ProductProvisioner
+from utils.namespace import Namespace, current_namespace
+from utils.product_index import ProductIndex
+from utils.stub_server import StubAPIServer
+from utils.user_manager import UserManager
+
+
+def make_namespace(tmp_path, run_id, worker_id="gw0"):
+    generator = IdentityGenerator(run_id=run_id, worker_id=worker_id,
+                                  ledger_path=str(tmp_path / "identity_ledger.json"))
+    return Namespace(run_id, generator=generator, enabled=True)
+
+
+@pytest.fixture
+def stub():
+    with StubAPIServer() as server:
+        yield server
+
+
+@pytest.fixture
+def admin_client(stub):
+    from api.client import APIClient
+    client = APIClient(base_url=stub.base_url)
+    client.request_delay = 0
+    client.set_auth_token("stub-admin-token")
+    return client
+
+
+@pytest.mark.offline
+class TestNamespace:
+    """Two concurrent runs never see each other's data"""
+
+    def test_generated_data_belongs_to_its_run_only(self, tmp_path):
+        ours, theirs = make_namespace(tmp_path, "a1b2c3"), make_namespace(tmp_path, "d4e5f6", "gw1")
+        values = [ours.email("test_artisan"), ours.name("Test Product", max_length=30), ours.slug("weaving")]
+
+        assert values[0].startswith("test_artisan_a1b2c3gw0x") and len(values[1]) <= 30
+        assert all(ours.owns(v) for v in values) and not any(theirs.owns(v) for v in values)
+        assert not ours.owns("Test Product 1700000000-ab12") and not ours.owns(None)
+        assert ours.search_params({"page": 1}, base="test_artisan") == {"page": 1, "search": "test_artisan_a1b2c3"}
+        assert ours.phone() != theirs.phone()  # Shared local identity ledger
+
+        shared = Namespace("a1b2c3", enabled=False)
+        assert shared.search_term("test_artisan") == "test_artisan" and shared.owns("anything")
+
+    def test_whitelist_search_ignores_other_runs(self, stub, admin_client):
+        register = admin_client.anonymous()
+        emails = [current_namespace().email("test_artisan"), "test_artisan_zzzzzzgw0x1@test.com"]
+        for i, email in enumerate(emails):
+            assert register.post("/auth/register", json={"f_name": "T", "l_name": "A", "phone": f"+88017000000{i}",
+                                                          "email": email, "password": "x"}).status_code == 201
+        stub.seed_whitelist(3)  # test_artisan_<n>@test.com, the old shared prefix
+
+        manager = UserManager(admin_client)
+        manager.admin_token = "stub-admin-token"
+        users = manager.find_recent_test_users_in_whitelist()
+
+        assert [u["email"] for u in users] == emails[:1]
+
+    def test_product_index_uses_and_provisions_own_products(self, stub, admin_client, tmp_path):
+        ours, theirs = make_namespace(tmp_path, "a1b2c3"), make_namespace(tmp_path, "d4e5f6")
+        stub.seed_products(5, status="pending_approval")                         # Someone else's, no namespace
+        stub.seed_products(3, status="pending_approval", name_prefix=theirs.name("Test"))
+        mine = stub.seed_products(2, status="pending_approval", name_prefix=ours.name("Test"))
+
+        ledger = CleanupLedger(str(tmp_path / "cleanup_ledger.json"))
+        index = ProductIndex(admin_client, namespace=ours, provision=ProductProvisioner(admin_client, ledger))
+        leased = [index.acquire("pending_approval") for _ in range(2)]
+        assert sorted(leased) == sorted(p["id"] for p in mine)
+
+        # Bucket exhausted: the provisioner onboards one artisan and creates products of this run
+        extra_pending = index.acquire("pending_approval")
+        approved = index.acquire("approved")
+        assert stub.find_product(extra_pending)["status"] == "pending_approval"
+        assert stub.find_product(approved)["status"] == "approved"
+        assert current_namespace().owns(stub.find_product(approved)["name"])
+        assert sorted(e["kind"] for e in ledger.pending()) == ["artisan", "product", "product"]
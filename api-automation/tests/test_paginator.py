@@ -0,0 +1,87 @@
+"""Paginator tests against the local stub server (offline)"""
+
+import threading
+import uuid
+from types import SimpleNamespace
+import pytest
+from api.endpoints import Endpoints
+from api.paginator import Paginator
+from utils.stub_server import envelope, paginate
+
+
+@pytest.mark.offline
+@pytest.mark.pagination
+class TestPaginator:
+    """Auto-pagination and concurrent prefetch"""
+
+    def test_collects_every_page(self, stub_client, stub_server):
+        """All seeded products come back exactly once, in order"""
+        prefix = f"Pager {uuid.uuid4().hex[:6]}"
+        seeded = stub_server.seed_products(47, name_prefix=prefix)
+
+        paginator = Paginator(stub_client, Endpoints.PRODUCTS, params={"search": prefix}, limit=10)
+        products = list(paginator)
+
+        assert [p["id"] for p in products] == [p["id"] for p in seeded]
+        assert paginator.pages_fetched == 5
+        assert paginator.pagination["total"] == 47
+
+    def test_first_stops_early(self, stub_client, stub_server):
+        """first() stops requesting pages once the predicate matches"""
+        prefix = f"Early {uuid.uuid4().hex[:6]}"
+        seeded = stub_server.seed_products(100, name_prefix=prefix)
+        target = seeded[12]["id"]
+
+        paginator = Paginator(stub_client, Endpoints.PRODUCTS, params={"search": prefix},
+                              limit=10, prefetch=1)
+        found = paginator.first(lambda p: p["id"] == target)
+
+        assert found["id"] == target
+        assert paginator.pages_fetched == 2
+
+    def test_prefetch_overlaps_round_trips(self, stub_client, stub_server):
+        """With prefetch several page requests are in flight at once; without it, one at a time"""
+        prefix = f"Prefetch {uuid.uuid4().hex[:6]}"
+        stub_server.seed_products(120, name_prefix=prefix)
+        lock = threading.Lock()
+
+        def crawl(prefetch):
+            in_flight = {"now": 0, "peak": 0}
+
+            def get(*args, **kwargs):
+                with lock:
+                    in_flight["now"] += 1
+                    in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+                try:
+                    return stub_client.get(*args, **kwargs)
+                finally:
+                    with lock:
+                        in_flight["now"] -= 1
+            paginator = Paginator(SimpleNamespace(get=get), Endpoints.PRODUCTS, params={"search": prefix},
+                                  limit=10, prefetch=prefetch)
+            return list(paginator), in_flight["peak"]
+
+        stub_server.latency = 0.05  # Keeps prefetched requests open long enough to overlap
+        try:
+            serial, serial_peak = crawl(prefetch=0)
+            parallel, parallel_peak = crawl(prefetch=6)
+        finally:
+            stub_server.latency = 0.0
+
+        print(f"   Requests in flight: serial {serial_peak}, prefetch=6: {parallel_peak}")
+        assert parallel == serial and len(serial) == 120
+        assert serial_peak == 1 and parallel_peak >= 3
+
+    def test_has_next_without_total_pages(self, stub_client, stub_server):
+        """Listings that only report has_next are still crawled to the end"""
+        items = [{"id": i} for i in range(23)]
+
+        @stub_server.route("GET", "/has-next-only")
+        def has_next_only(request):
+            page, meta = paginate(items, request.query)
+            del meta["pagination"]["total_pages"]
+            return 200, envelope(page, meta=meta)
+
+        collected = list(Paginator(stub_client, "/has-next-only", limit=5, prefetch=3))
+
+        assert collected == items
@@ -0,0 +1,50 @@
+"""Payload-size scaling benchmark tests against a local stub server (offline)"""
+
+import time
+import pytest
+from api.client import APIClient
+from perf.payload_scaling import PayloadScalingBenchmark, sweep_sizes
+from perf.stats import linear_fit, power_fit
+from utils.stub_server import PRODUCT_LIMITS, StubAPIServer, envelope, validation_error
+
+
+@pytest.fixture
+def scaling_client():
+    """Client of a stub whose POST /products costs 0.2ms per material and enforces the limits"""
+    with StubAPIServer() as server:
+        @server.route("POST", "/products")
+        def create_product(request):
+            data = request.json()
+            for field, limit in PRODUCT_LIMITS.items():
+                if len(data.get(field) or []) > limit:
+                    return validation_error(field, f"{field} must contain at most {limit} items")
+            time.sleep(0.0002 * len(data.get("materials") or []))
+            return 201, envelope({"id": "p-1", "name": data["name"]})
+
+        client = APIClient(base_url=server.base_url)
+        client.request_delay = 0
+        yield client
+
+
+@pytest.mark.offline
+class TestPayloadScaling:
+    """Sweeps reach past the limits and the fits find the expensive dimension"""
+
+    def test_fits_and_sweep_sizes(self):
+        assert linear_fit([1, 2, 3, 4], [3, 5, 7, 9]) == (1.0, 2.0, 1.0)
+        coefficient, exponent, r2 = power_fit([1, 2, 4, 8], [0.5, 2, 8, 32])
+        assert abs(coefficient - 0.5) < 1e-9 and abs(exponent - 2) < 1e-9 and r2 == 1.0
+        assert sweep_sizes(15) == [1, 2, 5, 10, 15, 16, 30]
+        assert sweep_sizes(100, beyond=False) == [1, 2, 5, 10, 20, 50, 100]
+
+    def test_benchmark_ranks_the_dimension_that_costs_latency(self, scaling_client):
+        report = PayloadScalingBenchmark(scaling_client, repeats=1, track=False).run(["files", "materials"])
+
+        materials, files = report["dimensions"]["materials"], report["dimensions"]["files"]
+        assert report["ranking"] == ["materials", "files"]
+        assert 0.1 < materials["fit"]["ms_per_item"] < 0.6 and materials["fit"]["shape"] == "linear"
+        assert files["fit"]["shape"] == "flat"
+        assert materials["fit"]["limit_enforced"] and materials["fit"]["largest_accepted"] == 100
+        assert [p["statuses"] for p in files["points"][-2:]] == [{"422": 1}, {"422": 1}]
+        sizes = [p["request_bytes"] for p in materials["points"]]
+        assert sizes == sorted(sizes) and materials["fit"]["bytes_per_item"] > 40
@@ -0,0 +1,92 @@
+"""Copy-on-write payload template tests (offline, no API calls)"""
+
+import copy
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from config.test_data_product_creation import ProductTestData
+from utils.payload_template import PayloadTemplate, REMOVE, thaw
+
+
+@pytest.mark.offline
+class TestPayloadTemplate:
+    """Frozen templates, path patches and structural sharing"""
+
+    @pytest.fixture
+    def template(self):
+        return PayloadTemplate({
+            "name": "base",
+            "materials": [{"name": "Cotton", "price": 20.5}, {"name": "Silk", "price": 40.0}],
+            "measurements": [{"size": "Standard"}],
+        })
+
+    def test_patch_copies_only_the_patched_path(self, template):
+        """Siblings of the patched path are shared, the template itself is untouched"""
+        payload = template.build({"materials.0.price": 10.0}, name="patched")
+
+        assert payload["name"] == "patched"
+        assert payload["materials"][0]["price"] == 10.0
+        assert template.get("materials.0.price") == 20.5
+        assert payload["materials"][1] is template.base["materials"][1]
+        assert payload["measurements"] is template.base["measurements"]
+
+    def test_nested_data_is_read_only(self, template):
+        """Nested containers reject mutation; the root stays an ordinary dict"""
+        payload = template.build()
+        payload["name"] = "top-level edits are fine"
+        del payload["measurements"]
+
+        with pytest.raises(TypeError):
+            payload["materials"][0]["price"] = 1
+        with pytest.raises(TypeError):
+            payload["materials"][0].update(price=1)
+        assert copy.deepcopy(payload)["materials"] is payload["materials"]
+        assert thaw(payload)["materials"][0] == {"name": "Cotton", "price": 20.5}
+
+    def test_remove_append_and_serialise(self, template):
+        """REMOVE deletes, index == length appends, output serialises like plain JSON"""
+        payload = template.build({
+            "materials.1": REMOVE,
+            "measurements.1": {"size": "Large"},
+            "extra.flag": True,
+        }, name=REMOVE)
+
+        assert json.loads(json.dumps(payload)) == {
+            "materials": [{"name": "Cotton", "price": 20.5}],
+            "measurements": [{"size": "Standard"}, {"size": "Large"}],
+            "extra": {"flag": True},
+        }
+
+    def test_product_factory(self):
+        """get_valid_product_payload keeps its override/remove_field behaviour"""
+        first = ProductTestData.get_valid_product_payload(status="pending", remove_field="files")
+        second = ProductTestData.get_valid_product_payload({"materials.0.price": 1.0})
+
+        assert first["status"] == "pending" and "files" not in first and "remove_field" not in first
+        assert first["name"] != "Test Product" and len(first["name"]) <= 30
+        assert second["materials"][0]["price"] == 1.0
+        assert ProductTestData.VALID_PRODUCT_TEMPLATE.get("materials.0.price") == 20.5
+        assert first["techniques"] is second["techniques"]
+
+    def test_concurrent_builds(self, template):
+        """Threads patching the same template never see each other's values"""
+        def build(i):
+            return template.build({"materials.0.price": i})["materials"][0]["price"]
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            assert list(pool.map(build, range(2000))) == list(range(2000))
+
+    @pytest.mark.performance
+    def test_build_throughput(self):
+        """Building product payloads for load runs is cheap"""
+        template = ProductTestData.VALID_PRODUCT_TEMPLATE
+        count = 100_000
+
+        start = time.perf_counter()
+        for i in range(count):
+            template.build({"materials.0.quantity": i}, name=f"Load {i}")
+        elapsed = time.perf_counter() - start
+
+        print(f"   Built {count} payloads in {elapsed:.2f}s ({count / elapsed:,.0f}/s)")
+        assert elapsed < 5.0
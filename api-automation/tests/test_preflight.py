@@ -0,0 +1,53 @@
+"""Preflight readiness check tests against local stub servers and a dead port (offline)"""
+
+import socket
+import pytest
+from utils.preflight import Preflight, print_report, recommend_concurrency
+from utils.stub_server import StubAPIServer
+
+
+def dead_url():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}/api/v1"
+
+
+@pytest.mark.offline
+class TestPreflight:
+    """Readiness, baseline latency and concurrency recommendation"""
+
+    def test_ready_environment(self, stub_server):
+        report = Preflight(stub_server.base_url,
+                           roles={"admin": (stub_server.admin_identifier, stub_server.admin_password)}).run()
+        print_report(report)
+
+        checks = {c["name"]: c for c in report["checks"]}
+        assert report["ok"] and report["reason"] is None
+        assert checks["health"]["ok"] and checks["health"]["latency"] < 0.5
+        assert checks["login:admin"]["ok"] and checks["list:products"]["ok"] and checks["list:whitelist"]["ok"]
+        assert not checks["status"]["ok"] and not checks["status"]["required"]  # Optional: stub has no /status
+        assert report["elapsed"] < 2
+
+    def test_failed_login_skips_listings(self, stub_server):
+        report = Preflight(stub_server.base_url, roles={"admin": ("admin", "wrong")}).run()
+
+        checks = {c["name"]: c for c in report["checks"]}
+        assert not report["ok"] and report["reason"].startswith("login:admin: HTTP 401")
+        assert checks["list:products"]["error"] == "no admin token (login failed)"
+        assert report["recommended_concurrency"] == 1
+
+    def test_dead_environment_fails_in_well_under_a_second(self):
+        report = Preflight(dead_url(), roles={"admin": ("admin", "admin123")}).run()
+
+        assert not report["ok"] and "health: ConnectionError" in report["reason"]
+        assert report["elapsed"] < 1
+
+    def test_slow_environment_lowers_concurrency(self):
+        with StubAPIServer(latency=0.15) as stub:
+            report = Preflight(stub.base_url, roles={"admin": (stub.admin_identifier, stub.admin_password)}).run()
+
+        assert report["ok"]
+        assert recommend_concurrency(report, maximum=8, slow=1.0) == 8
+        assert recommend_concurrency(report, maximum=8, slow=0.25) == 4
+        assert recommend_concurrency(report, maximum=8, slow=0.1) == 1
@@ -54,9 +54,11 @@ class TestProductApprovalAPI:
         return None
 
     @pytest.fixture(autouse=True)
-    def setup_admin_auth(self, api_client):
+    def setup_admin_auth(self, api_client, product_index):
         """Set up admin authentication before every test"""
         self.client = api_client
+        self.product_index = product_index
+        self.leased_ids = []
 
         admin_token = self.get_admin_auth_token(api_client)
         if admin_token:
@@ -66,79 +68,53 @@ class TestProductApprovalAPI:
             print("   ❌ Could not get admin token")
             api_client.clear_auth_token()
 
+        yield
+
+        # Hand back any product this test leased but did not change
+        for product_id in self.leased_ids:
+            self.product_index.release(product_id)
+
     # ── Product Lookup Helpers ─────────────────────────────────────────────────
 
-    def get_pending_product_id(self):
-        """Return the ID of a product in 'pending_approval' state"""
-        print("   Finding pending product for testing...")
+    def acquire_product_id(self, status, label):
+        """Lease a product in the given status from the session product index"""
+        print(f"   Finding {label} product for testing...")
 
-        params = {"page": 1, "limit": 10, "status": "pending_approval"}
-        response = self.client.get(Endpoints.PRODUCTS, params=params)
+        product_id = self.product_index.acquire(status)
+        if product_id:
+            self.leased_ids.append(product_id)
+            print(f"   ✓ Found {label} product: {self.product_index.name(product_id)} (ID: {product_id})")
+            return product_id
 
-        if response.status_code == 200:
-            data = response.json()
-            for product in data.get("data", []):
-                if product.get("status") == "pending_approval":
-                    product_id = product.get("id")
-                    name = product.get("name", "N/A")
-                    print(f"   ✓ Found pending product: {name} (ID: {product_id})")
-                    return product_id
-
-        print("   ⚠ No pending products found")
+        print(f"   ⚠ No {label} products found")
         return None
 
-    def get_approved_product_id(self):
-        """Return the ID of an already-approved product"""
-        print("   Finding approved product for testing...")
+    def patch_status(self, data):
+        """PATCH the product status and keep the product index in sync"""
+        response = self.client.patch(Endpoints.PRODUCT_STATUS, json=data)
+        self.product_index.record_response(data, response)
+        return response
 
-        params = {"page": 1, "limit": 10, "status": "approved"}
-        response = self.client.get(Endpoints.PRODUCTS, params=params)
+    def get_pending_product_id(self):
+        """Return the ID of a product in 'pending_approval' state"""
+        return self.acquire_product_id("pending_approval", "pending")
 
-        if response.status_code == 200:
-            data = response.json()
-            for product in data.get("data", []):
-                if product.get("status") == "approved":
-                    product_id = product.get("id")
-                    name = product.get("name", "N/A")
-                    print(f"   ✓ Found approved product: {name} (ID: {product_id})")
-                    return product_id
-
-        print("   ⚠ No approved products found")
-        return None
+    def get_approved_product_id(self):
+        """Return the ID of an already-approved product"""
+        return self.acquire_product_id("approved", "approved")
 
     def get_rejected_product_id(self):
         """Return the ID of a previously rejected product"""
-        print("   Finding rejected product for testing...")
-
-        params = {"page": 1, "limit": 10, "status": "rejected"}
-        response = self.client.get(Endpoints.PRODUCTS, params=params)
-
-        if response.status_code == 200:
-            data = response.json()
-            for product in data.get("data", []):
-                if product.get("status") == "rejected":
-                    product_id = product.get("id")
-                    name = product.get("name", "N/A")
-                    print(f"   ✓ Found rejected product: {name} (ID: {product_id})")
-                    return product_id
-
-        print("   ⚠ No rejected products found")
-        return None
+        return self.acquire_product_id("rejected", "rejected")
 
     def get_any_product_id(self):
         """Return any product ID (used for generic validation tests)"""
-        print("   Finding any product for validation testing...")
-
-        params = {"page": 1, "limit": 10}
-        response = self.client.get(Endpoints.PRODUCTS, params=params)
-
-        if response.status_code == 200:
-            data = response.json()
-            products = data.get("data", [])
-            if products:
-                product_id = products[0].get("id")
-                name = products[0].get("name", "N/A")
-                print(f"   ✓ Found product: {name} (ID: {product_id})")
+        # Prefer already-decided products so pending ones stay available
+        for status in ("approved", "rejected", "pending_approval"):
+            product_id = self.product_index.acquire(status)
+            if product_id:
+                self.leased_ids.append(product_id)
+                print(f"   ✓ Found product: {self.product_index.name(product_id)} (ID: {product_id})")
                 return product_id
 
         print("   ⚠ No products found")
@@ -195,7 +171,7 @@ class TestProductApprovalAPI:
         print(f"   Request data: {json.dumps(data, indent=6)}")
 
         start_time = time.time()
-        response = self.client.patch(Endpoints.PRODUCT_STATUS, json=data)
+        response = self.patch_status(data)
         response_time = time.time() - start_time
 
         # ── Parse response body ───────────────────────────────────────────────
@@ -303,7 +279,7 @@ class TestProductApprovalAPI:
         print(f"   Approving product: {pending_product_id}")
         print(f"   Approval data: {json.dumps(approval_data, indent=6)}")
 
-        response = self.client.patch(Endpoints.PRODUCT_STATUS, json=approval_data)
+        response = self.patch_status(approval_data)
 
         if response.status_code == 200:
             response_data = response.json()
@@ -342,13 +318,11 @@ class TestProductApprovalAPI:
         print("\n▶ Testing product approval performance...")
 
         pending_products = []
-        params = {"page": 1, "limit": 5, "status": "pending_approval"}
-        response = self.client.get(Endpoints.PRODUCTS, params=params)
-
-        if response.status_code == 200:
-            for product in response.json().get("data", []):
-                if product.get("status") == "pending_approval":
-                    pending_products.append(product.get("id"))
+        for _ in range(2):
+            product_id = self.get_pending_product_id()
+            if not product_id:
+                break
+            pending_products.append(product_id)
 
         if len(pending_products) < 2:
             print("   ⚠ Skipping: Need at least 2 pending products for performance test")
@@ -364,7 +338,7 @@ class TestProductApprovalAPI:
             }
 
             start_time = time.time()
-            response = self.client.patch(Endpoints.PRODUCT_STATUS, json=approval_data)
+            response = self.patch_status(approval_data)
             response_time = time.time() - start_time
 
             if response.status_code == 200:
@@ -464,7 +438,7 @@ class TestProductApprovalAPI:
         for case in inline_cases:
             print(f"   Testing: {case['name']}")
 
-            response = self.client.patch(Endpoints.PRODUCT_STATUS, json=case["data"])
+            response = self.patch_status(case["data"])
             status_match = response.status_code == case["expected_status"]
 
             if status_match:
@@ -523,7 +497,7 @@ class TestProductApprovalAPI:
             "status": "approved",
             "reason": "Integration test — initial approval",
         }
-        approve_response = self.client.patch(Endpoints.PRODUCT_STATUS, json=approve_data)
+        approve_response = self.patch_status(approve_data)
 
         if approve_response.status_code != 200:
             print(f"   ❌ Approval failed: {approve_response.status_code}")
@@ -548,7 +522,7 @@ class TestProductApprovalAPI:
             "status": "rejected",
             "reason": "Integration test — changed to rejected",
         }
-        reject_response = self.client.patch(Endpoints.PRODUCT_STATUS, json=reject_data)
+        reject_response = self.patch_status(reject_data)
 
         if reject_response.status_code == 200:
             print("   ✓ Product rejected successfully")
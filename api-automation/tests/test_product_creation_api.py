@@ -847,13 +847,14 @@ import pytest
 import time
 import uuid
 from datetime import datetime
-from test_data_product_creation import ProductTestData
+from config.test_data_product_creation import ProductTestData
+from utils.cleanup import CreatedEntities
 
 
 class TestArtisanProductCreation:
     """Test suite for Product Creation API - Organized by scenarios"""
     
-    created_products = []
+    created_products = CreatedEntities("product")  # Recorded for the cleanup reaper
     
     @classmethod
     def setup_class(cls):
@@ -1130,7 +1131,7 @@ class TestArtisanProductCreation:
         print(f"\n🔵 SCENARIO 9: Techniques validation - {techniques_config['name']}")
         
         payload = self.get_valid_payload()
-        payload["techniques"] = techniques_config["techniques"]
+        payload["techniques"] = ProductTestData.resolve(techniques_config["techniques"])
         
         response = self.client.post("/products", json=payload)
         print(f"   Status: {response.status_code}")
@@ -1157,7 +1158,7 @@ class TestArtisanProductCreation:
         print(f"\n🔵 SCENARIO 10: Files validation - {files_config['name']}")
         
         payload = self.get_valid_payload()
-        payload["files"] = files_config["files"]
+        payload["files"] = ProductTestData.resolve(files_config["files"])
         
         response = self.client.post("/products", json=payload)
         print(f"   Status: {response.status_code}")
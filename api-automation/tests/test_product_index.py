@@ -0,0 +1,106 @@
+"""Session product index tests against the local stub server (offline)"""
+
+from types import SimpleNamespace
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from api.endpoints import Endpoints
+from utils.product_index import ProductIndex
+
+
+@pytest.fixture
+def admin_stub_client(stub_client):
+    """Stub client authenticated as admin"""
+    stub_client.set_auth_token("stub-admin-token")
+    return stub_client
+
+
+@pytest.fixture
+def isolated_stub(stub_server):
+    """Give each test its own product set on the shared stub"""
+    saved = stub_server.products
+    stub_server.products = []
+    yield stub_server
+    stub_server.products = saved
+
+
+@pytest.mark.offline
+class TestProductIndex:
+    """Leasing, status tracking and worker partitioning"""
+
+    def test_single_crawl_and_unique_leases(self, admin_stub_client, isolated_stub):
+        """Concurrent acquires never return the same id and list each status only once"""
+        isolated_stub.seed_products(60, status="pending_approval")
+        isolated_stub.seed_products(5, status="approved")
+        index = ProductIndex(admin_stub_client)
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            leased = list(pool.map(lambda _: index.acquire("pending_approval"), range(60)))
+
+        assert None not in leased
+        assert len(set(leased)) == 60
+        assert index.acquire("pending_approval") is None
+        assert index.acquire("approved") is not None
+        # 60 pending at limit 50 -> 2 pages, 5 approved -> 1 page
+        assert index.listing_requests == 3
+
+    def test_patch_results_update_the_index(self, admin_stub_client, isolated_stub):
+        """A successful approval moves the product to the approved bucket"""
+        isolated_stub.seed_products(1, status="pending_approval")
+        index = ProductIndex(admin_stub_client)
+
+        product_id = index.acquire("pending_approval")
+        payload = {"product_id": product_id, "status": "approved", "reason": "Index test"}
+        response = admin_stub_client.patch(Endpoints.PRODUCT_STATUS, json=payload)
+        index.record_response(payload, response)
+
+        assert response.status_code == 200
+        assert index.counts() == {"approved": 1}
+        assert index.acquire("approved") == product_id
+
+    def test_failed_patch_keeps_status(self, admin_stub_client, isolated_stub):
+        """A rejected PATCH leaves the index untouched and release() re-offers the id"""
+        isolated_stub.seed_products(1, status="pending_approval")
+        index = ProductIndex(admin_stub_client)
+
+        product_id = index.acquire("pending_approval")
+        payload = {"product_id": product_id, "status": "archived"}
+        response = admin_stub_client.patch(Endpoints.PRODUCT_STATUS, json=payload)
+        index.record_response(payload, response)
+        index.release(product_id)
+
+        assert response.status_code == 422
+        assert index.acquire("pending_approval") == product_id
+
+    def test_failed_crawl_is_retried(self, admin_stub_client, isolated_stub):
+        """A listing error does not leave the status empty for the rest of the session"""
+        isolated_stub.seed_products(2, status="approved")
+
+        def reset(*args, **kwargs):
+            raise ConnectionError("reset by peer")
+        index = ProductIndex(admin_stub_client)
+        index.client = SimpleNamespace(get=reset)
+        with pytest.raises(ConnectionError):
+            index.acquire("approved")
+        index.client = SimpleNamespace(get=lambda *args, **kwargs: SimpleNamespace(status_code=503))
+        assert index.acquire("approved") is None
+
+        index.client = admin_stub_client
+        assert index.acquire("approved") is not None
+
+    def test_worker_partitions_are_disjoint(self, admin_stub_client, isolated_stub):
+        """xdist workers see disjoint slices that together cover every product"""
+        seeded = {p["id"] for p in isolated_stub.seed_products(40, status="approved")}
+
+        seen = []
+        for worker_index in range(2):
+            index = ProductIndex(admin_stub_client, worker_index=worker_index, worker_count=2)
+            ids = set()
+            while True:
+                product_id = index.acquire("approved")
+                if product_id is None:
+                    break
+                ids.add(product_id)
+            seen.append(ids)
+
+        assert not seen[0] & seen[1]
+        assert seen[0] | seen[1] == seeded
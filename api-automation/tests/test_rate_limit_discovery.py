@@ -0,0 +1,130 @@
+"""Rate-limit discovery and per-endpoint limiter profile tests (offline)"""
+
+import time
+from email.utils import formatdate
+import pytest
+from api.client import APIClient
+from api.endpoints import Endpoints
+from api.rate_limiter import EndpointRateLimiter, RateLimiter, load_profile
+from perf.rate_limit_discovery import ENDPOINT_GROUPS, RateLimitDiscovery, parse_retry_after, write_profile
+from utils.stub_server import StubAPIServer
+
+
+@pytest.fixture(scope="module")
+def limited_stub():
+    """Auth allows 8 requests per 0.25s window (no Retry-After); techniques are unlimited"""
+    with StubAPIServer() as server:
+        server.rate_limit("/auth", limit=8, window=0.25, retry_after=False)
+        yield server
+
+
+def make_client(stub):
+    client = APIClient(base_url=stub.base_url)
+    client.register_role("admin", token="stub-admin-token")
+    return client
+
+
+@pytest.mark.offline
+class TestRateLimitDiscovery:
+    """Stub 429 mode, threshold search and the limiter profile round trip"""
+
+    def test_stub_answers_429_with_retry_after(self):
+        with StubAPIServer() as stub:
+            stub.rate_limit("/health", limit=3, window=2)
+            client = APIClient(base_url=stub.base_url)
+            client.request_delay = 0
+
+            codes = [client.get(Endpoints.HEALTH) for _ in range(5)]
+            other = client.get(Endpoints.PRODUCTS)
+
+        assert [r.status_code for r in codes][:3] == [200] * 3 and codes[-1].status_code == 429
+        assert 0 < int(codes[-1].headers["Retry-After"]) <= 2
+        assert other.status_code == 200
+
+    def test_parse_retry_after(self):
+        assert parse_retry_after("7") == 7.0
+        assert parse_retry_after(None) is None and parse_retry_after("soon") is None
+        assert 28 <= parse_retry_after(formatdate(time.time() + 30, usegmt=True)) <= 30
+
+    def test_discovers_burst_window_and_rate(self, limited_stub):
+        """Burst and window come from the 429s; the rate search lands near 8 / 0.25s = 32/s"""
+        discovery = RateLimitDiscovery(make_client(limited_stub), start_rate=8, max_rate=64, precision=0.25,
+                                       min_probe=0.5, poll_interval=0.02)
+
+        entry = discovery.discover("auth", ENDPOINT_GROUPS["auth"])
+        found = entry["discovered"]
+        print(f"   discovered: {found}")
+
+        assert entry["limited"] and found["burst"] == 8
+        assert found["retry_after"] is None and 0.2 <= found["window"] <= 0.3
+        assert 16 <= found["sustained_rate"] <= 40
+        assert entry["rate"] == pytest.approx(found["sustained_rate"] * 0.8, rel=0.01) and entry["burst"] == 6
+
+    def test_unlimited_group(self, limited_stub):
+        discovery = RateLimitDiscovery(make_client(limited_stub), max_burst=50)
+
+        served = limited_stub.request_count
+        entry = discovery.discover("techniques", ENDPOINT_GROUPS["techniques"])
+
+        assert not entry["limited"] and entry["rate"] is None
+        assert entry["discovered"]["requests"] == 51 == limited_stub.request_count - served  # All reached the stub
+
+    def test_cached_collection_limit_is_found(self):
+        """The HTTP cache (on by default for techniques) must not answer the discovery probes"""
+        with StubAPIServer() as stub:
+            stub.rate_limit("/techniques", limit=5, window=0.25, retry_after=False)
+            discovery = RateLimitDiscovery(make_client(stub), max_burst=50, start_rate=10, max_rate=40,
+                                           precision=0.5, min_probe=0.3, poll_interval=0.02, max_wait=5)
+            entry = discovery.discover("techniques", ENDPOINT_GROUPS["techniques"])
+
+        assert entry["limited"] and entry["discovered"]["burst"] == 5
+
+    def test_every_scheduled_probe_reaches_the_server(self):
+        """Concurrent identical GET probes are sent, not coalesced into one, so the rate is not overstated"""
+        with StubAPIServer(latency=0.03) as stub:
+            stub.rate_limit("/products", limit=5, window=0.25, retry_after=False)
+            discovery = RateLimitDiscovery(make_client(stub), start_rate=10, max_rate=40, precision=0.25,
+                                           min_probe=0.5, poll_interval=0.02)
+            served = stub.request_count
+            entry = discovery.discover("products", ENDPOINT_GROUPS["products"])
+
+            assert discovery.requests == stub.request_count - served
+        assert entry["limited"] and entry["discovered"]["sustained_rate"] <= 26  # 5 per 0.25s = 20/s
+
+    def test_profile_drives_per_endpoint_limits(self, tmp_path, limited_stub):
+        """A written profile paces its group's endpoints; other endpoints use the default limiter"""
+        path = tmp_path / "rate_limits.json"
+        write_profile({"groups": {
+            "auth": {"prefixes": ["/auth/login", "/auth/register"], "rate": 20, "burst": 1},
+            "techniques": {"prefixes": ["/techniques/"], "rate": None, "burst": None},
+        }}, path)
+
+        limiter = load_profile(str(path), default=RateLimiter())
+        assert isinstance(limiter, EndpointRateLimiter)
+        assert limiter.limiter_for("/auth/login/").rate == 20
+        assert limiter.limiter_for(Endpoints.TECHNIQUES) is limiter.default
+        assert limiter.limiter_for("/auth/loginx") is limiter.default
+        assert load_profile(str(tmp_path / "missing.json")) is None
+
+        client = make_client(limited_stub)
+        client.request_delay = 0
+        client.rate_limiter = limiter
+        start = time.perf_counter()
+        for _ in range(5):
+            client.get(Endpoints.HEALTH)
+        unpaced = time.perf_counter() - start
+        start = time.perf_counter()
+        for _ in range(5):
+            client.post(Endpoints.LOGIN, json={"identifier": "x", "password": "y"})
+        paced = time.perf_counter() - start
+
+        assert unpaced < 0.1 and paced >= 4 / 20 * 0.9
+
+    def test_profile_groups_stay_under_the_global_cap(self, tmp_path):
+        """A generous group limit does not lift RATE_LIMIT_RPS for its endpoints"""
+        path = tmp_path / "rate_limits.json"
+        write_profile({"groups": {"auth": {"prefixes": ["/auth/login"], "rate": 1000, "burst": 10}}}, path)
+        limiter = load_profile(str(path), default=RateLimiter(20, burst=1))
+
+        waits = [limiter.reserve("/auth/login") for _ in range(5)]
+        assert waits[0] == 0 and waits[-1] >= 4 / 20 * 0.9
@@ -0,0 +1,78 @@
+"""Reference data snapshot tests against a local stub server (offline)"""
+
+import pytest
+from api.client import APIClient
+from config.test_data_product_creation import ProductTestData
+from utils.reference_data import FALLBACK, FILE, TECHNIQUE, ReferenceDataLoader, load_reference_data
+from utils.stub_server import StubAPIServer, envelope
+
+
+@pytest.fixture
+def stub():
+    with StubAPIServer() as server:
+        yield server
+
+
+def load(stub, tmp_path, **kwargs):
+    return load_reference_data(stub.base_url, stub.admin_identifier, stub.admin_password,
+                               path=str(tmp_path / "reference_data.json"), **kwargs)
+
+
+@pytest.mark.offline
+class TestReferenceData:
+    """Live ids once per session, cached per environment, never worse than the built-in ids"""
+
+    def test_snapshot_keeps_usable_entries_and_is_cached(self, stub, tmp_path):
+        techniques = stub.seed_techniques(2, children=1)
+        stub.techniques.append({"id": "test-id-1", "is_active": True})
+        stub.techniques.append({"id": "6a0b3a8e-4a4e-4a5e-9d3c-2f1d9d1b6c11", "is_active": False})
+        files = stub.seed_files(1)
+        stub.seed_files(1, is_active=False)
+        stub.seed_units("kg", "pcs")
+
+        snapshot = load(stub, tmp_path)
+        assert snapshot.values["techniques"] == [techniques[0]["id"], techniques[0]["children"][0]["id"],
+                                                 techniques[1]["id"], techniques[1]["children"][0]["id"]]
+        assert snapshot.values["files"] == [files[0]["id"]] and snapshot.values["units"] == ["kg", "pcs"]
+        assert set(snapshot.sources.values()) == {"live"} and not snapshot.errors
+
+        sent = stub.request_count
+        cached = load(stub, tmp_path)
+        assert cached.values == snapshot.values and set(cached.sources.values()) == {"cache"}
+        assert stub.request_count == sent + 1  # Only the login; the collections came from the file
+
+    def test_failed_collections_fall_back_per_collection(self, stub, tmp_path):
+        stub.seed_techniques(1)
+        stub.seed_units("kg")
+        first = load(stub, tmp_path)
+        assert first.sources["files"] == "fallback" and first.values["files"] == FALLBACK["files"]
+
+        stub.seed_files(1)
+
+        @stub.route("GET", "/techniques")
+        def broken(request):
+            return 500, envelope(message="Internal error", success=False)
+
+        second = load(stub, tmp_path, refresh=True)
+        assert second.sources == {"techniques": "stale cache", "files": "live", "units": "live"}
+        assert second.values["techniques"] == first.values["techniques"]
+        assert second.errors == {"techniques": "HTTP 500"}
+
+        loader = ReferenceDataLoader(APIClient(base_url=stub.base_url), path=str(tmp_path / "reference_data.json"))
+        assert loader.cached()["values"] == second.values  # Live files merged into the earlier entry
+
+    def test_payload_factories_use_the_snapshot(self, stub, tmp_path, monkeypatch):
+        technique = stub.seed_techniques(1)[0]
+        file = stub.seed_files(1)[0]
+        stub.seed_units("pcs")
+        monkeypatch.setattr(ProductTestData, "REFERENCE", ProductTestData.REFERENCE)
+        monkeypatch.setattr(ProductTestData, "VALID_PRODUCT_TEMPLATE", ProductTestData.VALID_PRODUCT_TEMPLATE)
+
+        ProductTestData.use_reference(load(stub, tmp_path))
+        payload = ProductTestData.get_valid_product_payload()
+
+        assert list(payload["techniques"]) == [{"id": technique["id"], "deleted": False}]
+        assert list(payload["files"]) == [{"id": file["id"], "is_active": True, "deleted": False}]
+        assert payload["materials"][0]["unit"] == "pcs" and payload["materials"][0]["price"] == 20.5
+        assert ProductTestData.resolve([{"id": TECHNIQUE[0]}, {"id": FILE[3]}]) == [
+            {"id": technique["id"]}, {"id": file["id"]}]
@@ -3,11 +3,10 @@
 
 import pytest
 import time
-import random
-import uuid
 import json
 from api.client import APIClient
 from api.endpoints import Endpoints
+from config.register_test_data import generate_unique_email, generate_unique_phone
 
 class TestRegistrationClean:
     """Clean registration tests with independent execution"""
@@ -20,9 +19,8 @@ class TestRegistrationClean:
     def generate_unique_data(self, test_name=""):
         """Generate unique test data"""
         timestamp = int(time.time() * 1000)
-        random_id = uuid.uuid4().hex[:6]
-        phone = f"+88017{''.join([str(random.randint(0, 9)) for _ in range(8)])}"
-        email = f"test_{test_name}_{timestamp}_{random_id}@test.com"
+        phone = generate_unique_phone()
+        email = generate_unique_email(f"test_{test_name}")
         return {
             "phone": phone,
             "email": email,
@@ -204,7 +202,7 @@ class TestRegistrationClean:
         print("✅ First user created")
         
         # Try to create duplicate with different phone
-        new_phone = f"+88017{''.join([str(random.randint(0, 9)) for _ in range(8)])}"
+        new_phone = generate_unique_phone()
         duplicate_user = {
             "f_name": "Duplicate",
             "l_name": "User",
@@ -0,0 +1,82 @@
+"""Open-model scheduler tests against a dedicated local stub server (offline)"""
+
+import time
+import pytest
+from api.async_client import AsyncAPIClient
+from api.client import APIClient
+from perf.scheduler import (OpenModelScheduler, constant_arrivals, poisson_arrivals, print_report,
+                            run_open_model, step_arrivals)
+from utils.stub_server import StubAPIServer, envelope
+
+
+@pytest.fixture(scope="module")
+def stalling_stub():
+    """Stub whose /stall route blocks the whole server once, like a GC pause or failover"""
+    with StubAPIServer() as server:
+        server.stall_at = None
+
+        @server.route("GET", "/stall/{index}")
+        def stall(request):
+            if request.path_params["index"] == server.stall_at:
+                time.sleep(0.4)
+            return 200, envelope({"index": request.path_params["index"]})
+        yield server
+
+
+@pytest.mark.offline
+class TestOpenModelScheduler:
+    """Arrival timelines and coordinated-omission-corrected latency"""
+
+    def test_arrival_timelines(self):
+        constant = constant_arrivals(rate=10, duration=2)
+        poisson = poisson_arrivals(rate=200, duration=5, seed=1)
+        steps = step_arrivals([(1, 10), (1, 0), (1, 20)])
+
+        assert len(constant) == 20 and constant[1] - constant[0] == pytest.approx(0.1)
+        assert poisson == sorted(poisson) and abs(len(poisson) - 1000) < 100
+        assert poisson == poisson_arrivals(rate=200, duration=5, seed=1)
+        assert len(steps) == 30 and not [t for t in steps if 1 <= t < 2]
+
+    def test_stall_is_charged_to_every_delayed_request(self, stalling_stub):
+        """With one worker, requests due during a 0.4s stall wait; latency shows it, service time does not"""
+        stalling_stub.stall_at = "5"
+        client = APIClient(base_url=stalling_stub.base_url)
+        client.request_delay = 0
+
+        report = OpenModelScheduler(lambda i: client.get(f"/stall/{i}"), constant_arrivals(rate=50, count=40),
+                                    concurrency=1).run()
+        print_report(report)
+
+        assert report["status_codes"] == {"200": 40}
+        assert report["service_time"]["p90"] < 0.05       # What a closed loop would report
+        assert report["latency"]["p90"] > 0.25            # What users arriving on schedule saw
+        assert report["schedule_lag"]["max"] > 0.3 and report["behind_schedule"] > 0.3
+
+    def test_async_send_keeps_schedule(self, stalling_stub):
+        """Coroutine senders run as tasks; a fast server keeps the generator on schedule"""
+        stalling_stub.stall_at = None
+        client = AsyncAPIClient(stalling_stub.base_url, pool_size=16)
+
+        async def send(i):
+            return await client.get(f"/stall/{i}")
+
+        report = run_open_model(send, poisson_arrivals(rate=200, duration=1, seed=2), concurrency=16)
+
+        assert report["status_codes"] == {"200": report["requests"]}
+        assert report["schedule_lag"]["p99"] < 0.05
+        assert report["achieved_rate"] == pytest.approx(report["offered_rate"], rel=0.25)
+
+    def test_errors_are_recorded(self):
+        def send(i):
+            if i % 2:
+                raise ConnectionError("refused")
+            return type("Response", (), {"status_code": 204})()
+
+        report = run_open_model(send, constant_arrivals(rate=100, count=6))
+
+        assert report["status_codes"] == {"204": 3, "error": 3}
+        assert report["errors"] == ["ConnectionError: refused"] * 3
+
+        # A send() result the scheduler cannot read is a recorded failure, not a TypeError in report()
+        report = run_open_model(lambda i: object(), constant_arrivals(rate=100, count=2))
+        assert report["status_codes"] == {"error": 2} and report["errors"][0].startswith("AttributeError")
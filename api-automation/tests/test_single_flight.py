@@ -0,0 +1,93 @@
+"""Single-flight GET coalescing tests against a local stub server (offline)"""
+
+import socket
+import threading
+import time
+import pytest
+from api.circuit_breaker import CircuitBreakers
+from api.client import APIClient
+from api.single_flight import SingleFlight
+from utils.stub_server import StubAPIServer, envelope
+
+
+@pytest.fixture(scope="module")
+def counting_stub():
+    """GET /slow/{name} takes 0.2s and counts how often it really arrived"""
+    with StubAPIServer() as server:
+        server.hits = {}
+        lock = threading.Lock()
+
+        @server.route("GET", "/slow/{name}")
+        def slow(request):
+            with lock:
+                key = (request.path_params["name"], request.query.get("page"), request.token)
+                server.hits[key] = server.hits.get(key, 0) + 1
+            time.sleep(0.2)
+            return 200, envelope(data={"name": request.path_params["name"], "page": request.query.get("page")})
+        yield server
+
+
+def make_client(base_url, coalescer):
+    client = APIClient(base_url=base_url)
+    client.request_delay = 0
+    client.single_flight = coalescer
+    return client
+
+
+@pytest.mark.offline
+class TestSingleFlight:
+    """One request per identical in-flight GET, never across auth, params or methods"""
+
+    def test_identical_concurrent_gets_share_one_request(self, counting_stub):
+        coalescer = SingleFlight()
+        client = make_client(counting_stub.base_url, coalescer)
+        other_client = make_client(counting_stub.base_url, coalescer)  # e.g. another test's fixture
+
+        results = client.map([{"endpoint": "/slow/techniques", "params": {"page": 1}}] * 15, concurrency=15)
+        results += other_client.map([{"endpoint": "/slow/techniques", "params": {"page": 1}}] * 5, concurrency=5)
+
+        assert all(r["status_code"] == 200 for r in results)
+        assert {r["response"].json()["data"]["name"] for r in results} == {"techniques"}
+        sent = counting_stub.hits[("techniques", "1", None)]
+        assert sent <= 2  # Usually 1; the second batch may start after the first finished
+        assert coalescer.stats()["coalesced"] == 20 - sent
+        assert client.metrics.snapshot()["coalesced"] + other_client.metrics.snapshot()["coalesced"] == 20 - sent
+
+        client.get("/slow/techniques", params={"page": 1})  # Not a cache: a later call goes out again
+        assert counting_stub.hits[("techniques", "1", None)] == sent + 1
+
+    def test_auth_params_and_methods_keep_requests_apart(self, counting_stub):
+        client = make_client(counting_stub.base_url, SingleFlight())
+        specs = ([{"endpoint": "/slow/products", "params": {"page": p}} for p in (1, 2)] * 3)
+        views = [client.with_token("stub-admin-token"), client.anonymous()]
+
+        results = client.map(specs, concurrency=6)
+        results += [r for view in views for r in view.map([{"endpoint": "/slow/products", "params": {"page": 3}}] * 2)]
+
+        assert all(r["status_code"] == 200 for r in results)
+        assert counting_stub.hits[("products", "1", None)] == counting_stub.hits[("products", "2", None)] == 1
+        assert counting_stub.hits[("products", "3", "stub-admin-token")] == 1
+        assert counting_stub.hits[("products", "3", None)] == 1
+
+        client.map([{"method": "POST", "endpoint": "/auth/login", "json": {}}] * 3, concurrency=3)
+        assert client.single_flight.stats()["requests_sent"] == 4  # POSTs bypass single-flight
+
+    def test_failures_are_shared_with_waiters(self):
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+        client = make_client(f"http://127.0.0.1:{port}/api/v1", SingleFlight())
+        client.circuit = CircuitBreakers(enabled=False)
+        release = threading.Event()
+        send = client._send
+
+        def slow_send(*args, **kwargs):
+            release.wait(1)
+            return send(*args, **kwargs)
+        client._send = slow_send
+
+        threading.Timer(0.2, release.set).start()
+        results = client.map([{"endpoint": "/health"}] * 4, concurrency=4)
+
+        assert all(r["error"] is not None and r["response"] is None for r in results)
+        assert client.single_flight.stats() == {"requests_sent": 1, "coalesced": 3, "saved_ratio": 0.75}
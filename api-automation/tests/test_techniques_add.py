@@ -2,11 +2,13 @@
 
 import pytest
 import json
-import uuid
 import time
 from datetime import datetime
 from api.endpoints import Endpoints
 from config.test_data_techniques_add import TECHNIQUES_ADD_TEST_DATA
+from utils.cleanup import CreatedEntities
+from utils.namespace import current_namespace
+from utils.payload_template import PayloadTemplate
 
 class TestTechniquesAddAPI:
     """Test suite for adding techniques"""
@@ -20,8 +22,8 @@ class TestTechniquesAddAPI:
         print(f"Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         print(f"{'='*70}\n")
         
-        # Store created technique IDs for cleanup
-        cls.created_technique_ids = []
+        # Created technique IDs are recorded for the cleanup reaper (utils/cleanup.py)
+        cls.created_technique_ids = CreatedEntities("technique")
     
     @pytest.fixture(autouse=True)
     def setup_admin_auth(self, api_client, admin_auth_token):
@@ -37,8 +39,8 @@ class TestTechniquesAddAPI:
             self.client.clear_auth_token()
     
     def generate_unique_technique_name(self, base_name):
-        """Generate unique technique name for testing"""
-        return f"{base_name}-{str(uuid.uuid4())[:8]}"
+        """Generate unique technique name in this run's namespace"""
+        return current_namespace().slug(base_name)
     
     @pytest.mark.techniques
     @pytest.mark.add
@@ -295,19 +297,22 @@ class TestTechniquesAddAPI:
         
         print(f"\n▶ Test: {test_id} - {description}")
         
-        # Prepare request data
-        request_data = test_case["data"].copy()
+        # Prepare request data: the shared test case stays frozen, overrides are path patches
+        template = PayloadTemplate(test_case["data"])
+        patches = {}
         
         # Generate unique names for techniques to avoid conflicts (only for creation tests)
-        if "techniques" in request_data:
-            for i, technique in enumerate(request_data["techniques"]):
+        if template.get("techniques"):
+            for i, technique in enumerate(template.get("techniques")):
                 if "name" in technique:
                     # Only make unique for actual creation tests, not for duplicate test
                     # For duplicate test (TC_TA_05), we need to use a specific name
                     if test_id == "TC_TA_05":
-                        # For duplicate test, use the specific name from test data
+                        # For duplicate test, use the name from test data in this run's namespace
+                        # (concurrent pipelines must not see each other's original)
                         # First create it, then try to duplicate
-                        original_name = technique["name"]
+                        original_name = self.generate_unique_technique_name(technique["name"])
+                        patches[f"techniques.{i}.name"] = original_name
                         # Actually create it first
                         create_first = {
                             "techniques": [{
@@ -337,11 +342,12 @@ class TestTechniquesAddAPI:
                         # Keep the same name for duplicate attempt
                     elif test_case.get("expected_status") in [200, 201]:
                         # For other positive tests, make unique
-                        base_name = technique["name"]
-                        unique_name = f"{base_name}-{str(uuid.uuid4())[:8]}"
-                        request_data["techniques"][i]["name"] = unique_name
+                        unique_name = self.generate_unique_technique_name(technique["name"])
+                        patches[f"techniques.{i}.name"] = unique_name
                         print(f"   Using unique name: {unique_name}")
         
+        request_data = template.build(patches)
+        
         # Handle authentication scenarios
         if test_case.get("headers") == {}:
             self.client.clear_auth_token()
@@ -0,0 +1,89 @@
+"""Shared pooled transport tests against the local stub server (offline)"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from api.client import APIClient
+from api.endpoints import Endpoints
+from api.transport import Transport, get_transport
+from utils.stub_server import envelope
+
+
+@pytest.mark.offline
+class TestSharedTransport:
+    """Connection reuse across clients, header isolation, reaping and shutdown"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, stub_server):
+        self.stub = stub_server
+
+        @stub_server.route("GET", "/whoami")
+        def whoami(request):
+            return 200, envelope(data={"authorization": request.headers.get("authorization")})
+
+    def new_client(self, transport=None):
+        client = APIClient(base_url=self.stub.base_url, transport=transport)
+        client.request_delay = 0
+        return client
+
+    def test_clients_share_connections(self):
+        """Fresh clients per test reuse pooled connections instead of reconnecting"""
+        transport = Transport(self.stub.base_url)
+        before = self.stub.connection_count
+
+        for _ in range(10):
+            assert self.new_client(transport).get(Endpoints.HEALTH).status_code == 200
+
+        assert self.stub.connection_count - before == 1
+        assert transport.stats()["requests"] == 10
+        transport.close()
+
+    def test_default_transport_is_shared(self):
+        """Clients for the same base URL borrow the same registry transport"""
+        assert self.new_client().transport is self.new_client().transport
+        assert self.new_client().transport is get_transport(self.stub.base_url)
+
+    def test_auth_headers_stay_per_client(self):
+        """A token set on one client is never sent by another client on the same pool"""
+        transport = Transport(self.stub.base_url, pool_size=4)
+        admin, anonymous = self.new_client(transport), self.new_client(transport)
+        admin.set_auth_token("stub-admin-token")
+
+        def call(i):
+            client = admin if i % 2 else anonymous
+            return i, client.get("/whoami").json()["data"]["authorization"]
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            for i, authorization in pool.map(call, range(40)):
+                assert authorization == ("Bearer stub-admin-token" if i % 2 else None)
+        assert transport.connections_opened() <= 4
+        transport.close()
+
+    def test_idle_connections_are_reaped(self):
+        """Idle pools are dropped and the next request opens a fresh connection"""
+        transport = Transport(self.stub.base_url, idle_timeout=0.05)
+        client = self.new_client(transport)
+        client.get(Endpoints.HEALTH)
+
+        assert transport.reap() is False
+        time.sleep(0.1)
+        assert transport.reap() is True
+
+        before = self.stub.connection_count
+        assert client.get(Endpoints.HEALTH).status_code == 200
+        assert self.stub.connection_count - before == 1
+        transport.close()
+
+    def test_keep_alive_off_and_shutdown(self):
+        """keep_alive=False reconnects per request; closed transports refuse requests"""
+        transport = Transport(self.stub.base_url, keep_alive=False)
+        client = self.new_client(transport)
+        before = self.stub.connection_count
+
+        for _ in range(3):
+            client.get(Endpoints.HEALTH)
+        assert self.stub.connection_count - before == 3
+
+        transport.close()
+        with pytest.raises(RuntimeError):
+            client.get(Endpoints.HEALTH)
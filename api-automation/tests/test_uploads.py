@@ -0,0 +1,65 @@
+"""Streaming multipart upload tests against a local stub server (offline)"""
+
+import hashlib
+import os
+import tracemalloc
+import pytest
+from api.uploads import FileUploader, MultipartFile, payload_files
+from perf.upload_benchmark import parse_size, run_benchmark
+from utils.stub_server import parse_multipart
+
+
+def write_file(path, size):
+    with open(path, "wb") as f:
+        f.write(os.urandom(size))
+    return str(path)
+
+
+@pytest.fixture
+def uploader_client(stub_client):
+    stub_client.set_auth_token("stub-admin-token")
+    return stub_client
+
+
+@pytest.mark.offline
+class TestUploads:
+    """Bodies stream from the mapping in bounded blocks; uploads return usable file ids"""
+
+    def test_multipart_body_streams_in_bounded_blocks(self, tmp_path):
+        path = write_file(tmp_path / "photo.jpg", 8 * 1024 * 1024)
+        with MultipartFile(path, fields={"folder": "products"}) as body:
+            tracemalloc.start()
+            blocks = iter(lambda: body.read(64 * 1024), b"")
+            sizes = [len(block) for block in blocks]
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            assert max(sizes) <= 64 * 1024 and sum(sizes) == len(body)
+            assert peak < 1024 * 1024  # Never the whole 8 MiB file
+
+            body.seek(0)
+            parts = parse_multipart(body.read(), body.content_type)
+        assert parts[0] == ({"content-disposition": 'form-data; name="folder"'}, b"products")
+        assert parts[1][0]["content-type"] == "image/jpeg" and 'filename="photo.jpg"' in parts[1][0]["content-disposition"]
+        assert hashlib.sha256(parts[1][1]).digest() == hashlib.sha256(open(path, "rb").read()).digest()
+
+    def test_concurrent_uploads_return_ids_with_progress(self, stub_server, uploader_client, tmp_path):
+        paths = [write_file(tmp_path / f"file-{i}.png", size) for i, size in enumerate((0, 10, 200_000, 1_500_000))]
+        seen = []
+        report = FileUploader(uploader_client, concurrency=4, progress=lambda p: seen.append(p.bytes_sent)).upload_many(paths)
+
+        assert report["uploaded"] == 4 and report["failed"] == 0
+        stored = {f["id"]: f for f in stub_server.files}
+        for path, result in zip(paths, report["files"]):
+            assert stored[result["file_id"]]["sha256"] == hashlib.sha256(open(path, "rb").read()).hexdigest()
+        assert max(seen) >= report["bytes"] == 1_700_010 and report["throughput_mbps"] > 0
+        assert payload_files(report["ids"][:1]) == [{"id": report["ids"][0], "is_active": True, "deleted": False}]
+
+        anonymous = FileUploader(uploader_client.anonymous()).upload(paths[1])
+        assert anonymous["file_id"] is None and anonymous["error"].startswith("HTTP 401")
+
+    def test_benchmark_covers_every_size_and_concurrency(self, uploader_client):
+        rows = run_benchmark(uploader_client, [parse_size("1K"), parse_size("64K")], [1, 2], files=2)
+
+        assert [(row["size"], row["concurrency"]) for row in rows] == [(1024, 1), (1024, 2), (65536, 1), (65536, 2)]
+        assert all(row["uploaded"] == 2 and row["latency"]["count"] == 2 for row in rows)
@@ -0,0 +1,93 @@
+"""Virtual-user runner tests against a dedicated local stub server (offline)"""
+
+import random
+import time
+import pytest
+from api.async_client import AsyncAPIClient
+from perf.virtual_users import (Action, Schedule, UserProfile, admin_profile, artisan_on_start, artisan_profile,
+                                constant, create_product, exponential, normal, print_report, ramp,
+                                run_virtual_users, uniform)
+from utils.stub_server import StubAPIServer
+
+
+@pytest.fixture(scope="module")
+def vu_stub():
+    with StubAPIServer() as server:
+        server.seed_products(50)
+        server.seed_techniques(10)
+        yield server
+
+
+def make_client(stub):
+    client = AsyncAPIClient(stub.base_url, pool_size=64)
+    client.register_role("admin", identifier=stub.admin_identifier, password=stub.admin_password)
+    return client
+
+
+@pytest.mark.offline
+class TestVirtualUsers:
+    """Think times, schedules, per-user sessions and runner scale"""
+
+    def test_think_time_distributions(self):
+        rng = random.Random(7)
+        samples = {
+            "constant": [constant(0.5)(rng) for _ in range(2000)],
+            "uniform": [uniform(1, 3)(rng) for _ in range(2000)],
+            "exponential": [exponential(2, cap=100)(rng) for _ in range(2000)],
+            "normal": [normal(1, 2)(rng) for _ in range(2000)],
+        }
+        mean = {name: sum(v) / len(v) for name, v in samples.items()}
+
+        assert set(samples["constant"]) == {0.5}
+        assert all(1 <= v <= 3 for v in samples["uniform"]) and abs(mean["uniform"] - 2) < 0.1
+        assert abs(mean["exponential"] - 2) < 0.2
+        assert min(samples["normal"]) == 0.0  # Clamped, never negative
+
+    def test_schedule_stages(self):
+        schedule = ramp(100, ramp_up=10, hold=5, ramp_down=5)
+
+        assert schedule.duration == 20 and schedule.peak == 100
+        assert [schedule.target(t) for t in (0, 5, 10, 14, 17.5, 20, 30)] == [0, 50, 100, 100, 50, 0, 0]
+        assert Schedule([(2, 10), (2, 30)]).target(3) == 20
+
+    def test_sessions_keep_their_own_identity(self, vu_stub):
+        """Each artisan registers, logs in once and creates products under its own account"""
+        profile = UserProfile("artisan", [Action("create_product", create_product)],
+                              on_start=artisan_on_start, think_time=constant(0.05))
+
+        report = run_virtual_users(make_client(vu_stub), [profile], ramp(10, 0.2, 0.8), seed=3)
+
+        assert report["start_failures"] == 0 and report["error_rate"] == 0
+        owners = {p["owner_id"] for p in vu_stub.products if p.get("owner_id")}
+        assert len(owners) == 10
+        assert report["per_action"]["artisan.create_product"]["latency"]["count"] >= 10
+
+    def test_ramp_down_stops_users_gracefully(self, vu_stub):
+        """Surplus users finish their current action; nothing is cancelled mid-request"""
+        finished = []
+
+        async def slow_action(user):
+            response = await user.client.get("/health")
+            finished.append(user.id)
+            return response
+
+        profile = UserProfile("slow", [Action("health", slow_action)], think_time=constant(10))
+        report = run_virtual_users(make_client(vu_stub), [profile], ramp(20, 0.3, 0.3, ramp_down=0.4))
+
+        assert report["users_started"] == 20 and report["peak_users"] == 20
+        assert report["actions"] == len(finished) == 20  # Long think time ends as soon as users stop
+        assert report["elapsed"] < 2
+
+    def test_thousand_users_in_one_process(self, vu_stub):
+        """1000 artisans and admins with think time run on one event loop without errors"""
+        profiles = [artisan_profile(weight=9, think_time=exponential(0.3)),
+                    admin_profile(weight=1, think_time=exponential(0.3))]
+
+        start = time.perf_counter()
+        report = run_virtual_users(make_client(vu_stub), profiles, ramp(1000, 1.0, 1.5, ramp_down=0.5), seed=11)
+        elapsed = time.perf_counter() - start
+        print_report(report)
+
+        assert report["peak_users"] == 1000 and report["start_failures"] == 0
+        assert report["error_rate"] == 0 and report["actions"] > 1000
+        assert elapsed < 15
@@ -0,0 +1,69 @@
+"""Workflow engine and artisan journey tests against the local stub server (offline)"""
+
+import pytest
+from utils.journeys import artisan_context, artisan_journey
+from utils.workflow import Step, Workflow, print_journey_report, summarize_journeys
+
+
+@pytest.mark.offline
+class TestWorkflowEngine:
+    """Step execution, data passing, waits and concurrent journeys"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, stub_client, stub_server):
+        self.client = stub_client
+        self.stub = stub_server
+        yield
+        self.stub.whitelist_delay = 0.0
+
+    def test_artisan_journey_end_to_end(self):
+        """One journey registers, gets approved, logs in, creates and approves a product"""
+        result = artisan_journey().run(self.client, artisan_context())
+
+        assert result["ok"], result["error"]
+        assert [s["name"] for s in result["steps"]] == [
+            "register", "find_in_whitelist", "approve_artisan", "artisan_login",
+            "create_product", "approve_product"]
+        ctx = result["context"]
+        assert self.stub.find_whitelist_entry(ctx["user_id"])["status"] == "approved"
+        product = self.stub.find_product(ctx["product_id"])
+        assert product["status"] == "approved" and product["owner_id"] == ctx["user_id"]
+
+    def test_wait_polls_until_visible(self):
+        """A registration that takes time to reach the whitelist is polled, not slept on"""
+        self.stub.whitelist_delay = 0.3
+        journey = artisan_journey(whitelist_timeout=5.0)
+        for step in journey.steps:
+            if step.wait:
+                step.wait.interval = 0.05
+
+        result = journey.run(self.client, artisan_context())
+
+        assert result["ok"], result["error"]
+        find = next(s for s in result["steps"] if s["name"] == "find_in_whitelist")
+        assert find["attempts"] > 1 and find["elapsed"] >= 0.25
+
+    def test_failure_stops_the_journey(self):
+        """A failed expectation is recorded and later steps do not run"""
+        workflow = Workflow("broken", [
+            Step("health", {"endpoint": "/health"}),
+            Step("missing", {"endpoint": "/no-such-route"}, expect=200),
+            Step("never_runs", {"endpoint": "/health"}),
+        ])
+
+        result = workflow.run(self.client)
+
+        assert not result["ok"] and result["failed_step"] == "missing"
+        assert "expected 200, got 404" in result["error"]
+        assert [s["name"] for s in result["steps"]] == ["health", "missing"]
+
+    def test_concurrent_journeys(self):
+        """Many independent journeys share one client and report per-step timings"""
+        results = artisan_journey().run_many(self.client, count=20, concurrency=10,
+                                             context_factory=artisan_context)
+        summary = summarize_journeys(results)
+        print_journey_report(summary)
+
+        assert summary["passed"] == 20 and summary["failures"] == {}
+        assert len({r["context"]["artisan_token"] for r in results}) == 20
+        assert summary["steps"]["create_product"]["latency"]["count"] == 20
@@ -0,0 +1,259 @@
+"""Cleanup of data created by tests on the target environment
+
+Every entity a test creates is recorded in a local ledger file
+(CLEANUP_LEDGER) together with the run id (settings.RUN_ID), the xdist
+worker and the environment it was created on:
+
+    created_products = CreatedEntities("product")   # a list that also records
+    created_products.append({"id": product_id, "name": name})
+
+After the session the reaper deletes or deactivates this run's entities in
+a background thread at CLEANUP_CONCURRENCY requests at a time, then sweeps
+entries of crashed runs older than CLEANUP_SWEEP_AGE. Whatever fails stays
+in the ledger for the next sweep:
+
+    python -m utils.cleanup                      # Sweep everything in the ledger
+    python -m utils.cleanup --run-id a1b2c3      # One run only
+    python -m utils.cleanup --dry-run            # List what would be cleaned
+
+The API has no delete for products or artisans, so they are deactivated:
+products and whitelist entries are set to "rejected". Techniques are
+deleted. A 404 means the entity is already gone.
+"""
+
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from api.endpoints import Endpoints
+from config.settings import settings
+from utils.identity import JSONLedger
+
+
+def _reason(entity):
+    return f"Test data cleanup (run {entity['run_id']})"
+
+
+def _cleanup_product(client, entity):
+    return client.patch(Endpoints.PRODUCT_STATUS, json={
+        "product_id": entity["id"], "status": "rejected", "reason": _reason(entity)})
+
+
+def _cleanup_technique(client, entity):
+    return client.delete(f"{Endpoints.TECHNIQUES}{entity['id']}")
+
+
+def _cleanup_artisan(client, entity):
+    user_id = entity.get("id")
+    if not user_id:
+        # Registrations are recorded by email/phone; the whitelist knows the user id
+        term = entity.get("email") or entity.get("phone")
+        response = client.get(Endpoints.WHITELIST_AUDIT, params={"search": term, "page": 1, "limit": 10})
+        if response.status_code != 200:
+            return response
+        matches = [u for u in response.json().get("data") or []
+                   if term in (u.get("email"), u.get("phone"))]
+        if not matches:
+            return None  # Never reached the whitelist
+        user_id = matches[0].get("id")
+    return client.patch(Endpoints.WHITELIST_AUDIT, json={
+        "user_id": user_id, "status": "rejected", "reason": _reason(entity)})
+
+
+# kind -> action(admin_client, entity) returning the response (None: nothing to clean)
+CLEANUP_ACTIONS = {
+    "product": _cleanup_product,
+    "technique": _cleanup_technique,
+    "artisan": _cleanup_artisan,
+}
+
+
+class CleanupLedger(JSONLedger):
+    """Entities waiting for cleanup, shared by workers, runs and the sweep CLI"""
+
+    def __init__(self, path=None):
+        super().__init__(path or settings.CLEANUP_LEDGER)
+
+    def _update(self, change):
+        with self.lock:
+            data = self._read()
+            entities = data.setdefault("entities", [])
+            result = change(entities)
+            self._write(data)
+        return result
+
+    def record(self, kind, run_id, worker_id, base_url, **fields):
+        entity = {"kind": kind, "run_id": run_id, "worker": worker_id, "base_url": base_url,
+                  "created_at": time.time(), "attempts": 0, **fields}
+        self._update(lambda entities: entities.append(entity))
+        return entity
+
+    def pending(self, base_url=None, run_id=None, worker_id=None, older_than=None):
+        now = time.time()
+        return [e for e in self._read().get("entities", [])
+                if (base_url is None or e["base_url"] == base_url)
+                and (run_id is None or e["run_id"] == run_id)
+                and (worker_id is None or e["worker"] == worker_id)
+                and (older_than is None or now - e["created_at"] >= older_than)]
+
+    def settle(self, done, failed):
+        """Drop cleaned entities; count an attempt against the failed ones"""
+        def change(entities):
+            key = lambda e: (e["kind"], e["base_url"], e.get("id"), e.get("email"), e.get("phone"))
+            done_keys = {key(e) for e in done}
+            failed_keys = {key(e): e for e in failed}
+            entities[:] = [e for e in entities if key(e) not in done_keys]
+            for entity in entities:
+                if key(entity) in failed_keys:
+                    entity["attempts"] += 1
+                    entity["last_error"] = failed_keys[key(entity)].get("last_error")
+        self._update(change)
+
+
+class Reaper:
+    """Cleans ledger entities of one environment at bounded concurrency"""
+
+    def __init__(self, client=None, ledger=None, concurrency=None):
+        if client is None:
+            from api.client import APIClient
+            client = APIClient(base_url=settings.BASE_URL)
+            client.request_delay = 0  # Bounded by concurrency and the rate limiter instead
+        self.client = client
+        self.ledger = ledger or CleanupLedger()
+        self.concurrency = concurrency or settings.CLEANUP_CONCURRENCY
+        self._thread = None
+        self.report = None
+
+    def _clean(self, admin, entity):
+        action = CLEANUP_ACTIONS.get(entity["kind"])
+        if action is None:
+            return {**entity, "last_error": f"no cleanup action for kind '{entity['kind']}'"}, False
+        try:
+            response = action(admin, entity)
+        except Exception as e:
+            return {**entity, "last_error": f"{type(e).__name__}: {e}"}, False
+        if response is None or response.status_code < 300 or response.status_code == 404:
+            return entity, True
+        return {**entity, "last_error": f"HTTP {response.status_code}: {response.text[:120]}"}, False
+
+    def reap(self, run_id=None, worker_id=None, older_than=None, dry_run=False):
+        """Clean the matching entities now; returns a report"""
+        start = time.perf_counter()
+        entities = self.ledger.pending(self.client.base_url, run_id, worker_id, older_than)
+        report = {"base_url": self.client.base_url, "run_id": run_id, "found": len(entities),
+                  "cleaned": 0, "failed": [], "by_kind": {}, "elapsed": 0.0, "dry_run": dry_run}
+        for entity in entities:
+            report["by_kind"][entity["kind"]] = report["by_kind"].get(entity["kind"], 0) + 1
+        if dry_run or not entities:
+            report["elapsed"] = time.perf_counter() - start
+            return report
+
+        try:
+            admin = self.client.as_role("admin")
+        except Exception as e:
+            report["failed"] = [{**entity, "last_error": f"admin login: {e}"} for entity in entities]
+        else:
+            with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="reaper") as pool:
+                outcomes = list(pool.map(lambda entity: self._clean(admin, entity), entities))
+            report["failed"] = [entity for entity, ok in outcomes if not ok]
+            report["cleaned"] = len(entities) - len(report["failed"])
+            self.ledger.settle([entity for entity, ok in outcomes if ok], report["failed"])
+        report["elapsed"] = time.perf_counter() - start
+        return report
+
+    def start(self, run_id=None, worker_id=None, sweep_age=None):
+        """Reap this run (then stale entries of crashed runs) in a background thread"""
+        def work():
+            report = self.reap(run_id, worker_id)
+            if sweep_age is not None:
+                sweep = self.reap(older_than=sweep_age)
+                report["swept"] = sweep["cleaned"]
+                report["failed"] += sweep["failed"]
+            self.report = report
+
+        self._thread = threading.Thread(target=work, name="cleanup-reaper", daemon=True)
+        self._thread.start()
+        return self
+
+    def join(self, timeout=None):
+        """Report of the background run, or None if it is still going after `timeout`"""
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return self.report
+
+
+class CreatedEntities(list):
+    """Class-level list of created entities that also records them for cleanup
+
+    Entries are dicts with "id" (or "email"/"phone" for registrations) or
+    plain ids.
+    """
+
+    def __init__(self, kind, ledger=None):
+        super().__init__()
+        self.kind = kind
+        self.ledger = ledger
+
+    def append(self, entity):
+        super().append(entity)
+        track_created(self.kind, entity, ledger=self.ledger)
+
+
+def track_created(kind, entity, ledger=None, base_url=None):
+    """Record one created entity of the current run in the cleanup ledger"""
+    if settings.CLEANUP == "off":
+        return None
+    fields = dict(entity) if isinstance(entity, dict) else {"id": entity}
+    fields = {k: v for k, v in fields.items() if k in ("id", "email", "phone", "name")}
+    return (ledger or default_ledger()).record(kind, settings.RUN_ID, settings.WORKER_ID,
+                                               base_url or settings.BASE_URL, **fields)
+
+
+_default_ledger = None
+_default_lock = threading.Lock()
+
+
+def default_ledger():
+    """Process-wide ledger at CLEANUP_LEDGER"""
+    global _default_ledger
+    with _default_lock:
+        if _default_ledger is None:
+            _default_ledger = CleanupLedger()
+        return _default_ledger
+
+
+def print_report(report):
+    print(f"\n{'='*70}")
+    print(f"CLEANUP: {report['base_url']}" + (f" (run {report['run_id']})" if report["run_id"] else ""))
+    print(f"{'='*70}")
+    kinds = ", ".join(f"{count} {kind}" for kind, count in sorted(report["by_kind"].items())) or "nothing"
+    print(f"   Found:   {report['found']} ({kinds})")
+    if report["dry_run"]:
+        print(f"   Dry run: nothing was changed")
+    else:
+        print(f"   ✓ Cleaned: {report['cleaned']}" + (f" (+{report['swept']} from earlier runs)"
+                                                      if report.get("swept") else ""))
+        if report["failed"]:
+            print(f"   ⚠ Left in the ledger: {len(report['failed'])}")
+            for entity in report["failed"][:5]:
+                print(f"     {entity['kind']} {entity.get('id') or entity.get('email')}: {entity['last_error']}")
+    print(f"   Elapsed: {report['elapsed']:.2f}s")
+    print(f"{'='*70}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Clean up test data recorded in the cleanup ledger")
+    parser.add_argument("--run-id", help="Only this run (default: every run in the ledger)")
+    parser.add_argument("--older-than", type=float, help="Only entities older than this many seconds")
+    parser.add_argument("--concurrency", type=int, default=settings.CLEANUP_CONCURRENCY)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    reaper = Reaper(concurrency=args.concurrency)
+    report = reaper.reap(run_id=args.run_id, older_than=args.older_than, dry_run=args.dry_run)
+    print_report(report)
+    return 1 if report["failed"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
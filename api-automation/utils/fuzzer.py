@@ -0,0 +1,458 @@
+"""Mutation fuzzing of registration and product payloads
+
+The hand-written negative and security cases (ARTISAN_REG_TEST_CASES,
+test_data_product_creation) cover a fixed list. The fuzzer starts from a
+valid payload template and mutates it path by path:
+
+  type       a value of another JSON type (string, int, float, bool, null, list, object)
+  length     boundary lengths for strings and collections, extreme numbers
+  unicode    non-ASCII, emoji, RTL override, zero-width, NUL, combining marks
+  injection  SQL, XSS, template, path traversal, command, JNDI, NoSQL operator
+  missing    the field (or list item) removed
+  extra      an unexpected field added next to existing ones
+
+Every single mutation is sent once first, then random combinations of up to
+max_mutations. Payloads are built with PayloadTemplate path patches, so a
+case costs microseconds; requests go through APIClient.map, i.e. the client
+pacing and the global rate limiter. Responses are clustered by signature
+(status, normalized message, error fields) and only signatures not seen
+before - in this run's baseline (the valid payload) or in the known
+signatures file - are reported. Each novel failure (5xx or transport error)
+is minimized: mutations are dropped and long values halved while the
+signature stays the same.
+
+    python -m utils.fuzzer --stub --target register --cases 5000
+    python -m utils.fuzzer --target product --cases 300      # UAT, artisan login; mind the client delay
+
+Entities the fuzzer manages to create are recorded for cleanup.
+"""
+
+import argparse
+import json
+import logging
+import random
+import re
+import time
+from api.circuit_breaker import CircuitBreakers
+from api.endpoints import Endpoints
+from config.settings import settings
+from utils.cleanup import track_created
+from utils.namespace import current_namespace
+from utils.payload_template import PayloadTemplate, REMOVE, thaw
+from utils.workflow import extract_path
+
+logger = logging.getLogger(__name__)
+
+TYPE_SAMPLES = {
+    "string": "fuzz", "int": 12345, "float": 1.5, "bool": True, "null": None, "list": [], "object": {},
+}
+
+STRING_LENGTHS = (0, 1, 255, 256, 1024, 10000)
+COLLECTION_LENGTHS = (0, 101, 1000)
+NUMBERS = {"zero": 0, "negative": -1, "int32_overflow": 2 ** 31, "beyond_float_precision": 2 ** 53 + 1,
+           "int64_max": 2 ** 63 - 1, "huge_float": 1e308, "negative_zero": -0.0, "tiny": 1e-9}
+
+UNICODE = {
+    "accents": "\u00c5sa \u00d1and\u00fa \u00d8re", "cjk": "\u540d\u524d\u30c6\u30b9\u30c8",
+    "emoji": "\U0001f642\U0001f9f5\U0001fa61" * 3, "rtl_override": "abc\u202edcba", "zero_width": "a\u200bb\u200dc",
+    "nul": "a\u0000b", "combining": "e\u0301" * 20, "arabic": "\u0627\u062e\u062a\u0628\u0627\u0631",
+}
+
+INJECTION = {
+    "sql": "' OR '1'='1' --", "sql_drop": "Robert'); DROP TABLE users;--", "xss": "<script>alert(1)</script>",
+    "xss_attr": "\"><img src=x onerror=alert(1)>", "template": "{{7*7}}${7*7}", "path": "../../../../etc/passwd",
+    "command": "; cat /etc/passwd", "jndi": "${jndi:ldap://127.0.0.1/a}", "crlf": "a\r\nSet-Cookie: x=1",
+    "format": "%s%s%s%n",
+}
+
+EXTRA_FIELDS = {"is_admin": True, "role": "admin", "__proto__": {"polluted": True}, "unexpected_field": "x"}
+
+
+def _type_name(value):
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "bool"
+    if isinstance(value, dict):
+        return "object"
+    if isinstance(value, (list, tuple)):
+        return "list"
+    return {int: "int", float: "float", str: "string"}.get(type(value), "string")
+
+
+def _paths(node, prefix=()):
+    """(path, value) for every field and list item below the root"""
+    if isinstance(node, dict):
+        items = node.items()
+    elif isinstance(node, (list, tuple)):
+        items = enumerate(node)
+    else:
+        return
+    for key, value in items:
+        path = prefix + (key,)
+        yield path, value
+        yield from _paths(value, path)
+
+
+class Mutation:
+    """One change to a payload: value (or REMOVE) at a key path"""
+
+    __slots__ = ("path", "value", "kind")
+
+    def __init__(self, path, value, kind):
+        self.path = path
+        self.value = value
+        self.kind = kind
+
+    def with_value(self, value):
+        return Mutation(self.path, value, self.kind)
+
+    def __repr__(self):
+        return f"{'.'.join(map(str, self.path))}: {self.kind}"
+
+
+class Case:
+    """A numbered set of mutations"""
+
+    __slots__ = ("index", "mutations")
+
+    def __init__(self, index, mutations):
+        self.index = index
+        self.mutations = mutations
+
+    def describe(self):
+        return "; ".join(map(repr, self.mutations)) or "valid payload"
+
+
+def mutations_for(path, value):
+    """Every mutation of the field at path"""
+    found = [Mutation(path, REMOVE, "missing")]
+    kind = _type_name(value)
+    found += [Mutation(path, sample, f"type:{name}") for name, sample in TYPE_SAMPLES.items() if name != kind]
+    if kind == "string":
+        found += [Mutation(path, "A" * n, f"length:{n}") for n in STRING_LENGTHS]
+        found += [Mutation(path, text, f"unicode:{name}") for name, text in UNICODE.items()]
+        found += [Mutation(path, text, f"injection:{name}") for name, text in INJECTION.items()]
+        found.append(Mutation(path, {"$gt": ""}, "injection:nosql_operator"))
+    elif kind in ("int", "float"):
+        found += [Mutation(path, number, f"number:{name}") for name, number in NUMBERS.items()]
+    elif kind == "list":
+        first = thaw(value[0]) if value else "x"
+        found += [Mutation(path, [first] * n, f"length:{n}") for n in COLLECTION_LENGTHS]
+    if kind == "object":
+        found += [Mutation(path + (name,), extra, f"extra:{name}") for name, extra in EXTRA_FIELDS.items()]
+    return found
+
+
+class Mutator:
+    """Generates cases from a template: all single mutations, then random combinations"""
+
+    def __init__(self, template, seed=0, max_mutations=2):
+        self.template = template if isinstance(template, PayloadTemplate) else PayloadTemplate(template)
+        self.rng = random.Random(seed)
+        self.max_mutations = max(int(max_mutations), 1)
+        self.singles = [Mutation((name,), extra, f"extra:{name}") for name, extra in EXTRA_FIELDS.items()]
+        for path, value in _paths(self.template.base):
+            self.singles += mutations_for(path, value)
+
+    def cases(self, count):
+        """count cases; the single mutations come first, in template order"""
+        for index in range(count):
+            if index < len(self.singles):
+                yield Case(index, [self.singles[index]])
+                continue
+            chosen, used = [], set()
+            size = self.rng.randint(min(2, self.max_mutations), self.max_mutations)
+            for mutation in self.rng.sample(self.singles, min(size, len(self.singles))):
+                # A removed or retyped container makes mutations below it meaningless
+                if any(mutation.path[:len(p)] == p or p[:len(mutation.path)] == mutation.path for p in used):
+                    continue
+                used.add(mutation.path)
+                chosen.append(mutation)
+            yield Case(index, chosen)
+
+    def build(self, case, fresh=None):
+        """Payload of a case; fresh values (unique phone, email, name) apply unless the case mutates them"""
+        patches = dict(fresh or {})
+        for mutation in case.mutations:
+            patches[mutation.path if len(mutation.path) > 1 else mutation.path[0]] = mutation.value
+        return self.template.build(patches)
+
+
+_UUID = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}", re.I)
+_QUOTED = re.compile(r"(['\"]).*?\1")
+_DIGITS = re.compile(r"\d+")
+
+
+def normalize_message(message):
+    """Message with ids, quoted values and numbers masked, so echoes of the input do not split clusters"""
+    text = _UUID.sub("<id>", str(message or ""))
+    text = _QUOTED.sub("<value>", text)
+    return _DIGITS.sub("#", text).strip().lower()[:120]
+
+
+def signature(response=None, error=None):
+    """(status, normalized message, error fields) of one outcome"""
+    if error is not None:
+        return ("error", type(error).__name__, ())
+    try:
+        body = response.json()
+    except ValueError:
+        body = None
+    if not isinstance(body, dict):
+        return (response.status_code, "<non-json body>" if body is None else "<non-object body>", ())
+    errors = body.get("errors")
+    if isinstance(errors, dict):
+        fields = errors.keys()
+    else:
+        fields = (e.get("field") for e in errors or [] if isinstance(e, dict))
+    return (response.status_code, normalize_message(body.get("message")),
+            tuple(sorted({str(f) for f in fields if f})))
+
+
+def signature_key(sig):
+    status, message, fields = sig
+    return f"{status} {message} [{','.join(fields)}]"
+
+
+def is_failure(sig):
+    """5xx or no response at all"""
+    return sig[0] == "error" or sig[0] >= 500
+
+
+class FuzzTarget:
+    """Endpoint, valid template and per-request fresh values of one fuzzed operation"""
+
+    def __init__(self, name, endpoint, template, fresh=None, created_kind=None):
+        self.name = name
+        self.endpoint = endpoint
+        self.template = template
+        self.fresh = fresh or (lambda: {})
+        self.created_kind = created_kind
+
+
+def registration_target(namespace=None):
+    from config.register_test_data import ARTISAN_REG_TEST_CASES
+    ns = namespace or current_namespace()
+    valid = next(tc for tc in ARTISAN_REG_TEST_CASES if tc["test_id"] == "TC_Artisan_Reg_01")["data_factory"]()
+    return FuzzTarget("register", Endpoints.REGISTER, PayloadTemplate(valid),
+                      fresh=lambda: {"phone": ns.phone(), "email": ns.email("fuzz_artisan")}, created_kind="artisan")
+
+
+def product_target(namespace=None):
+    from config.test_data_product_creation import ProductTestData
+    ns = namespace or current_namespace()
+    return FuzzTarget("product", Endpoints.PRODUCTS, ProductTestData.VALID_PRODUCT_TEMPLATE,
+                      fresh=lambda: {"name": ns.name("Fuzz", max_length=30)}, created_kind="product")
+
+
+TARGETS = {"register": registration_target, "product": product_target}
+
+
+class Fuzzer:
+    """Runs mutated payloads against one target and keeps the novel response signatures"""
+
+    def __init__(self, client, target, seed=0, concurrency=None, max_mutations=2, known=None,
+                 track=True, ledger=None):
+        self.client = client
+        # Provoked 5xx are findings, not an outage: keep them out of the shared circuit breaker
+        self.client.circuit = CircuitBreakers(enabled=False)
+        self.target = target
+        self.mutator = Mutator(target.template, seed, max_mutations)
+        self.concurrency = concurrency
+        self.known = set(known or ())
+        self.track = track
+        self.ledger = ledger
+        self.clusters = {}      # signature key -> {"signature", "count", "case", "failure"}
+        self.requests = 0
+
+    def _send(self, payloads):
+        specs = [{"method": "POST", "endpoint": self.target.endpoint, "json": p} for p in payloads]
+        results = self.client.map(specs, concurrency=self.concurrency)
+        self.requests += len(specs)
+        outcomes = []
+        for payload, result in zip(payloads, results):
+            sig = signature(result["response"], result["error"])
+            if self.track and self.target.created_kind and sig[0] in (200, 201):
+                self._track(payload, result["response"])
+            outcomes.append(sig)
+        return outcomes
+
+    def _track(self, payload, response):
+        try:
+            entity_id = extract_path(response.json(), ("id", "data.id", "data.user.id"))
+        except ValueError:
+            entity_id = None
+        entity = {k: payload.get(k) for k in ("email", "phone", "name") if isinstance(payload.get(k), str)}
+        if entity_id:
+            entity["id"] = entity_id
+        if entity:
+            track_created(self.target.created_kind, entity, ledger=self.ledger, base_url=self.client.base_url)
+
+    def probe(self, mutations):
+        """Signature of one payload with these mutations"""
+        case = Case(-1, mutations)
+        return self._send([self.mutator.build(case, self.target.fresh())])[0]
+
+    def minimize(self, case, target_signature, max_requests=40):
+        """Smallest set of (shortest) mutations that still produces target_signature"""
+        mutations, budget = list(case.mutations), max_requests
+        i = 0
+        while i < len(mutations) and len(mutations) > 1 and budget > 0:
+            trial = mutations[:i] + mutations[i + 1:]
+            budget -= 1
+            if self.probe(trial) == target_signature:
+                mutations = trial
+            else:
+                i += 1
+        for j, mutation in enumerate(mutations):
+            while isinstance(mutation.value, (str, list)) and len(mutation.value) > 1 and budget > 0:
+                smaller = mutation.with_value(mutation.value[:len(mutation.value) // 2])
+                budget -= 1
+                if self.probe(mutations[:j] + [smaller] + mutations[j + 1:]) != target_signature:
+                    break
+                mutations[j] = mutation = smaller
+        return Case(case.index, mutations)
+
+    def run(self, cases=1000, batch=256, minimize=True):
+        """Fuzz `cases` cases and return the report dict"""
+        started = time.perf_counter()
+        baseline = self.probe([])
+        self.known.add(signature_key(baseline))
+
+        generation = 0.0
+        generator = self.mutator.cases(cases)
+        while True:
+            start = time.perf_counter()
+            chunk = [case for _, case in zip(range(batch), generator)]
+            payloads = [self.mutator.build(case, self.target.fresh()) for case in chunk]
+            generation += time.perf_counter() - start
+            if not chunk:
+                break
+            for case, sig in zip(chunk, self._send(payloads)):
+                key = signature_key(sig)
+                cluster = self.clusters.get(key)
+                if cluster is None:
+                    cluster = self.clusters[key] = {"signature": sig, "count": 0, "case": case,
+                                                    "failure": is_failure(sig)}
+                cluster["count"] += 1
+
+        novel = {key: c for key, c in self.clusters.items() if key not in self.known}
+        if minimize:
+            for cluster in novel.values():
+                if cluster["failure"]:
+                    cluster["minimized"] = self.minimize(cluster["case"], cluster["signature"])
+        elapsed = time.perf_counter() - started
+        return {
+            "target": self.target.name,
+            "base_url": self.client.base_url,
+            "cases": cases,
+            "requests": self.requests,
+            "elapsed": elapsed,
+            "generated_per_second": cases / generation if generation else 0.0,
+            "requests_per_second": self.requests / elapsed if elapsed else 0.0,
+            "baseline": signature_key(baseline),
+            "clusters": len(self.clusters),
+            "novel": [
+                {"signature": key, "count": c["count"], "failure": c["failure"], "example": c["case"].describe(),
+                 "minimized": c["minimized"].describe() if "minimized" in c else None}
+                for key, c in sorted(novel.items(), key=lambda item: (not item[1]["failure"], -item[1]["count"]))
+            ],
+            "failures": sum(1 for c in novel.values() if c["failure"]),
+        }
+
+    def signatures(self):
+        """Every signature seen, for the known signatures file"""
+        return sorted(self.known | set(self.clusters))
+
+
+def load_known(path, target):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f).get(target, [])
+    except (OSError, ValueError):
+        return []
+
+
+def save_known(path, target, signatures):
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        data = {}
+    data[target] = signatures
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+
+
+def print_report(report):
+    print(f"\n{'='*70}")
+    print(f"FUZZ: {report['target']} @ {report['base_url']}")
+    print(f"{'='*70}")
+    print(f"   {report['cases']} cases, {report['requests']} requests in {report['elapsed']:.1f}s "
+          f"({report['generated_per_second']:.0f} cases/s generated, {report['requests_per_second']:.0f} requests/s)")
+    print(f"   Baseline: {report['baseline']}")
+    print(f"   {report['clusters']} signature(s), {len(report['novel'])} novel, {report['failures']} failure(s)")
+    for cluster in report["novel"]:
+        mark = "❌" if cluster["failure"] else "⚠"
+        print(f"   {mark} {cluster['signature']}  x{cluster['count']}")
+        print(f"        e.g. {cluster['example']}")
+        if cluster["minimized"]:
+            print(f"        minimized: {cluster['minimized']}")
+    print(f"{'='*70}")
+
+
+def main():
+    from api.client import APIClient
+
+    parser = argparse.ArgumentParser(description="Mutation fuzzing of registration and product payloads")
+    parser.add_argument("--stub", action="store_true", help="Fuzz a local stub server instead")
+    parser.add_argument("--base-url", default=settings.BASE_URL)
+    parser.add_argument("--target", choices=sorted(TARGETS), default="register")
+    parser.add_argument("--cases", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--concurrency", type=int, default=None, help="Defaults to LOAD_CONCURRENCY")
+    parser.add_argument("--max-mutations", type=int, default=2)
+    parser.add_argument("--known", default=settings.FUZZ_SIGNATURES,
+                        help="Known signatures file; only signatures not in it are reported")
+    parser.add_argument("--save", action="store_true", help="Add this run's signatures to the known file")
+    parser.add_argument("--no-minimize", action="store_true")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    stub = None
+    client = APIClient(base_url=args.base_url)
+    if args.stub:
+        from utils.stub_server import StubAPIServer
+        stub = StubAPIServer().start()
+        client = APIClient(base_url=stub.base_url)
+        client.request_delay = 0
+        client.set_auth_token("stub-admin-token")
+    elif args.target == "product":
+        import os
+        from api.endpoint_discovery import EndpointDiscovery
+        identifier = os.getenv("ARTISAN_IDENTIFIER") or os.getenv("ARTISAN_PHONE") or os.getenv("ARTISAN_EMAIL")
+        _, token = EndpointDiscovery(args.base_url).artisan_login(identifier, os.getenv("ARTISAN_PASSWORD"))
+        if not token:
+            print("❌ Artisan login failed (ARTISAN_IDENTIFIER / ARTISAN_PASSWORD)")
+            return 1
+        client.set_auth_token(token)
+    try:
+        known = [] if args.stub else load_known(args.known, args.target)
+        fuzzer = Fuzzer(client, TARGETS[args.target](), seed=args.seed, concurrency=args.concurrency,
+                        max_mutations=args.max_mutations, known=known, track=not args.stub)
+        report = fuzzer.run(args.cases, minimize=not args.no_minimize)
+        if args.save and not args.stub:
+            save_known(args.known, args.target, fuzzer.signatures())
+        if args.json:
+            print(json.dumps(report, indent=2))
+        else:
+            print_report(report)
+        return 1 if report["failures"] else 0
+    finally:
+        if stub:
+            stub.stop()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
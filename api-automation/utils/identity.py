@@ -0,0 +1,250 @@
+"""Collision-free unique identity generator (phones, emails, names) for test data
+
+Phone numbers are produced by pushing a counter through a keyed Feistel
+permutation of the valid number space, so every counter value maps to a
+distinct, random-looking number. Counters are handed out in blocks from a
+persistent ledger file guarded by a lock file, which means:
+
+  - pytest-xdist workers on one machine reserve disjoint blocks,
+  - later runs continue after the last reserved block and never reuse a number,
+  - a fresh ledger (e.g. a clean CI checkout) starts at a random offset of the
+    index space unless IDENTITY_KEY / IDENTITY_SLOT pin the sequence,
+  - parallel CI machines without a shared ledger can be split into disjoint
+    slots of the index space with IDENTITY_SLOT / IDENTITY_SLOTS.
+
+Emails and names carry the run id, worker id and a per-process counter, so
+they are unique without touching the ledger.
+"""
+
+import hashlib
+import itertools
+import json
+import math
+import os
+import secrets
+import threading
+import time
+from array import array
+from config.settings import settings
+
+MASK64 = (1 << 64) - 1
+
+# kind -> (prefix, number of digits after the prefix)
+PHONE_FORMATS = {
+    "bd": ("+88017", 8),   # Bangladesh mobile, e.g. +8801712345678
+    "pk": ("+92", 9),      # Pakistan, e.g. +92123456789
+}
+
+
+class FeistelPermutation:
+    """Keyed bijection on range(size) built from a balanced modular Feistel network
+
+    The network permutes range(m * m) with m = ceil(sqrt(size)); values that
+    land outside range(size) are fed through again (cycle walking), which
+    keeps the mapping a bijection on range(size).
+    """
+
+    def __init__(self, size, key, rounds=4):
+        self.size = size
+        self.m = math.isqrt(size - 1) + 1 if size > 1 else 1
+        self.round_keys = [
+            int.from_bytes(hashlib.sha256(f"{key}:{i}".encode()).digest()[:8], "big")
+            for i in range(rounds)
+        ]
+
+    def __call__(self, value):
+        m = self.m
+        keys = self.round_keys
+        while True:
+            left, right = divmod(value, m)
+            for key in keys:
+                x = (right * 0x9E3779B97F4A7C15 + key) & MASK64
+                x ^= x >> 29
+                x = (x * 0xBF58476D1CE4E5B9) & MASK64
+                x ^= x >> 32
+                left, right = right, (left + x) % m
+            value = left * m + right
+            if value < self.size:
+                return value
+
+
+class _LedgerLock:
+    """Cross-process lock built on an exclusively created lock file"""
+
+    def __init__(self, path, timeout=10.0, stale_after=30.0):
+        self.path = path
+        self.timeout = timeout
+        self.stale_after = stale_after
+
+    def __enter__(self):
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                os.close(fd)
+                return self
+            except FileExistsError:
+                try:
+                    if time.time() - os.path.getmtime(self.path) > self.stale_after:
+                        os.remove(self.path)  # Left behind by a crashed process
+                        continue
+                except OSError:
+                    continue
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"Could not acquire ledger lock {self.path}")
+                time.sleep(0.01)
+
+    def __exit__(self, *exc):
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+class JSONLedger:
+    """JSON file shared between processes; read-modify-write under the lock file"""
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = _LedgerLock(path + ".lock")
+
+    def _read(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write(self, data):
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+class IdentityLedger(JSONLedger):
+    """Persistent record of how far each phone counter has been reserved"""
+
+    def reserve(self, kind, count, namespace, origin=0):
+        """Reserve `count` consecutive counter values for kind; returns the first one
+
+        A kind the ledger has never seen starts at `origin`.
+        """
+        with self.lock:
+            data = self._read()
+            counters = data.setdefault("counters", {})
+            start = counters.get(kind, origin)
+            counters[kind] = start + count
+
+            history = data.setdefault("reservations", [])
+            history.append({"kind": kind, "start": start, "count": count,
+                            "namespace": namespace, "at": time.strftime("%Y-%m-%d %H:%M:%S")})
+            del history[:-200]  # Keep the file small; counters are the source of truth
+
+            self._write(data)
+        return start
+
+
+class IdentityGenerator:
+    """Hands out unique phones, emails and names for one run/worker namespace"""
+
+    def __init__(self, run_id=None, worker_id=None, ledger_path=None, key=None,
+                 block_size=None, slot=None, slots=None, pinned=None):
+        self.run_id = run_id or settings.RUN_ID
+        self.worker_id = worker_id or settings.WORKER_ID
+        self.namespace = f"{self.run_id}-{self.worker_id}"
+        self.ledger = IdentityLedger(ledger_path or settings.IDENTITY_LEDGER)
+        self.block_size = block_size or settings.IDENTITY_BLOCK_SIZE
+        self.slot = settings.IDENTITY_SLOT if slot is None else slot
+        self.slots = settings.IDENTITY_SLOTS if slots is None else slots
+        if pinned is None:
+            pinned = settings.IDENTITY_PINNED or key is not None or slot is not None
+        self.pinned = pinned
+
+        key = key or settings.IDENTITY_KEY
+        self._permutations = {
+            kind: FeistelPermutation(10 ** digits, f"{key}:{kind}")
+            for kind, (_prefix, digits) in PHONE_FORMATS.items()
+        }
+        self._blocks = {}          # kind -> [next, end]
+        self._lock = threading.Lock()
+        self._sequence = itertools.count(1)
+
+    # ── Phones ────────────────────────────────────────────────────────────────
+
+    def _slot_range(self, kind):
+        """(offset, size) of the index region owned by this machine's slot"""
+        size = self._permutations[kind].size // self.slots
+        return self.slot * size, size
+
+    def _reserve(self, kind, count):
+        offset, size = self._slot_range(kind)
+        # Unpinned: only used if the ledger is new; the lower half leaves room to continue
+        origin = 0 if self.pinned else secrets.randbelow(max(size // 2, 1))
+        start = self.ledger.reserve(kind, count, self.namespace, origin)
+        if start + count > size:
+            raise RuntimeError(f"Identity space for '{kind}' exhausted in slot {self.slot}")
+        return offset + start
+
+    def _next_index(self, kind):
+        with self._lock:
+            block = self._blocks.get(kind)
+            if block is None or block[0] >= block[1]:
+                start = self._reserve(kind, self.block_size)
+                block = self._blocks[kind] = [start, start + self.block_size]
+            index = block[0]
+            block[0] += 1
+            return index
+
+    def phone_number(self, kind="bd"):
+        """Next unique national number (digits only, as int) for the phone kind"""
+        return self._permutations[kind](self._next_index(kind))
+
+    def phone(self, kind="bd"):
+        """Next unique phone number string, e.g. +8801712345678"""
+        prefix, digits = PHONE_FORMATS[kind]
+        return f"{prefix}{self.phone_number(kind):0{digits}d}"
+
+    def bulk_phone_numbers(self, count, kind="bd"):
+        """Reserve and generate `count` unique numbers into a preallocated array('Q')
+
+        Use format_phone() to render individual entries; keeping millions of
+        identities as machine integers avoids millions of string objects.
+        """
+        numbers = array("Q", bytes(8 * count))
+        start = self._reserve(kind, count)
+        permute = self._permutations[kind]
+        for i in range(count):
+            numbers[i] = permute(start + i)
+        return numbers
+
+    @staticmethod
+    def format_phone(number, kind="bd"):
+        prefix, digits = PHONE_FORMATS[kind]
+        return f"{prefix}{number:0{digits}d}"
+
+    # ── Emails and names ──────────────────────────────────────────────────────
+
+    def token(self):
+        """Short unique token: run id, worker id and a per-process sequence number"""
+        return f"{self.run_id}{self.worker_id}x{next(self._sequence)}"
+
+    def email(self, base="artisan", domain="test.com"):
+        return f"{base}_{self.token()}@{domain}"
+
+    def name(self, base="Test", max_length=None):
+        name = f"{base} {self.token()}"
+        return name[-max_length:] if max_length and len(name) > max_length else name
+
+
+_default_generator = None
+_default_lock = threading.Lock()
+
+
+def default_generator():
+    """Process-wide generator for the current run and worker"""
+    global _default_generator
+    with _default_lock:
+        if _default_generator is None:
+            _default_generator = IdentityGenerator()
+        return _default_generator
@@ -0,0 +1,135 @@
+"""End-to-end journey definitions built on utils.workflow
+
+ARTISAN_JOURNEY: register -> appear in whitelist -> admin approves the
+artisan -> artisan logs in -> artisan creates a product -> admin approves
+the product. Waits poll the API instead of sleeping a fixed time.
+
+ProductProvisioner onboards one artisan of this run the same way and then
+creates products in a wanted status for the session product index.
+"""
+
+import threading
+from api.endpoints import Endpoints
+from config.register_test_data import generate_unique_email, generate_unique_phone
+from config.test_data_product_creation import ProductTestData
+from utils.cleanup import track_created
+from utils.workflow import Step, Wait, Workflow, extract_path
+
+
+def artisan_context(index=0, password="TestPassword123!"):
+    """Fresh identity for one artisan journey instance"""
+    return {
+        "index": index,
+        "email": generate_unique_email("test_artisan"),
+        "phone": generate_unique_phone(),
+        "password": password,
+    }
+
+
+def _whitelist_user_id(body, ctx):
+    for user in body.get("data") or []:
+        if user.get("email") == ctx["email"]:
+            return user.get("id")
+    return None
+
+
+def _product_id(body, ctx):
+    # Product creation answers with the product itself; tolerate an envelope too
+    return extract_path(body, ("id", "data.id"))
+
+
+def _product_status(status):
+    def check(response, ctx):
+        assert extract_path(response.json(), "data.status") in (status, None), \
+            f"product not {status}: {response.text[:200]}"
+    return check
+
+
+def artisan_journey(whitelist_timeout=30.0, login_timeout=30.0, approve_product=True):
+    steps = [
+        Step("register", lambda ctx: {
+            "method": "POST", "endpoint": Endpoints.REGISTER,
+            "json": {"f_name": "Test", "l_name": "Artisan", "phone": ctx["phone"],
+                     "email": ctx["email"], "password": ctx["password"]},
+        }, expect=201),
+        Step("find_in_whitelist", lambda ctx: {
+            "endpoint": Endpoints.WHITELIST_AUDIT, "params": {"search": ctx["email"], "page": 1, "limit": 10},
+        }, auth="admin",
+            wait=Wait(lambda response, ctx: response.status_code == 200
+                      and _whitelist_user_id(response.json(), ctx) is not None,
+                      timeout=whitelist_timeout),
+            extract={"user_id": _whitelist_user_id}),
+        Step("approve_artisan", lambda ctx: {
+            "method": "PATCH", "endpoint": Endpoints.WHITELIST_AUDIT,
+            "json": {"user_id": ctx["user_id"], "status": "approved", "reason": "Journey approval"},
+        }, auth="admin"),
+        Step("artisan_login", lambda ctx: {
+            "method": "POST", "endpoint": Endpoints.LOGIN,
+            "json": {"identifier": ctx["email"], "password": ctx["password"]},
+        }, wait=Wait(lambda response, ctx: response.status_code != 403, timeout=login_timeout),
+            extract={"artisan_token": ("data.access_token", "data.token")}),
+        Step("create_product", lambda ctx: {
+            "method": "POST", "endpoint": Endpoints.PRODUCTS,
+            "json": ProductTestData.get_valid_product_payload(status="pending"),
+        }, auth=lambda ctx: ctx["artisan_token"], expect=(200, 201),
+            extract={"product_id": _product_id}),
+    ]
+    if approve_product:
+        steps.append(Step("approve_product", lambda ctx: {
+            "method": "PATCH", "endpoint": Endpoints.PRODUCT_STATUS,
+            "json": {"product_id": ctx["product_id"], "status": "approved", "reason": "Journey approval"},
+        }, auth="admin", check=[_product_status("approved")]))
+    return Workflow("artisan_journey", steps)
+
+
+ARTISAN_JOURNEY = artisan_journey()
+
+
+class ProductProvisioner:
+    """provision(status) for ProductIndex: products of this run in the wanted status
+
+    The first call registers, approves and logs in one artisan (the journey
+    up to the login); every call then creates a product as that artisan and,
+    unless it should stay pending, sets its status as admin.
+    """
+
+    def __init__(self, client, ledger=None):
+        self.client = client
+        self.ledger = ledger  # Cleanup ledger for what gets created (default: CLEANUP_LEDGER)
+        self.onboarding = Workflow("artisan_onboarding", artisan_journey().steps[:4])
+        self._token = None
+        self._lock = threading.Lock()
+
+    def artisan_token(self):
+        with self._lock:
+            if self._token is None:
+                result = self.onboarding.run(self.client, artisan_context())
+                if not result["ok"]:
+                    raise RuntimeError(f"Could not onboard a provisioning artisan: {result['error']}")
+                context = result["context"]
+                track_created("artisan", {"id": context["user_id"], "email": context["email"]},
+                              ledger=self.ledger, base_url=self.client.base_url)
+                self._token = context["artisan_token"]
+            return self._token
+
+    def __call__(self, status):
+        try:
+            token = self.artisan_token()
+        except RuntimeError as e:
+            print(f"   ⚠ {e}")
+            return None
+        payload = ProductTestData.get_valid_product_payload(status="pending")
+        response = self.client.with_token(token).post(Endpoints.PRODUCTS, json=payload)
+        if response.status_code not in (200, 201):
+            return None
+        product = {"id": _product_id(response.json(), None), "name": payload["name"], "status": "pending_approval"}
+        if not product["id"]:
+            return None
+        track_created("product", product, ledger=self.ledger, base_url=self.client.base_url)
+        if status != "pending_approval":
+            response = self.client.as_role("admin").patch(Endpoints.PRODUCT_STATUS, json={
+                "product_id": product["id"], "status": status, "reason": "Provisioned for tests"})
+            if response.status_code != 200:
+                return None
+            product["status"] = status
+        return product
@@ -0,0 +1,148 @@
+"""Incremental JSON item streaming for large list responses"""
+
+import json
+import re
+
+# Structural characters outside strings / characters that matter inside strings
+_STRUCTURAL = re.compile(rb'["\[\]{},:]')
+_IN_STRING = re.compile(rb'["\\]')
+
+
+class JSONItemStream:
+    """Extracts the items of one array from a JSON document fed in byte chunks
+
+    With key="data" the items of the top-level object's "data" array are
+    yielded; with key=None the document itself must be an array. Only the
+    item currently being read is buffered, so memory stays bounded by the
+    largest single item rather than the whole response.
+    """
+
+    def __init__(self, key="data"):
+        self.key = key
+        self.found = False      # True once the target array has been entered
+        self.finished = False   # True once the target array has been closed
+        self._buf = bytearray()
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = None
+        self._last_string = None
+        self._current_key = None
+        self._item_depth = None
+        self._item_start = None
+
+    def feed(self, chunk):
+        """Feed a chunk of bytes and return the list of items it completed"""
+        if self.finished or not chunk:
+            return []
+
+        self._buf += chunk
+        items = []
+        buf = self._buf
+        pos = self._pos
+
+        while pos < len(buf) and not self.finished:
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                    pos += 1
+                    continue
+                match = _IN_STRING.search(buf, pos)
+                if not match:
+                    pos = len(buf)
+                    break
+                pos = match.start()
+                if buf[pos] == 0x5C:  # backslash
+                    if pos + 1 >= len(buf):
+                        self._escape = True
+                        pos += 1
+                        break
+                    pos += 2
+                    continue
+                self._in_string = False
+                if self._depth == 1 and self._item_depth is None and self._string_start is not None:
+                    self._last_string = bytes(buf[self._string_start:pos + 1])
+                self._string_start = None
+                pos += 1
+                continue
+
+            match = _STRUCTURAL.search(buf, pos)
+            if not match:
+                pos = len(buf)
+                break
+            pos = match.start()
+            char = buf[pos]
+
+            if char == 0x22:  # "
+                self._in_string = True
+                self._string_start = pos
+            elif char in (0x7B, 0x5B):  # { [
+                if self._item_depth is None and self._enters_target(char):
+                    self._item_depth = self._depth + 1
+                    self._item_start = pos + 1
+                    self.found = True
+                self._depth += 1
+            elif char in (0x7D, 0x5D):  # } ]
+                if self._item_depth is not None and self._depth == self._item_depth:
+                    self._emit(buf, pos, items)
+                    self.finished = True
+                self._depth -= 1
+            elif char == 0x3A:  # :
+                if self._depth == 1 and self._item_depth is None:
+                    self._current_key = self._last_string
+            elif char == 0x2C:  # ,
+                if self._item_depth is not None and self._depth == self._item_depth:
+                    self._emit(buf, pos, items)
+                    self._item_start = pos + 1
+                elif self._depth == 1:
+                    self._current_key = None
+            pos += 1
+
+        self._pos = pos
+        self._compact()
+        return items
+
+    def _enters_target(self, char):
+        """Check whether the container opening now is the array we want"""
+        if char != 0x5B:
+            return False
+        if self.key is None:
+            return self._depth == 0
+        if self._depth != 1 or self._current_key is None:
+            return False
+        try:
+            return json.loads(self._current_key) == self.key
+        except ValueError:
+            return False
+
+    def _emit(self, buf, end, items):
+        """Decode the item between the current item start and end"""
+        raw = bytes(buf[self._item_start:end]).strip()
+        if raw:
+            items.append(json.loads(raw))
+
+    def _compact(self):
+        """Drop bytes that can no longer be part of a pending token or item"""
+        keep_from = self._pos
+        if self._item_start is not None and not self.finished:
+            keep_from = min(keep_from, self._item_start)
+        if self._string_start is not None:
+            keep_from = min(keep_from, self._string_start)
+        if keep_from:
+            del self._buf[:keep_from]
+            self._pos -= keep_from
+            if self._item_start is not None:
+                self._item_start -= keep_from
+            if self._string_start is not None:
+                self._string_start -= keep_from
+
+
+def iter_json_items(chunks, key="data"):
+    """Yield array items from an iterable of byte chunks as soon as each completes"""
+    stream = JSONItemStream(key=key)
+    for chunk in chunks:
+        for item in stream.feed(chunk):
+            yield item
+        if stream.finished:
+            return
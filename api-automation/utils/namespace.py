@@ -0,0 +1,95 @@
+"""Run-scoped namespace for test data shared with other pipelines on UAT
+
+Every name and email the suite generates carries the run id (settings.RUN_ID,
+shared by all xdist workers of one run), e.g.
+
+    test_artisan_a1b2c3gw0x7@test.com     Test Product a1b2c3gw1x3
+
+so a run can search and list only its own data instead of whatever other
+pipelines created at the same time:
+
+    ns = current_namespace()
+    params = ns.search_params({"page": 1}, base="test_artisan")
+    mine = ns.filter(users, "email")
+
+Phone numbers cannot carry the run id (fixed national format); they stay
+unique through the identity ledger, and CI machines without a shared ledger
+use disjoint IDENTITY_SLOT / IDENTITY_SLOTS (see utils/identity.py).
+
+NAMESPACE_SCOPE=off restores the old shared behaviour (searches by the bare
+prefix, approvals may use any pending product).
+"""
+
+import re
+import threading
+from config.settings import settings
+from utils.identity import default_generator
+
+
+class Namespace:
+    """Names, emails and search scoping for one run"""
+
+    def __init__(self, run_id=None, generator=None, enabled=None):
+        self.run_id = run_id or settings.RUN_ID
+        self.generator = generator
+        self.enabled = (settings.NAMESPACE_SCOPE != "off") if enabled is None else enabled
+        # The run id starts the identity token after a "_" (emails) or a " " (names)
+        self._pattern = re.compile(rf"(?:^|[_ \-]){re.escape(self.run_id)}")
+
+    def _identity(self):
+        return self.generator or default_generator()
+
+    # ── Generation ────────────────────────────────────────────────────────────
+
+    def email(self, base="artisan", domain="test.com"):
+        return self._identity().email(base, domain)
+
+    def name(self, base="Test", max_length=None):
+        return self._identity().name(base, max_length)
+
+    def slug(self, base):
+        """Name without spaces (technique names, codes): base-<token>"""
+        return f"{base}-{self._identity().token()}"
+
+    def phone(self, kind="bd"):
+        return self._identity().phone(kind)
+
+    # ── Scoping ───────────────────────────────────────────────────────────────
+
+    def search_term(self, base=None):
+        """Term matching this run's data: "<base>_<run id>" for emails, the run id otherwise"""
+        if not self.enabled:
+            return base
+        return f"{base}_{self.run_id}" if base else self.run_id
+
+    def search_params(self, params=None, base=None):
+        """Copy of listing params with the search scoped to this run"""
+        params = dict(params or {})
+        term = self.search_term(base)
+        if term:
+            params["search"] = term
+        return params
+
+    def owns(self, value):
+        """True if a generated name/email belongs to this run (always True when scoping is off)"""
+        if not self.enabled:
+            return True
+        return bool(value) and self._pattern.search(str(value)) is not None
+
+    def filter(self, items, *fields):
+        """Items where any of `fields` (default: name, email) belongs to this run"""
+        fields = fields or ("name", "email")
+        return [item for item in items if any(self.owns(item.get(field)) for field in fields)]
+
+
+_current_namespace = None
+_namespace_lock = threading.Lock()
+
+
+def current_namespace():
+    """Process-wide namespace of this run"""
+    global _current_namespace
+    with _namespace_lock:
+        if _current_namespace is None:
+            _current_namespace = Namespace()
+        return _current_namespace
@@ -0,0 +1,172 @@
+"""Immutable copy-on-write payload templates for test-data factories
+
+A PayloadTemplate freezes its base payload once (dicts become FrozenDict,
+lists become FrozenList, a tuple subclass). Concrete payloads are built by
+applying path patches such as {"materials.0.price": 10}: only the
+containers along each patched path are copied, every other subtree is
+shared with the template. The returned root is a plain dict, so tests can
+still set or delete top-level fields; nested containers are read-only and
+raise TypeError on mutation instead of silently leaking changes into other
+tests.
+
+    template = PayloadTemplate({"name": "x", "materials": [{"price": 1}]})
+    payload = template.build({"materials.0.price": 2}, name="y")
+
+Nothing is mutated after construction, so templates can be shared freely
+between threads and asyncio tasks.
+"""
+
+REMOVE = object()   # Patch value that deletes the key / list item at the path
+
+_path_cache = {}
+
+
+class FrozenDict(dict):
+    """Read-only dict; serialises like a normal dict (json, requests, orjson)"""
+
+    __slots__ = ()
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Payload template data is read-only; use a path patch or thaw()")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    update = pop = popitem = clear = setdefault = _readonly
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+
+class FrozenList(tuple):
+    """Read-only list (a tuple) marking data that came from a template"""
+
+    __slots__ = ()
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return (FrozenList, (tuple(self),))
+
+
+FROZEN_TYPES = (FrozenDict, FrozenList)
+
+
+def freeze(value):
+    """Recursively convert dicts/lists into FrozenDict/FrozenList (frozen values are reused)"""
+    if isinstance(value, FROZEN_TYPES):
+        return value
+    if isinstance(value, dict):
+        return FrozenDict({k: freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return FrozenList(freeze(v) for v in value)
+    return value
+
+
+def thaw(value):
+    """Recursively convert frozen data back into ordinary mutable dicts/lists"""
+    if isinstance(value, dict):
+        return {k: thaw(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(v) for v in value]
+    return value
+
+
+def _split(path):
+    """'materials.0.price' -> ('materials', 0, 'price'); tuples pass through"""
+    if isinstance(path, tuple):
+        return path
+    parts = _path_cache.get(path)
+    if parts is None:
+        parts = tuple(int(p) if p.lstrip("-").isdigit() else p for p in path.split("."))
+        _path_cache[path] = parts
+    return parts
+
+
+def _assign(node, parts, value):
+    """Return a copy of node with value placed at parts; untouched children are shared"""
+    key, rest = parts[0], parts[1:]
+
+    if isinstance(node, tuple):
+        if not isinstance(key, int):
+            raise KeyError(f"List index expected, got '{key}'")
+        items = list(node)
+        if key == len(items) and not rest and value is not REMOVE:
+            items.append(value)          # Index == length appends
+        elif rest:
+            items[key] = _assign(items[key], rest, value)
+        elif value is REMOVE:
+            del items[key]
+        else:
+            items[key] = value
+        return FrozenList(items)
+
+    if isinstance(node, dict):
+        items = dict(node)
+        if rest:
+            child = items[key] if key in items else FrozenDict()
+            items[key] = _assign(child, rest, value)
+        elif value is REMOVE:
+            items.pop(key, None)
+        else:
+            items[key] = value
+        return FrozenDict(items)
+
+    raise KeyError(f"Cannot patch into {type(node).__name__} at '{key}'")
+
+
+class PayloadTemplate:
+    """Frozen base payload that builds concrete payloads through path patches"""
+
+    __slots__ = ("base",)
+
+    def __init__(self, base):
+        self.base = freeze(base)
+
+    def build(self, patches=None, **overrides):
+        """New payload: a plain top-level dict sharing every unpatched subtree
+
+        patches maps dotted paths (or key tuples) to values; keyword
+        overrides replace top-level fields. REMOVE deletes the target.
+        """
+        payload = dict(self.base)
+        if patches:
+            for path, value in patches.items():
+                parts = _split(path)
+                if len(parts) == 1:
+                    overrides[parts[0]] = value
+                    continue
+                key = parts[0]
+                payload[key] = _assign(payload[key] if key in payload else FrozenDict(),
+                                       parts[1:], freeze(value))
+        for key, value in overrides.items():
+            if value is REMOVE:
+                payload.pop(key, None)
+            else:
+                payload[key] = freeze(value)
+        return payload
+
+    def derive(self, patches=None, **overrides):
+        """New template with the patches baked in"""
+        return PayloadTemplate(self.build(patches, **overrides))
+
+    def get(self, path, default=None):
+        """Read a value from the template by dotted path"""
+        node = self.base
+        try:
+            for key in _split(path):
+                node = node[key]
+        except (KeyError, IndexError, TypeError):
+            return default
+        return node
+
+    def __repr__(self):
+        return f"PayloadTemplate({dict(self.base)!r})"
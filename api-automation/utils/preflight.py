@@ -0,0 +1,192 @@
+"""Preflight readiness check for the target environment
+
+Replaces the old verify_uat.py / test_api_speed.py scripts. Instead of
+registering a real user serially, it probes read-only endpoints
+concurrently and finishes in a few seconds:
+
+  phase 1: HEALTH (sampled for baseline latency), STATUS, and a login for
+           every configured role (admin, test user, artisan if configured)
+  phase 2: one read-only listing per subsystem (products, techniques,
+           whitelist) with the admin token
+
+Required checks are HEALTH and the admin login. The worst baseline latency
+picks a recommended concurrency for batch helpers (LOAD_CONCURRENCY).
+
+    python -m utils.preflight             # UAT, exit code 1 if not ready
+    python -m utils.preflight --stub      # Against a local stub server
+
+The pytest session runs it once before the first UAT test (offline-only
+runs skip it); PREFLIGHT=abort stops the session, PREFLIGHT=breaker (the
+default) opens the UAT circuit so UAT tests are skipped with the reason,
+PREFLIGHT=off disables it.
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from api.client import APIClient
+from api.endpoints import Endpoints
+from config.settings import settings
+from perf.stats import percentile
+
+
+def configured_roles():
+    """role -> (identifier, password) for every role with credentials in the environment"""
+    roles = {"admin": (settings.ADMIN_EMAIL, settings.ADMIN_PASSWORD)}
+    if settings.TEST_USER_IDENTIFIER != settings.ADMIN_EMAIL:
+        roles["test_user"] = (settings.TEST_USER_IDENTIFIER, settings.TEST_USER_PASSWORD)
+    artisan = os.getenv("ARTISAN_IDENTIFIER") or os.getenv("ARTISAN_PHONE") or os.getenv("ARTISAN_EMAIL")
+    if artisan and os.getenv("ARTISAN_PASSWORD"):
+        roles["artisan"] = (artisan, os.getenv("ARTISAN_PASSWORD"))
+    return roles
+
+
+def default_checks(roles):
+    """(phase 1, phase 2) check definitions"""
+    first = [
+        {"name": "health", "endpoint": Endpoints.HEALTH, "required": True, "samples": 3},
+        {"name": "status", "endpoint": Endpoints.STATUS, "required": False},
+    ]
+    for role, (identifier, password) in roles.items():
+        first.append({"name": f"login:{role}", "method": "POST", "endpoint": Endpoints.LOGIN,
+                      "json": {"identifier": identifier, "password": password},
+                      "required": role == "admin", "login_as": role})
+    listing = {"page": 1, "limit": 1}
+    second = [
+        {"name": "list:products", "endpoint": Endpoints.PRODUCTS, "params": listing, "auth": "admin"},
+        {"name": "list:techniques", "endpoint": Endpoints.TECHNIQUES, "params": listing, "auth": "admin"},
+        {"name": "list:whitelist", "endpoint": Endpoints.WHITELIST_AUDIT, "params": listing, "auth": "admin"},
+    ]
+    return first, second
+
+
+class Preflight:
+    """Runs the checks concurrently and builds the readiness report"""
+
+    def __init__(self, base_url=None, roles=None, timeout=None, concurrency=8):
+        self.client = APIClient(base_url=base_url or settings.BASE_URL)
+        self.client.request_delay = 0
+        self.roles = configured_roles() if roles is None else roles
+        self.timeout = timeout or settings.PREFLIGHT_TIMEOUT
+        self.concurrency = concurrency
+        self.tokens = {}
+
+    def _run_check(self, check):
+        result = {"name": check["name"], "endpoint": check["endpoint"], "required": check.get("required", False),
+                  "ok": False, "status_code": None, "latency": None, "error": None}
+        auth = check.get("auth")
+        if auth and auth not in self.tokens:
+            result["error"] = f"no {auth} token (login failed)"
+            return result
+
+        view = self.client.with_token(self.tokens.get(auth), role=auth)
+        latencies = []
+        try:
+            for _ in range(check.get("samples", 1)):
+                start = time.perf_counter()
+                response = view.request(check.get("method", "GET"), check["endpoint"], json=check.get("json"),
+                                        params=check.get("params"), timeout=self.timeout)
+                latencies.append(time.perf_counter() - start)
+                if response.status_code != 200:
+                    break
+        except Exception as e:
+            result["error"] = f"{type(e).__name__}: {e}"
+            return result
+
+        result.update(status_code=response.status_code, latency=percentile(latencies, 50),
+                      ok=response.status_code == 200)
+        if not result["ok"]:
+            result["error"] = f"HTTP {response.status_code}: {response.text[:120]}"
+        elif check.get("login_as"):
+            data = response.json().get("data") or {}
+            token = data.get("access_token") or data.get("token")
+            if token:
+                self.tokens[check["login_as"]] = token
+            else:
+                result.update(ok=False, error="login answered 200 without a token")
+        return result
+
+    def run(self, checks=None):
+        start = time.perf_counter()
+        phases = checks or default_checks(self.roles)
+        results = []
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="preflight") as pool:
+            for phase in phases:
+                results += list(pool.map(self._run_check, phase))
+
+        failed = [r for r in results if r["required"] and not r["ok"]]
+        report = {
+            "base_url": self.client.base_url,
+            "ok": not failed,
+            "reason": "; ".join(f"{r['name']}: {r['error']}" for r in failed) or None,
+            "elapsed": time.perf_counter() - start,
+            "checks": results,
+        }
+        report["recommended_concurrency"] = recommend_concurrency(report)
+        return report
+
+
+def recommend_concurrency(report, maximum=None, slow=None):
+    """Full concurrency on a fast environment, half when slow-ish, 1 when slower than `slow` seconds"""
+    maximum = maximum or settings.LOAD_CONCURRENCY
+    slow = slow or settings.PREFLIGHT_SLOW_LATENCY
+    latencies = [c["latency"] for c in report["checks"] if c["ok"] and c["latency"] is not None]
+    if not report["ok"] or not latencies:
+        return 1
+    worst = max(latencies)
+    if worst >= slow:
+        return 1
+    if worst >= slow / 2:
+        return max(1, maximum // 2)
+    return maximum
+
+
+def run_preflight(base_url=None, roles=None):
+    return Preflight(base_url, roles).run()
+
+
+def print_report(report):
+    print(f"\n{'='*70}")
+    print(f"PREFLIGHT: {report['base_url']}")
+    print(f"{'='*70}")
+    for check in report["checks"]:
+        mark = "✓" if check["ok"] else ("❌" if check["required"] else "⚠")
+        latency = f"{check['latency']:.3f}s" if check["latency"] is not None else "-"
+        detail = f" ({check['error']})" if check["error"] else ""
+        print(f"   {mark} {check['name']:<18} {str(check['status_code'] or '-'):<5} {latency:>8}{detail}")
+    print(f"   Recommended concurrency: {report['recommended_concurrency']}")
+    print(f"   {'✅ READY' if report['ok'] else '❌ NOT READY: ' + report['reason']} "
+          f"(checked in {report['elapsed']:.2f}s)")
+    print(f"{'='*70}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that the target environment is ready for a test run")
+    parser.add_argument("--stub", action="store_true", help="Check a local stub server instead")
+    parser.add_argument("--base-url", default=settings.BASE_URL)
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    stub = None
+    base_url, roles = args.base_url, None
+    if args.stub:
+        from utils.stub_server import StubAPIServer
+        stub = StubAPIServer().start()
+        base_url = stub.base_url
+        roles = {"admin": (stub.admin_identifier, stub.admin_password)}
+    try:
+        report = run_preflight(base_url, roles)
+        if args.json:
+            print(json.dumps(report, indent=2))
+        else:
+            print_report(report)
+        return 0 if report["ok"] else 1
+    finally:
+        if stub:
+            stub.stop()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,136 @@
+"""Session-level product index - hands out product ids by status without re-listing"""
+
+import threading
+import zlib
+from api.endpoints import Endpoints
+from api.paginator import Paginator
+from config.settings import settings
+
+
+class ProductIndex:
+    """Snapshot of product ids grouped by status, kept current by the suite's own PATCHes
+
+    Each status is crawled once (lazily, on first use) with the Paginator.
+    acquire() leases an id so concurrent tests never receive the same
+    product; record_status() moves an id to its new bucket after an
+    approval/rejection and ends the lease. Under pytest-xdist every worker
+    only sees its own hash partition of the ids, so workers never collide
+    either.
+
+    With a namespace (utils.namespace) only products named in this run's
+    namespace are indexed, so concurrent pipelines never approve each
+    other's products; provision(status) then creates one when a status
+    bucket runs dry and returns it as a product dict.
+    """
+
+    def __init__(self, client, max_items=None, worker_index=None, worker_count=None,
+                 namespace=None, provision=None):
+        self.client = client
+        self.namespace = namespace
+        self.provision = provision
+        self.max_items = max_items or settings.PRODUCT_INDEX_MAX_ITEMS
+        self.worker_index = settings.WORKER_INDEX if worker_index is None else worker_index
+        self.worker_count = settings.WORKER_COUNT if worker_count is None else worker_count
+
+        self.listing_requests = 0
+        self._lock = threading.Lock()
+        self._loaded = {}       # status -> Event set once crawled
+        self._status = {}       # product_id -> status
+        self._names = {}        # product_id -> name
+        self._leased = set()
+
+    def _owns(self, product_id):
+        """True if this worker's partition contains the product id"""
+        if self.worker_count <= 1:
+            return True
+        return zlib.crc32(product_id.encode()) % self.worker_count == self.worker_index
+
+    def load(self, status):
+        """Crawl one status bucket (no-op once loaded; a failed crawl is retried next time)"""
+        with self._lock:
+            loaded = self._loaded.get(status)
+            if loaded is None:
+                self._loaded[status] = threading.Event()
+        if loaded is not None:
+            loaded.wait()  # Another thread is (or was) crawling this status
+            if self._loaded.get(status) is not loaded:
+                self.load(status)  # That crawl failed; try again
+            return
+
+        params = {"status": status}
+        if self.namespace is not None:
+            params = self.namespace.search_params(params)
+        paginator = Paginator(self.client, Endpoints.PRODUCTS, params=params, limit=50)
+        found = []
+        crawled = False
+        try:
+            for product in paginator:
+                product_id = product.get("id")
+                if (product_id and product.get("status") == status and self._owns(product_id)
+                        and (self.namespace is None or self.namespace.owns(product.get("name")))):
+                    found.append(product)
+                    if len(found) >= self.max_items:
+                        break
+            crawled = paginator.pages_fetched > 0  # Page 1 failing lists nothing
+        finally:
+            with self._lock:
+                self.listing_requests += paginator.pages_fetched
+                for product in found:
+                    # Status changes recorded during this session win over the snapshot
+                    self._status.setdefault(product["id"], status)
+                    self._names.setdefault(product["id"], product.get("name", "N/A"))
+                # A failed crawl is not remembered, so the next lease lists the status again
+                event = self._loaded[status] if crawled else self._loaded.pop(status)
+            event.set()
+
+    def acquire(self, status=None):
+        """Lease an id in the given status (any loaded status if None); None if exhausted"""
+        if status is not None:
+            self.load(status)
+
+        with self._lock:
+            for product_id, product_status in self._status.items():
+                if product_id in self._leased:
+                    continue
+                if status is None or product_status == status:
+                    self._leased.add(product_id)
+                    return product_id
+
+        if status is None or self.provision is None:
+            return None
+        product = self.provision(status)
+        if not product or not product.get("id"):
+            return None
+        with self._lock:
+            self._status[product["id"]] = status
+            self._names[product["id"]] = product.get("name", "N/A")
+            self._leased.add(product["id"])
+        return product["id"]
+
+    def release(self, product_id):
+        """Return a leased id to the pool unchanged"""
+        with self._lock:
+            self._leased.discard(product_id)
+
+    def record_status(self, product_id, status):
+        """Move a product to a new status bucket and end its lease"""
+        with self._lock:
+            self._status[product_id] = status
+            self._leased.discard(product_id)
+
+    def record_response(self, payload, response):
+        """Update the index from a PRODUCT_STATUS PATCH payload and its response"""
+        product_id = payload.get("product_id")
+        if response.status_code == 200 and product_id in self._status:
+            self.record_status(product_id, payload.get("status"))
+
+    def name(self, product_id):
+        return self._names.get(product_id, "N/A")
+
+    def counts(self):
+        """Number of known products per status (leased ones included)"""
+        with self._lock:
+            counts = {}
+            for status in self._status.values():
+                counts[status] = counts.get(status, 0) + 1
+            return counts
@@ -0,0 +1,276 @@
+"""Reference data snapshot: valid technique ids, file ids and units per environment
+
+Product payloads used to carry hard-coded technique/file UUIDs, so every
+product test failed whenever UAT data changed. Once per session the loader
+fetches techniques, files and units concurrently (admin token, no client
+delay), keeps only usable entries (UUID id, active, not deleted) and caches
+them per base URL in .reference_data.json until REFERENCE_DATA_TTL expires:
+
+    snapshot = load_reference_data()          # or ReferenceDataLoader(client).load()
+    ProductTestData.use_reference(snapshot)   # payload factories now use live ids
+
+A collection that cannot be fetched falls back to the cached (even stale)
+values, then to the built-in FALLBACK ids, and the snapshot says which
+source each collection came from. Static test-case tables refer to
+entries with placeholders (TECHNIQUE[0], FILE[1]) that resolve() replaces.
+
+    python -m utils.reference_data            # Fetch and print the UAT snapshot
+    python -m utils.reference_data --stub     # Against a local stub server
+"""
+
+import argparse
+import json
+import logging
+import os
+import tempfile
+import time
+import uuid
+from api.client import APIClient
+from api.endpoint_discovery import login_token
+from api.endpoints import Endpoints
+from config.settings import settings
+from utils.identity import JSONLedger
+
+logger = logging.getLogger(__name__)
+
+# Ids the payloads were written against; used when nothing better is known
+FALLBACK = {
+    "techniques": ["8fc243e7-d556-43b6-81a8-392d30b586c5", "fcae2e4e-b8b5-4a5f-b879-111896c2e849"],
+    "files": ["d4f9620a-dc9e-4946-86e5-4ccd6f1645cc", "58a82002-020b-4e12-917f-5fcb3dccd29d"],
+    "units": ["kg"],
+}
+
+COLLECTIONS = {
+    "techniques": Endpoints.TECHNIQUES,
+    "files": Endpoints.FILES,
+    "units": Endpoints.UNITS,
+}
+
+LISTING_PARAMS = {"page": 1, "limit": 50}
+
+
+class RefId:
+    """Placeholder for the index-th valid entry of a collection, filled in by resolve()"""
+
+    __slots__ = ("collection", "index")
+
+    def __init__(self, collection, index):
+        self.collection = collection
+        self.index = index
+
+    def __repr__(self):
+        return f"<{self.collection}[{self.index}]>"
+
+
+class _Refs:
+    def __init__(self, collection):
+        self.collection = collection
+
+    def __getitem__(self, index):
+        return RefId(self.collection, index)
+
+
+TECHNIQUE, FILE, UNIT = _Refs("techniques"), _Refs("files"), _Refs("units")
+
+
+def _usable_ids(items):
+    ids = []
+    for item in items:
+        if not isinstance(item, dict) or item.get("is_active") is False or item.get("deleted") is True:
+            continue
+        try:
+            ids.append(str(uuid.UUID(str(item.get("id")))))
+        except ValueError:
+            continue
+        ids += _usable_ids(item.get("children") or [])  # Sub-techniques are valid product techniques too
+    return ids
+
+
+def _usable_units(items):
+    units = []
+    for item in items:
+        value = item if isinstance(item, str) else (item or {}).get("code") or (item or {}).get("name")
+        if isinstance(value, str) and value.strip():
+            units.append(value.strip())
+    return units
+
+
+VALIDATORS = {"techniques": _usable_ids, "files": _usable_ids, "units": _usable_units}
+
+
+class ReferenceSnapshot:
+    """Valid values per collection for one environment, and where each came from"""
+
+    def __init__(self, base_url, values, sources=None, errors=None, fetched_at=None):
+        self.base_url = base_url
+        self.values = {name: list(values.get(name) or FALLBACK[name]) for name in FALLBACK}
+        self.sources = sources or {name: "fallback" for name in FALLBACK}
+        self.errors = errors or {}
+        self.fetched_at = fetched_at
+
+    def value(self, collection, index=0):
+        values = self.values[collection]
+        return values[index % len(values)]
+
+    def technique_id(self, index=0):
+        return self.value("techniques", index)
+
+    def file_id(self, index=0):
+        return self.value("files", index)
+
+    def unit(self, index=0):
+        return self.value("units", index)
+
+    def techniques(self, count=1):
+        return [{"id": self.technique_id(i), "deleted": False} for i in range(count)]
+
+    def files(self, count=1):
+        return [{"id": self.file_id(i), "is_active": True, "deleted": False} for i in range(count)]
+
+    def resolve(self, value):
+        """Copy of value with every RefId replaced by the real id/unit"""
+        if isinstance(value, RefId):
+            return self.value(value.collection, value.index)
+        if isinstance(value, dict):
+            return {key: self.resolve(item) for key, item in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [self.resolve(item) for item in value]
+        return value
+
+    def summary(self):
+        return ", ".join(f"{name}: {len(values)} ({self.sources[name]})" for name, values in self.values.items())
+
+
+class ReferenceDataLoader:
+    """Fetches, validates and caches the reference collections of one environment"""
+
+    def __init__(self, client, path=None, ttl=None):
+        self.client = client
+        self.client.request_delay = 0
+        self.cache = JSONLedger(path or settings.REFERENCE_DATA_CACHE)
+        self.ttl = settings.REFERENCE_DATA_TTL if ttl is None else ttl
+
+    def fetch(self, fresh=False):
+        """collection -> (usable values, error or None), all collections concurrently
+
+        fresh drops the HTTP cache entries of the collections first.
+        """
+        if fresh and self.client.http_cache is not None:
+            for name in COLLECTIONS:
+                self.client.http_cache.invalidate(name, self.client.base_url)
+        specs = [{"endpoint": endpoint, "params": LISTING_PARAMS} for endpoint in COLLECTIONS.values()]
+        fetched = {}
+        for name, result in zip(COLLECTIONS, self.client.map(specs, concurrency=len(specs))):
+            if result["error"] is not None:
+                fetched[name] = ([], f"{type(result['error']).__name__}: {result['error']}")
+            elif result["status_code"] != 200:
+                fetched[name] = ([], f"HTTP {result['status_code']}")
+            else:
+                try:
+                    items = result["response"].json().get("data", [])
+                except ValueError:
+                    items = None
+                values = VALIDATORS[name](items) if isinstance(items, list) else []
+                fetched[name] = (values, None if values else "no usable entries")
+        return fetched
+
+    def cached(self):
+        """Cached entry for this environment, or None"""
+        with self.cache.lock:
+            return self.cache._read().get(self.client.base_url)
+
+    def load(self, refresh=False):
+        """Snapshot from the cache while fresh, else fetched (falling back per collection)"""
+        base_url = self.client.base_url
+        entry = self.cached()
+        if entry and not refresh and time.time() - entry["fetched_at"] < self.ttl:
+            sources = {name: "cache" if entry["values"].get(name) else "fallback" for name in FALLBACK}
+            return ReferenceSnapshot(base_url, entry["values"], sources,
+                                     fetched_at=entry["fetched_at"])
+
+        fetched = self.fetch(fresh=refresh)
+        values, sources, errors = {}, {}, {}
+        for name in COLLECTIONS:
+            found, error = fetched[name]
+            if error:
+                errors[name] = error
+                logger.warning(f"Reference data {name} not fetched from {base_url}: {error}")
+            if found:
+                values[name], sources[name] = found, "live"
+            elif entry and entry["values"].get(name):
+                values[name], sources[name] = entry["values"][name], "stale cache"
+            else:
+                values[name], sources[name] = FALLBACK[name], "fallback"
+
+        fetched_at = time.time()
+        if any(source == "live" for source in sources.values()):
+            with self.cache.lock:
+                data = self.cache._read()
+                live = {name: values[name] for name in COLLECTIONS if sources[name] == "live"}
+                previous = (data.get(base_url) or {}).get("values", {})
+                data[base_url] = {"fetched_at": fetched_at, "values": {**previous, **live}}
+                self.cache._write(data)
+        return ReferenceSnapshot(base_url, values, sources, errors, fetched_at)
+
+
+def load_reference_data(base_url=None, identifier=None, password=None, refresh=False, path=None):
+    """Log in as admin (for files) and load the snapshot of base_url"""
+    client = APIClient(base_url=base_url or settings.BASE_URL)
+    client.request_delay = 0
+    try:
+        token = login_token(client.post(Endpoints.LOGIN, json={
+            "identifier": identifier or settings.ADMIN_EMAIL,
+            "password": password or settings.ADMIN_PASSWORD,
+        }))
+        if token:
+            client.set_auth_token(token)
+    except Exception as e:
+        logger.warning(f"Reference data loader could not log in: {e}")
+    return ReferenceDataLoader(client, path=path).load(refresh=refresh)
+
+
+def print_snapshot(snapshot):
+    print(f"\n{'='*70}")
+    print(f"REFERENCE DATA: {snapshot.base_url}")
+    print(f"{'='*70}")
+    for name, values in snapshot.values.items():
+        mark = {"live": "✓", "cache": "✓"}.get(snapshot.sources[name], "⚠")
+        error = f" ({snapshot.errors[name]})" if name in snapshot.errors else ""
+        print(f"   {mark} {name:<11} {len(values):>3} from {snapshot.sources[name]}{error}")
+    print(f"{'='*70}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fetch and cache valid technique ids, file ids and units")
+    parser.add_argument("--stub", action="store_true", help="Load from a local stub server instead")
+    parser.add_argument("--base-url", default=settings.BASE_URL)
+    parser.add_argument("--refresh", action="store_true", help="Ignore a fresh cache entry")
+    parser.add_argument("--json", action="store_true", help="Print the snapshot values as JSON")
+    args = parser.parse_args()
+
+    stub = scratch = None
+    base_url, identifier, password, path = args.base_url, None, None, None
+    if args.stub:
+        from utils.stub_server import StubAPIServer
+        stub = StubAPIServer().start()
+        stub.seed_techniques(3, children=1)
+        stub.seed_files(2)
+        stub.seed_units("kg", "pcs")
+        scratch = tempfile.TemporaryDirectory()  # Keep stub ports out of the real cache
+        base_url, identifier, password = stub.base_url, stub.admin_identifier, stub.admin_password
+        path = os.path.join(scratch.name, "reference_data.json")
+    try:
+        snapshot = load_reference_data(base_url, identifier, password, refresh=args.refresh, path=path)
+        if args.json:
+            print(json.dumps(snapshot.values, indent=2))
+        else:
+            print_snapshot(snapshot)
+        return 0 if "fallback" not in snapshot.sources.values() else 1
+    finally:
+        if stub:
+            stub.stop()
+            scratch.cleanup()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
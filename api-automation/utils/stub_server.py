@@ -0,0 +1,601 @@
+"""Local stub of the Teresa API for offline tests, benchmarks and load drivers
+
+The server runs on its own asyncio loop in a background thread, speaks
+HTTP/1.1 with keep-alive and mimics the response envelope used by UAT:
+
+    {"success": true, "message": "...", "data": [...], "meta": {"pagination": {...}}}
+
+Usage:
+    with StubAPIServer() as stub:
+        stub.seed_products(50, status="pending_approval")
+        client = APIClient(base_url=stub.base_url)
+
+Or standalone:
+    python -m utils.stub_server --port 8000 --products 500
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import threading
+import time
+import uuid
+from urllib.parse import urlsplit, parse_qsl
+
+REASONS = {
+    200: "OK", 201: "Created", 204: "No Content", 304: "Not Modified",
+    400: "Bad Request", 401: "Unauthorized", 403: "Forbidden", 404: "Not Found",
+    409: "Conflict", 422: "Unprocessable Entity", 429: "Too Many Requests",
+    500: "Internal Server Error", 503: "Service Unavailable",
+}
+
+
+class StubRequest:
+    """Parsed request handed to route handlers"""
+
+    def __init__(self, method, path, query, headers, body, path_params=None):
+        self.method = method
+        self.path = path
+        self.query = query
+        self.headers = headers
+        self.body = body
+        self.path_params = path_params or {}
+
+    def json(self):
+        if not self.body:
+            return {}
+        return json.loads(self.body)
+
+    @property
+    def token(self):
+        auth = self.headers.get("authorization", "")
+        return auth[7:] if auth.startswith("Bearer ") else None
+
+# Collection sizes POST /products accepts (ProductTestData.VALIDATION_LIMITS)
+PRODUCT_LIMITS = {"materials": 100, "techniques": 50, "files": 15, "measurements": 20}
+
+
+def envelope(data=None, message="Success", success=True, **extra):
+    """Build a response body in the API's standard envelope"""
+    body = {"success": success, "message": message}
+    if data is not None:
+        body["data"] = data
+    body.update(extra)
+    return body
+
+
+def validation_error(field, message):
+    """422 response in the API's validation error format"""
+    return 422, envelope(message="Validation failed", success=False,
+                         errors=[{"field": field, "message": message}])
+
+
+def paginate(items, query, default_limit=10):
+    """Slice items by page/limit query params and build the pagination meta"""
+    page = max(int(query.get("page", 1) or 1), 1)
+    limit = max(int(query.get("limit", default_limit) or default_limit), 1)
+    total = len(items)
+    total_pages = (total + limit - 1) // limit
+    start = (page - 1) * limit
+    pagination = {
+        "page": page,
+        "limit": limit,
+        "total": total,
+        "total_pages": total_pages,
+        "has_next": page < total_pages,
+        "has_prev": page > 1,
+    }
+    return items[start:start + limit], {"pagination": pagination}
+
+
+def parse_multipart(body, content_type):
+    """[(part headers, part content)] of a multipart/form-data body"""
+    boundary = content_type.partition("boundary=")[2].strip().strip('"')
+    if not boundary:
+        raise ValueError("multipart body without boundary")
+    parts = []
+    for chunk in body.split(b"--" + boundary.encode("latin-1"))[1:]:
+        if chunk.startswith(b"--"):
+            break
+        head, _, content = chunk[2:].partition(b"\r\n\r\n")
+        headers = {}
+        for line in head.decode("utf-8").split("\r\n"):
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        parts.append((headers, content[:-2]))  # Drop the CRLF before the next boundary
+    return parts
+
+
+class StubAPIServer:
+    """In-process HTTP server emulating the Teresa API endpoints used by the suite"""
+
+    ADMIN_IDENTIFIER = "admin"
+    ADMIN_PASSWORD = "admin123"
+
+    def __init__(self, host="127.0.0.1", port=0, base_path="/api/v1", latency=0.0):
+        self.host = host
+        self.port = port
+        self.base_path = base_path.rstrip("/")
+        self.latency = latency
+        self.request_count = 0
+        self.connection_count = 0
+        self.admin_identifier = self.ADMIN_IDENTIFIER
+        self.admin_password = self.ADMIN_PASSWORD
+
+        self.products = []
+        self.techniques = []
+        self.files = []
+        self.units = []
+        self.whitelist = []
+        self.users = {}                  # email -> registered artisan (with password)
+        self.whitelist_delay = 0.0       # Seconds before a new registration shows up in the whitelist
+        self._visible_at = {}            # whitelist user id -> monotonic time it becomes visible
+        self.tokens = {"stub-admin-token": {"role": "admin"}}
+        self.product_statuses = ("pending_approval", "approved", "rejected")
+        self.rate_limits = []            # Fixed-window limits, see rate_limit()
+        self.etags = False               # ETag on 200 GETs, 304 for a matching If-None-Match
+
+        self._routes = []
+        self._lock = threading.Lock()
+        self._loop = None
+        self._server = None
+        self._thread = None
+        self._register_default_routes()
+
+    # ── Lifecycle ─────────────────────────────────────────────────────────────
+
+    @property
+    def base_url(self):
+        return f"http://{self.host}:{self.port}{self.base_path}"
+
+    def start(self):
+        """Start serving in a background thread and return self"""
+        ready = threading.Event()
+        self._loop = asyncio.new_event_loop()
+
+        def run():
+            asyncio.set_event_loop(self._loop)
+            self._server = self._loop.run_until_complete(
+                asyncio.start_server(self._handle_connection, self.host, self.port, backlog=4096)
+            )
+            self.port = self._server.sockets[0].getsockname()[1]
+            ready.set()
+            self._loop.run_forever()
+
+            self._server.close()
+            pending = asyncio.all_tasks(self._loop)
+            for task in pending:
+                task.cancel()
+            self._loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            self._loop.close()
+
+        self._thread = threading.Thread(target=run, name="stub-api-server", daemon=True)
+        self._thread.start()
+        ready.wait()
+        return self
+
+    def stop(self):
+        if self._loop and self._loop.is_running():
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=5)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # ── Routing ───────────────────────────────────────────────────────────────
+
+    def route(self, method, path):
+        """Register a handler; `{name}` path segments become path params
+
+        Handlers receive a StubRequest and return (status, body) or
+        (status, body, headers). Body may be a dict (sent as JSON) or bytes.
+        Routes registered later take precedence.
+        """
+        segments = path.strip("/").split("/")
+
+        def decorator(handler):
+            self._routes.insert(0, (method.upper(), segments, handler))
+            return handler
+        return decorator
+
+    def _match(self, method, path):
+        parts = path.strip("/").split("/")
+        for route_method, segments, handler in self._routes:
+            if route_method != method or len(segments) != len(parts):
+                continue
+            params = {}
+            for segment, part in zip(segments, parts):
+                if segment.startswith("{") and segment.endswith("}"):
+                    params[segment[1:-1]] = part
+                elif segment != part:
+                    break
+            else:
+                return handler, params
+        return None, None
+
+    def rate_limit(self, prefix, limit, window, retry_after=True):
+        """Answer 429 once more than `limit` requests under `prefix` arrive in one `window`-second window
+
+        Windows are aligned to multiples of `window` (like express-rate-limit's
+        fixed window). Retry-After carries the whole seconds until the reset
+        unless retry_after=False.
+        """
+        self.rate_limits.append({"prefix": prefix.strip("/"), "limit": limit, "window": window,
+                                 "retry_after": retry_after, "index": None, "count": 0})
+
+    def _rate_limited(self, path):
+        """429 response tuple if a rate limit rejects `path`, else None"""
+        path = path.strip("/")
+        now = time.monotonic()
+        for rule in self.rate_limits:
+            if not (path == rule["prefix"] or path.startswith(rule["prefix"] + "/")):
+                continue
+            with self._lock:
+                index = int(now // rule["window"])
+                if index != rule["index"]:
+                    rule["index"], rule["count"] = index, 0
+                rule["count"] += 1
+                if rule["count"] <= rule["limit"]:
+                    continue
+            headers = {}
+            if rule["retry_after"]:
+                headers["Retry-After"] = str(math.ceil((index + 1) * rule["window"] - now))
+            return 429, envelope(message="Too many requests, please try again later.", success=False), headers
+        return None
+
+    def dispatch(self, request):
+        """Run the handler for a request and return (status, body_bytes, headers)"""
+        with self._lock:
+            self.request_count += 1
+
+        handler, params = self._match(request.method, request.path)
+        limited = self._rate_limited(request.path) if self.rate_limits else None
+        if limited:
+            result = limited
+        elif handler is None:
+            result = (404, envelope(message="Route not found", success=False))
+        else:
+            request.path_params = params
+            try:
+                result = handler(request)
+            except (ValueError, KeyError) as e:
+                result = (400, envelope(message=f"Bad request: {e}", success=False))
+            except Exception as e:  # A handler bug answers like a real server would, not with a dropped connection
+                result = (500, envelope(message=f"Internal server error: {type(e).__name__}", success=False))
+
+        status, body = result[0], result[1]
+        headers = dict(result[2]) if len(result) > 2 else {}
+        if isinstance(body, (dict, list)):
+            body = json.dumps(body).encode()
+            headers.setdefault("Content-Type", "application/json")
+        if self.etags and request.method == "GET" and status == 200:
+            headers["ETag"] = f'"{hashlib.sha1(body).hexdigest()[:16]}"'
+            if request.headers.get("if-none-match") == headers["ETag"]:
+                return 304, b"", headers
+        return status, body or b"", headers
+
+    # ── HTTP/1.1 protocol ─────────────────────────────────────────────────────
+
+    async def _read_body(self, reader, headers):
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b";")[0].strip(), 16)
+                if size == 0:
+                    await reader.readline()
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readline()
+            return b"".join(chunks)
+        length = int(headers.get("content-length", 0) or 0)
+        return await reader.readexactly(length) if length else b""
+
+    async def _handle_connection(self, reader, writer):
+        with self._lock:
+            self.connection_count += 1
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, target, _version = request_line.decode("latin-1").split()
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                body = await self._read_body(reader, headers)
+                url = urlsplit(target)
+                path = url.path
+                if path.startswith(self.base_path):
+                    path = path[len(self.base_path):] or "/"
+                request = StubRequest(method.upper(), path, dict(parse_qsl(url.query)), headers, body)
+
+                if self.latency:
+                    await asyncio.sleep(self.latency)
+
+                status, payload, extra_headers = self.dispatch(request)
+                closing = headers.get("connection", "").lower() == "close"
+                if closing:
+                    extra_headers["Connection"] = "close"
+                head = [f"HTTP/1.1 {status} {REASONS.get(status, 'Unknown')}"]
+                extra_headers.setdefault("Content-Length", str(len(payload)))
+                for name, value in extra_headers.items():
+                    head.append(f"{name}: {value}")
+                writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + payload)
+                await writer.drain()
+
+                if closing:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError, asyncio.CancelledError):
+            pass  # Client went away, sent garbage, or the server is shutting down
+        finally:
+            writer.close()
+
+    # ── Seed data ─────────────────────────────────────────────────────────────
+
+    def seed_products(self, count, status="pending_approval", name_prefix="Stub Product"):
+        created = []
+        for i in range(count):
+            product = {
+                "id": str(uuid.uuid4()),
+                "name": f"{name_prefix} {len(self.products) + 1}",
+                "status": status,
+                "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            }
+            self.products.append(product)
+            created.append(product)
+        return created
+
+    def find_product(self, product_id):
+        return next((p for p in self.products if p["id"] == product_id), None)
+
+    def find_user(self, identifier):
+        """Registered artisan by email or phone"""
+        user = self.users.get(identifier)
+        if user is None and identifier:
+            user = next((u for u in list(self.users.values()) if u["phone"] == identifier), None)
+        return user
+
+    def find_whitelist_entry(self, user_id):
+        return next((u for u in self.whitelist if u["id"] == user_id), None)
+
+    def seed_techniques(self, count, children=0):
+        created = []
+        for i in range(count):
+            technique = {
+                "id": str(uuid.uuid4()),
+                "values": [{"language_code": "en", "name": f"Stub Technique {len(self.techniques) + 1}"}],
+                "is_active": True,
+                "parent_id": None,
+                "children": [
+                    {
+                        "id": str(uuid.uuid4()),
+                        "values": [{"language_code": "en", "name": f"Child {j + 1}"}],
+                        "is_active": True,
+                    }
+                    for j in range(children)
+                ],
+            }
+            self.techniques.append(technique)
+            created.append(technique)
+        return created
+
+    def seed_files(self, count, is_active=True):
+        created = [{"id": str(uuid.uuid4()), "name": f"stub-file-{len(self.files) + i + 1}.jpg",
+                    "is_active": is_active, "deleted": False} for i in range(count)]
+        self.files.extend(created)
+        return created
+
+    def seed_units(self, *names):
+        created = [{"id": str(uuid.uuid4()), "name": name} for name in names]
+        self.units.extend(created)
+        return created
+
+    def seed_whitelist(self, count, status="pending_approval", email_prefix="test_artisan"):
+        created = []
+        for i in range(count):
+            n = len(self.whitelist) + 1
+            user = {
+                "id": str(uuid.uuid4()),
+                "email": f"{email_prefix}_{n}@test.com",
+                "phone": f"+88017{n:08d}",
+                "status": status,
+            }
+            self.whitelist.append(user)
+            created.append(user)
+        return created
+
+    # ── Default routes ────────────────────────────────────────────────────────
+
+    def _register_default_routes(self):
+        @self.route("GET", "/health")
+        def health(request):
+            return 200, envelope({"status": "ok"})
+
+        @self.route("POST", "/auth/login")
+        def login(request):
+            data = request.json()
+            if data.get("identifier") == self.admin_identifier and data.get("password") == self.admin_password:
+                return 200, envelope({"access_token": "stub-admin-token", "user": {"role": "admin"}},
+                                     message="Login successful")
+            user = self.find_user(data.get("identifier"))
+            if user is None or user["password"] != data.get("password"):
+                return 401, envelope(message="Invalid credentials", success=False)
+            entry = self.find_whitelist_entry(user["id"])
+            if entry is None or entry["status"] != "approved":
+                return 403, envelope(message="Account pending approval", success=False)
+            token = f"stub-artisan-{user['id']}"
+            self.tokens[token] = {"role": "artisan", "user_id": user["id"]}
+            return 200, envelope({"access_token": token, "user": {"id": user["id"], "role": "artisan"}},
+                                 message="Login successful")
+
+        @self.route("POST", "/auth/register")
+        def register(request):
+            data = request.json()
+            for field in ("f_name", "l_name", "phone", "email", "password"):
+                if not data.get(field):
+                    return validation_error(field, f"{field} is required")
+            with self._lock:
+                if data["email"] in self.users or self.find_user(data["phone"]):
+                    return 409, envelope(message="User already exists", success=False)
+                user = {"id": str(uuid.uuid4()), "f_name": data["f_name"], "l_name": data["l_name"],
+                        "email": data["email"], "phone": data["phone"], "password": data["password"]}
+                self.users[data["email"]] = user
+                self.whitelist.append({"id": user["id"], "email": user["email"], "phone": user["phone"],
+                                       "status": "pending_approval"})
+                self._visible_at[user["id"]] = time.monotonic() + self.whitelist_delay
+            public = {k: v for k, v in user.items() if k != "password"}
+            return 201, envelope({"user": public}, message="User registered successfully")
+
+        @self.route("POST", "/products")
+        def create_product(request):
+            if request.token not in self.tokens:
+                return 401, envelope(message="Access token required", success=False)
+            data = request.json()
+            if not data.get("name"):
+                return validation_error("name", "name is required")
+            for field, limit in PRODUCT_LIMITS.items():
+                if len(data.get(field) or []) > limit:
+                    return validation_error(field, f"{field} must contain at most {limit} items")
+            status = data.get("status") or "draft"
+            product = {**data, "id": str(uuid.uuid4()),
+                       "status": "pending_approval" if status in ("pending", "pending_approval") else status,
+                       "owner_id": self.tokens[request.token].get("user_id")}
+            with self._lock:
+                self.products.append(product)
+            return 201, product
+
+        @self.route("GET", "/products")
+        def list_products(request):
+            items = self.products
+            if request.query.get("status"):
+                items = [p for p in items if p["status"] == request.query["status"]]
+            if request.query.get("search"):
+                term = request.query["search"].lower()
+                items = [p for p in items if term in p["name"].lower() or term in p["id"]]
+            page, meta = paginate(items, request.query)
+            return 200, envelope(page, meta=meta)
+
+        @self.route("PATCH", "/rbac/products/status")
+        def product_status(request):
+            if request.token not in self.tokens:
+                return 401, envelope(message="Access token required", success=False)
+            data = request.json()
+            if not data.get("product_id"):
+                if "product_id" not in data:
+                    return 422, envelope(message="product_id is required", success=False)
+                return validation_error("product_id", "product_id must not be empty")
+            if not data.get("status"):
+                return 422, envelope(message="status is required", success=False)
+            if data["status"] not in self.product_statuses:
+                return validation_error("status", "invalid status")
+            if "reason" in data and data["reason"] == "":
+                return validation_error("reason", "reason must not be empty")
+            try:
+                uuid.UUID(str(data["product_id"]))
+            except ValueError:
+                return validation_error("product_id", "product_id must be a valid UUID")
+
+            with self._lock:
+                product = self.find_product(data["product_id"])
+                if product is None:
+                    return 404, envelope(message="Product not found", success=False)
+                product["status"] = data["status"]
+            return 200, envelope({"id": product["id"], "status": product["status"]},
+                                 message=f"Product {data['status']} successfully")
+
+        @self.route("GET", "/techniques")
+        def list_techniques(request):
+            page, meta = paginate(self.techniques, request.query)
+            return 200, envelope(page, meta=meta)
+
+        @self.route("POST", "/files")
+        def upload_file(request):
+            if request.token not in self.tokens:
+                return 401, envelope(message="Access token required", success=False)
+            for headers, content in parse_multipart(request.body, request.headers.get("content-type", "")):
+                disposition = headers.get("content-disposition", "")
+                if 'filename="' not in disposition:
+                    continue
+                # Only the digest is kept, so large benchmark uploads do not pile up in memory
+                file = {"id": str(uuid.uuid4()), "name": disposition.split('filename="', 1)[1].rstrip('"'),
+                        "size": len(content), "sha256": hashlib.sha256(content).hexdigest(),
+                        "mime_type": headers.get("content-type"), "is_active": True, "deleted": False}
+                with self._lock:
+                    self.files.append(file)
+                return 201, envelope(file, message="File uploaded successfully")
+            return validation_error("file", "file is required")
+
+        @self.route("GET", "/files")
+        def list_files(request):
+            page, meta = paginate(self.files, request.query)
+            return 200, envelope(page, meta=meta)
+
+        @self.route("GET", "/units")
+        def list_units(request):
+            page, meta = paginate(self.units, request.query)
+            return 200, envelope(page, meta=meta)
+
+        @self.route("PATCH", "/whitelist-audit")
+        def whitelist_status(request):
+            if self.tokens.get(request.token, {}).get("role") != "admin":
+                return 401, envelope(message="Access token required", success=False)
+            data = request.json()
+            for field in ("user_id", "status"):
+                if not data.get(field):
+                    return validation_error(field, f"{field} is required")
+            if data["status"] not in ("approved", "rejected", "pending_approval"):
+                return validation_error("status", "invalid status")
+            with self._lock:
+                entry = self.find_whitelist_entry(data["user_id"])
+                if entry is None:
+                    return 404, envelope(message="User not found", success=False)
+                entry["status"] = data["status"]
+            return 200, envelope(dict(entry), message="Whitelist audit created successfully")
+
+        @self.route("GET", "/whitelist-audit")
+        def list_whitelist(request):
+            now = time.monotonic()
+            items = [u for u in self.whitelist if self._visible_at.get(u["id"], 0) <= now]
+            if request.query.get("search"):
+                term = request.query["search"].lower()
+                items = [u for u in items if term in u["email"].lower() or term in u["phone"]]
+            page, meta = paginate(items, request.query)
+            return 200, envelope(page, meta=meta)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the local Teresa API stub")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--products", type=int, default=100)
+    parser.add_argument("--techniques", type=int, default=20)
+    parser.add_argument("--whitelist", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.0, help="Added latency per request (seconds)")
+    args = parser.parse_args()
+
+    stub = StubAPIServer(host=args.host, port=args.port, latency=args.latency)
+    stub.seed_products(args.products)
+    stub.seed_techniques(args.techniques, children=3)
+    stub.seed_whitelist(args.whitelist)
+    stub.start()
+    print(f"✓ Stub API running at {stub.base_url} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        stub.stop()
+
+
+if __name__ == "__main__":
+    main()
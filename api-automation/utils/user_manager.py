@@ -3,7 +3,10 @@
 import time
 from config.register_test_data import generate_unique_email, generate_unique_phone
 from api.endpoints import Endpoints
+from api.paginator import Paginator
 from config.settings import settings
+from utils.namespace import current_namespace
+from utils.workflow import poll_until
 
 class UserManager:
     """Manages test artisans - finds users in whitelist"""
@@ -13,6 +16,11 @@ class UserManager:
         self.test_users = []  # Store created users
         self.admin_token = None
     
+    def admin_client(self):
+        """Admin view of the client (None without a token); the shared client keeps its own auth"""
+        admin_token = self.get_admin_token()
+        return self.client.with_token(admin_token, role="admin") if admin_token else None
+    
     def get_admin_token(self):
         """Get admin token for whitelist access"""
         if not self.admin_token:
@@ -22,7 +30,7 @@ class UserManager:
                 "password": settings.ADMIN_PASSWORD
             }
             
-            response = self.client.post(Endpoints.LOGIN, json=login_data)
+            response = self.client.anonymous().post(Endpoints.LOGIN, json=login_data)
             
             if response.status_code == 200:
                 data = response.json()
@@ -60,7 +68,7 @@ class UserManager:
         }
         
         # Register the artisan
-        response = self.client.post(Endpoints.REGISTER, json=artisan_data)
+        response = self.client.anonymous().post(Endpoints.REGISTER, json=artisan_data)
         
         if response.status_code == 201:
             print(f"   ✓ Test artisan created: {email}")
@@ -75,25 +83,17 @@ class UserManager:
                 "created_at": time.strftime("%Y-%m-%d %H:%M:%S")
             }
             
-            # Wait for user to appear in whitelist
+            # Poll the whitelist until the user shows up (instead of fixed sleeps)
             print(f"   Waiting for user to appear in whitelist...")
-            time.sleep(3.0)
-            
-            # Find user in whitelist to get the ID
-            user_id = self.find_user_in_whitelist(email, phone)
+            user_id, attempts, _found = poll_until(
+                lambda: self.find_user_in_whitelist(email, phone),
+                lambda found: found is not None,
+                timeout=15.0, interval=1.0)
             if user_id:
                 user_info["id"] = user_id
-                print(f"   ✓ Found user in whitelist: ID = {user_id}")
+                print(f"   ✓ Found user in whitelist: ID = {user_id} (attempt {attempts})")
             else:
-                print(f"   ⚠ User not found in whitelist yet")
-                # Try again in 5 seconds
-                time.sleep(5.0)
-                user_id = self.find_user_in_whitelist(email, phone)
-                if user_id:
-                    user_info["id"] = user_id
-                    print(f"   ✓ Found user in whitelist (retry): ID = {user_id}")
-                else:
-                    print(f"   ❌ Could not find user in whitelist")
+                print(f"   ❌ Could not find user in whitelist after {attempts} attempts")
             
             self.test_users.append(user_info)
             
@@ -117,48 +117,26 @@ class UserManager:
     
     def find_user_in_whitelist(self, email, phone):
         """Find a user in whitelist by email or phone and return user ID"""
-        admin_token = self.get_admin_token()
-        if not admin_token:
+        admin = self.admin_client()
+        if not admin:
             print(f"   ❌ Cannot search whitelist: No admin token")
             return None
         
-        self.client.set_auth_token(admin_token)
+        # Email first; the phone search is only sent on a miss. Streaming stops at the first match.
+        for field, value in (("email", email), ("phone", phone)):
+            if not value:
+                continue
+            params = {"search": value, "page": 1, "limit": 10}
+            for user in admin.stream_items(Endpoints.WHITELIST_AUDIT, params=params):
+                if user.get(field) == value:
+                    return user.get("id")
         
-        # Try searching by email
-        if email:
-            params = {"search": email, "page": 1, "limit": 10}
-            response = self.client.get(Endpoints.WHITELIST_AUDIT, params=params)
-            
-            if response.status_code == 200:
-                data = response.json()
-                users = data.get("data", [])
-                
-                for user in users:
-                    if user.get("email") == email:
-                        self.client.clear_auth_token()
-                        return user.get("id")
-        
-        # Try searching by phone
-        if phone:
-            params = {"search": phone, "page": 1, "limit": 10}
-            response = self.client.get(Endpoints.WHITELIST_AUDIT, params=params)
-            
-            if response.status_code == 200:
-                data = response.json()
-                users = data.get("data", [])
-                
-                for user in users:
-                    if user.get("phone") == phone:
-                        self.client.clear_auth_token()
-                        return user.get("id")
-        
-        self.client.clear_auth_token()
         return None
     
     def approve_user_in_whitelist(self, user_id):
         """Approve a user via whitelist approval endpoint"""
-        admin_token = self.get_admin_token()
-        if not admin_token:
+        admin = self.admin_client()
+        if not admin:
             print(f"   ❌ Cannot approve: No admin token")
             return False
         
@@ -179,8 +157,6 @@ class UserManager:
                 user_id = match.group(0)
                 print(f"   Extracted UUID: {user_id}")
         
-        self.client.set_auth_token(admin_token)
-        
         approval_data = {
             "user_id": user_id,
             "status": "approved",
@@ -189,9 +165,7 @@ class UserManager:
         
         print(f"   Approval payload: {approval_data}")
         
-        response = self.client.patch(Endpoints.WHITELIST_AUDIT, json=approval_data)
-        
-        self.client.clear_auth_token()
+        response = admin.patch(Endpoints.WHITELIST_AUDIT, json=approval_data)
         
         if response.status_code == 200:
             print(f"   ✓ User approved: {user_id}")
@@ -230,25 +204,20 @@ class UserManager:
         return self.create_test_artisan(approved=False)
     
     def find_recent_test_users_in_whitelist(self):
-        """Find all test users in whitelist"""
-        admin_token = self.get_admin_token()
-        if not admin_token:
+        """Find this run's test users in whitelist (other pipelines' users are ignored)"""
+        admin = self.admin_client()
+        if not admin:
             print(f"   ❌ Cannot search whitelist: No admin token")
             return []
         
-        self.client.set_auth_token(admin_token)
-        
-        # Search for test users
-        params = {"search": "test_artisan", "page": 1, "limit": 20}
-        response = self.client.get(Endpoints.WHITELIST_AUDIT, params=params)
-        
-        self.client.clear_auth_token()
-        
-        if response.status_code == 200:
-            data = response.json()
-            users = data.get("data", [])
-            
-            print(f"   Found {len(users)} test users in whitelist:")
+        # Search for test users across every page, not just the first
+        namespace = current_namespace()
+        paginator = Paginator(admin, Endpoints.WHITELIST_AUDIT,
+                              params=namespace.search_params(base="test_artisan"), limit=50)
+        users = namespace.filter(list(paginator), "email")
+
+        if paginator.pages_fetched:
+            print(f"   Found {len(users)} test users in whitelist ({paginator.pages_fetched} page(s)):")
             for user in users:
                 status = user.get('status', 'unknown')
                 approved = status == 'approved'
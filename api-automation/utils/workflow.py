@@ -0,0 +1,242 @@
+"""Declarative multi-step workflow engine for end-to-end journeys
+
+A Workflow is an ordered list of Steps. Each step describes one request
+(built from the journey context), which identity sends it, the status it
+expects, values to extract into the context for later steps, an optional
+wait condition that re-polls the request instead of sleeping, and extra
+assertions. The same definition runs once inside a test or as many
+concurrent journey instances for load runs:
+
+    result = journey.run(client, {"email": ..., "password": ...})
+    results = journey.run_many(client, count=50, concurrency=10, context_factory=make_context)
+    print_journey_report(summarize_journeys(results))
+
+Contexts are plain dicts owned by one journey instance; requests go through
+auth views of the shared client (see APIClient.with_token / as_role), so
+concurrent journeys never share mutable state.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from perf.stats import summarize, format_summary
+
+
+class StepFailed(Exception):
+    """Raised inside a journey when a step's expectation, wait or assertion fails"""
+
+
+def _value(value, ctx):
+    """Resolve a step attribute that may be a callable of the context"""
+    return value(ctx) if callable(value) else value
+
+
+def extract_path(body, path):
+    """Value at a dotted path ("data.user.id", "data.0.id") in a decoded JSON body; None if absent
+
+    A tuple of paths returns the first one that resolves.
+    """
+    if isinstance(path, tuple):
+        for candidate in path:
+            found = extract_path(body, candidate)
+            if found is not None:
+                return found
+        return None
+    node = body
+    for key in path.split("."):
+        if isinstance(node, list) and key.isdigit() and int(key) < len(node):
+            node = node[int(key)]
+        elif isinstance(node, dict):
+            node = node.get(key)
+        else:
+            return None
+    return node
+
+
+def poll_until(fetch, until, timeout=30.0, interval=0.5, backoff=1.5, max_interval=5.0):
+    """Call fetch() until until(value) is truthy; returns (value, attempts, satisfied)
+
+    Sleeps between attempts grow by `backoff` up to `max_interval`; gives
+    up (satisfied=False) when the next attempt would pass `timeout`.
+    """
+    deadline = time.monotonic() + timeout
+    attempts = 1
+    value = fetch()
+    while not until(value):
+        if time.monotonic() + interval > deadline:
+            return value, attempts, False
+        time.sleep(interval)
+        interval = min(interval * backoff, max_interval)
+        value = fetch()
+        attempts += 1
+    return value, attempts, True
+
+
+class Wait:
+    """Re-send a step's request until `until(response, ctx)` is truthy
+
+    Polling starts at `interval` seconds and backs off by `backoff` up to
+    `max_interval`; the step fails after `timeout` seconds.
+    """
+
+    def __init__(self, until, timeout=30.0, interval=0.5, backoff=1.5, max_interval=5.0):
+        self.until = until
+        self.timeout = timeout
+        self.interval = interval
+        self.backoff = backoff
+        self.max_interval = max_interval
+
+
+class Step:
+    """One request of a workflow
+
+    request:  dict (or callable(ctx) -> dict) with "method", "endpoint" and
+              any requests kwargs, e.g. {"method": "POST", "endpoint": ..., "json": {...}}
+    auth:     None (anonymous), a role name for client.as_role(), or callable(ctx) -> token
+    expect:   allowed status code(s)
+    extract:  {context_key: dotted path, tuple of paths, or callable(body, ctx)}
+    wait:     Wait condition, re-polls the request until it holds
+    check:    callables (response, ctx) that raise AssertionError/StepFailed
+    before:   callable(ctx) run before the request (e.g. to generate data)
+    """
+
+    def __init__(self, name, request, auth=None, expect=200, extract=None, wait=None, check=(), before=None):
+        self.name = name
+        self.request = request
+        self.auth = auth
+        self.expect = (expect,) if isinstance(expect, int) else tuple(expect)
+        self.extract = extract or {}
+        self.wait = wait
+        self.check = tuple(check)
+        self.before = before
+
+    def client_for(self, client, ctx):
+        if self.auth is None:
+            return client.anonymous()
+        if isinstance(self.auth, str):
+            return client.as_role(self.auth)
+        return client.with_token(self.auth(ctx))
+
+    def send(self, client, ctx):
+        spec = dict(_value(self.request, ctx))
+        method = spec.pop("method", "GET")
+        endpoint = spec.pop("endpoint")
+        return client.request(method, endpoint, **spec)
+
+    def execute(self, client, ctx):
+        """Run the step against ctx; returns (response, attempts)"""
+        if self.before:
+            self.before(ctx)
+        view = self.client_for(client, ctx)
+
+        if self.wait:
+            wait = self.wait
+            response, attempts, satisfied = poll_until(
+                lambda: self.send(view, ctx), lambda r: wait.until(r, ctx),
+                wait.timeout, wait.interval, wait.backoff, wait.max_interval)
+            if not satisfied:
+                raise StepFailed(f"{self.name}: wait condition not met after {attempts} attempt(s) "
+                                 f"(last status {response.status_code})")
+        else:
+            response, attempts = self.send(view, ctx), 1
+
+        if response.status_code not in self.expect:
+            raise StepFailed(f"{self.name}: expected {'/'.join(map(str, self.expect))}, "
+                             f"got {response.status_code}: {response.text[:200]}")
+
+        if self.extract:
+            body = response.json() if response.content else {}
+            for key, path in self.extract.items():
+                value = path(body, ctx) if callable(path) else extract_path(body, path)
+                if value is None:
+                    raise StepFailed(f"{self.name}: could not extract '{key}' from response")
+                ctx[key] = value
+
+        for check in self.check:
+            check(response, ctx)
+        return response, attempts
+
+
+class Workflow:
+    """Named, ordered list of steps that runs as independent journey instances"""
+
+    def __init__(self, name, steps):
+        self.name = name
+        self.steps = list(steps)
+
+    def run(self, client, ctx=None):
+        """Run one journey; returns a result dict (never raises for step failures)"""
+        ctx = dict(ctx or {})
+        result = {"workflow": self.name, "ok": True, "failed_step": None, "error": None,
+                  "context": ctx, "steps": []}
+        start = time.perf_counter()
+        for step in self.steps:
+            step_start = time.perf_counter()
+            record = {"name": step.name, "status_code": None, "attempts": 0, "ok": False, "error": None}
+            try:
+                response, record["attempts"] = step.execute(client, ctx)
+                record["status_code"] = response.status_code
+                record["ok"] = True
+            except (StepFailed, AssertionError) as e:
+                record["error"] = str(e) or f"{step.name}: assertion failed"
+            except Exception as e:
+                record["error"] = f"{step.name}: {type(e).__name__}: {e}"
+            record["elapsed"] = time.perf_counter() - step_start
+            result["steps"].append(record)
+            if not record["ok"]:
+                result.update(ok=False, failed_step=step.name, error=record["error"])
+                break
+        result["elapsed"] = time.perf_counter() - start
+        return result
+
+    def run_many(self, client, count, concurrency=8, context_factory=None):
+        """Run `count` journeys concurrently; context_factory(i) builds each starting context"""
+        def run_one(i):
+            return self.run(client, context_factory(i) if context_factory else {})
+
+        with ThreadPoolExecutor(max_workers=max(1, min(concurrency, count)),
+                                thread_name_prefix=f"journey-{self.name}") as pool:
+            return list(pool.map(run_one, range(count)))
+
+
+def summarize_journeys(results):
+    """Aggregate journey results: success rate, failures by step, per-step latency summaries"""
+    steps = {}
+    failures = {}
+    for result in results:
+        for record in result["steps"]:
+            stats = steps.setdefault(record["name"], {"latencies": [], "attempts": 0, "failed": 0})
+            stats["latencies"].append(record["elapsed"])
+            stats["attempts"] += record["attempts"]
+            stats["failed"] += 0 if record["ok"] else 1
+        if not result["ok"]:
+            failures[result["failed_step"]] = failures.get(result["failed_step"], 0) + 1
+
+    total = len(results)
+    passed = sum(1 for r in results if r["ok"])
+    return {
+        "workflow": results[0]["workflow"] if results else None,
+        "journeys": total,
+        "passed": passed,
+        "success_rate": passed / total if total else 0.0,
+        "failures": failures,
+        "errors": [r["error"] for r in results if r["error"]][:10],
+        "journey_latency": summarize([r["elapsed"] for r in results]),
+        "steps": {name: {"latency": summarize(s["latencies"]), "attempts": s["attempts"], "failed": s["failed"]}
+                  for name, s in steps.items()},
+    }
+
+
+def print_journey_report(summary):
+    print(f"\n{'='*70}")
+    print(f"JOURNEY REPORT: {summary['workflow']}")
+    print(f"{'='*70}")
+    print(f"   Journeys:  {summary['passed']}/{summary['journeys']} passed ({summary['success_rate']:.1%})")
+    print(f"   Duration:  {format_summary(summary['journey_latency'])}")
+    for name, stats in summary["steps"].items():
+        mark = "✓" if not stats["failed"] else "❌"
+        print(f"   {mark} {name:<22} {format_summary(stats['latency'])} (attempts {stats['attempts']})")
+    for step, count in summary["failures"].items():
+        print(f"   ⚠ {count} journey(s) failed at {step}")
+    for error in summary["errors"]:
+        print(f"   ⚠ {error}")
+    print(f"{'='*70}")